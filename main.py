@@ -1,6 +1,8 @@
 
+import argparse
 import os
 import sys
+import time
 from pathlib import Path
 from datetime import datetime
 
@@ -8,16 +10,97 @@ from datetime import datetime
 sys.path.append(str(Path(__file__).parent))
 
 from scrapers.linkedin_scraper import LinkedInScraper
-from scrapers.utils import load_config, setup_logging, load_environment
+from scrapers.utils import load_config, setup_logging, load_environment, rewrite_profile_url
+from scrapers.fixture_server import FixtureServer
+from scrapers.schema import PROFILE_SCHEMA
+from scrapers.writers import CsvStreamWriter, JsonlStreamWriter, RunManifest
+from scrapers.dataset import DatasetWriter
+from scrapers.history import history_from_config, format_regression
+from scrapers.enrichment import enrich_file
+from scrapers.search_index import index_from_config
+from scrapers.quality import QualityAbort
+from scrapers.preflight import canaries_from_config, run_preflight
+from scrapers.scheduler import EXIT_DEFERRED, Scheduler, parse_duration, read_url_entries
 
 
-def main():
+def record_run_history(config, run_summary, bytes_written):
+    """Append this run's metrics to the history store and flag regressions."""
+    history = history_from_config(config)
+    if history is None or not run_summary.profiles:
+        return
+    try:
+        history.record_run(run_summary.as_dict(), bytes_written)
+        history_config = config.get('history', {})
+        regressions = history.check_regressions(
+            window=history_config.get('window', 10),
+            threshold=history_config.get('threshold', 0.2),
+            rate_threshold=history_config.get('rate_threshold', 0.1)
+        )
+        for regression in regressions:
+            print(f"⚠️ Regression: {format_regression(regression)}")
+    finally:
+        history.close()
+
+
+def update_search_index(config):
+    """Fold new output files into the local search index."""
+    index = index_from_config(config)
+    if index is None:
+        return
+    try:
+        files, rows = index.update(config.get('search', {}).get('output_dir', 'data/output'))
+        if files:
+            print(f"🔎 Search index updated with {rows} rows from {files} files")
+    finally:
+        index.close()
+
+
+def preflight(scraper, config, fixture_server=None):
+    """Run the canary preflight and print each stage; returns True when everything passed."""
+    canaries = canaries_from_config(config)
+    if fixture_server:
+        for canary in canaries:
+            canary['url'] = rewrite_profile_url(canary['url'], fixture_server.base_url)
+    print("\n🛫 Preflight")
+    report = run_preflight(scraper, config, canaries)
+    for line in report.lines():
+        print(line)
+    if report.ok:
+        print(f"✅ Preflight passed in {report.total_seconds:.1f}s")
+    else:
+        print(f"❌ Preflight failed after {report.total_seconds:.1f}s")
+    return report.ok
+
+
+def main(argv=None):
     """Main scraper application."""
+    parser = argparse.ArgumentParser(description='Scrape the LinkedIn profiles listed in data/profile_urls.txt.')
+    parser.add_argument('--preflight', action='store_true',
+                        help='Only check the driver, session and canary profiles, then exit')
+    parser.add_argument('--skip-preflight', action='store_true',
+                        help="Don't run the preflight before the batch even if preflight.before_run is set")
+    parser.add_argument('--budget', help='Time budget for the batch, e.g. 90m or 2h (overrides scheduler.budget)')
+    args = parser.parse_args(argv)
+    
     print(" LinkedIn Profile Scraper")
     print("=" * 40)
     
     # Load environment variables
     load_environment()
+    config = load_config()
+    try:
+        budget_seconds = parse_duration(args.budget or config.get('scheduler', {}).get('budget'))
+    except ValueError as e:
+        parser.error(f"--budget / scheduler.budget: {e}")
+    
+    # Offline runs against the local fixture server accept any credentials
+    fixture_server = None
+    if config.get('fixture_server', {}).get('enabled', False):
+        fixture_server = FixtureServer.from_config(config).start()
+        config.setdefault('linkedin', {})['base_url'] = fixture_server.base_url
+        os.environ.setdefault('LINKEDIN_EMAIL', 'fixture@example.com')
+        os.environ.setdefault('LINKEDIN_PASSWORD', 'fixture')
+        print(f"🧪 Using fixture server at {fixture_server.base_url}")
     
     # Check credentials
     email = os.getenv('LINKEDIN_EMAIL')
@@ -28,48 +111,124 @@ def main():
         print("\nEdit .env file:")
         print("LINKEDIN_EMAIL=your_email@gmail.com")
         print("LINKEDIN_PASSWORD=your_password")
-        return
+        return 1
     
     print(f"✅ Authenticated as: {email}")
     
     # Setup
-    logger = setup_logging()
-    config = load_config()
+    logging_config = config.get('logging', {})
+    logger = setup_logging(
+        log_file=logging_config.get('file', 'scraper.log'),
+        max_bytes=logging_config.get('max_bytes', 10 * 1024 * 1024),
+        backup_count=logging_config.get('backup_count', 5)
+    )
     config['linkedin']['auto_login'] = True
     
+    if args.preflight:
+        scraper = LinkedInScraper(config)
+        try:
+            return 0 if preflight(scraper, config, fixture_server) else 1
+        finally:
+            scraper.cleanup()
+            if fixture_server:
+                fixture_server.stop()
+    
     # Load URLs
     urls_file = Path('data/profile_urls.txt')
     if not urls_file.exists():
         print("❌ No profile URLs found. Please add URLs to data/profile_urls.txt")
-        return
+        return 1
     
-    with open(urls_file, 'r') as f:
-        urls = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    # One URL per line, optionally followed by a priority
+    entries = read_url_entries(str(urls_file))
     
-    if not urls:
+    if not entries:
         print("❌ No valid URLs found in profile_urls.txt")
-        return
+        return 1
     
-    print(f"📋 Found {len(urls)} profiles to scrape")
+    if fixture_server:
+        entries = [(rewrite_profile_url(url, fixture_server.base_url), priority) for url, priority in entries]
+    
+    print(f"📋 Found {len(entries)} profiles to scrape")
     
     # Initialize scraper
     scraper = LinkedInScraper(config)
     
+    # Most valuable (priority x staleness per second) first, cut to the time budget
+    scheduler = Scheduler.from_config(config, scraper.scrape_state)
+    deferred = []
+    if scheduler is not None:
+        schedule = scheduler.plan(entries, budget_seconds)
+        urls = schedule.urls
+        deferred = schedule.deferred
+        print(f"🗓️ Scheduled {len(urls)} profiles (~{schedule.estimated_seconds / 60:.0f} min)")
+        if deferred:
+            print(f"⚠️ {len(deferred)} profiles don't fit the {budget_seconds / 60:.0f} min budget "
+                  f"and are deferred to the next run")
+    else:
+        urls = [url for url, _ in entries]
+    
+    # Catch a stale session or broken selectors before the batch; the driver is reused for it
+    if config.get('preflight', {}).get('before_run', False) and not args.skip_preflight:
+        if not preflight(scraper, config, fixture_server):
+            scraper.cleanup()
+            if fixture_server:
+                fixture_server.stop()
+            return 1
+    
+    # Streaming outputs: rows are appended (and compressed) as profiles arrive
+    output_config = config.get('output', {})
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    output_base = f"data/output/linkedin_data_{timestamp}"
+    # output.format: "csv", "jsonl" (nested records, tail-able during the run) or "both"
+    compression = output_config.get('compression', 'none')
+    output_format = output_config.get('format', 'csv')
+    writers = []
+    if output_format in ('csv', 'both'):
+        writers.append(CsvStreamWriter(f"{output_base}.csv", compression=compression))
+    if output_format in ('jsonl', 'both'):
+        jsonl_config = output_config.get('jsonl', {})
+        writers.append(JsonlStreamWriter(
+            f"{output_base}.jsonl",
+            compression=compression,
+            batch_size=jsonl_config.get('batch_size', 20),
+            max_bytes=jsonl_config.get('max_bytes', 100 * 1024 * 1024)
+        ))
+    # Partitioned copy (run date / username bucket) with a manifest for point and latest lookups
+    dataset_writer = DatasetWriter.from_config(config, run_id=timestamp)
+    if dataset_writer is not None:
+        writers.append(dataset_writer)
+    manifest = RunManifest(f"{output_base}.manifest.json", run_id=timestamp)
+    scraper.run_summary.run_id = timestamp
+    
+    def write_profile(profile):
+        for writer in writers:
+            writer.write(profile)
+    
+    exit_code = 0
+    deadline = time.monotonic() + budget_seconds if budget_seconds else None
     try:
         print("\n🚀 Starting extraction...")
-        profiles = scraper.scrape_profiles(urls)
+        profiles = scraper.scrape_profiles(urls, on_profile=write_profile, deadline=deadline)
+        for writer in writers:
+            writer.close()
+        
+        # Typed tenure / year / count columns derived from the finished CSV
+        if output_config.get('enrich', False):
+            for writer in writers:
+                if writer.format == 'csv' and writer.rows_written:
+                    manifest.add_file(enrich_file(str(writer.path)), 'csv', writer.rows_written)
         
         if profiles:
-            # Generate output filename
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            output_file = f"data/output/linkedin_data_{timestamp}.csv"
-            
-            # Save results
-            scraper.save_to_csv(profiles, output_file)
+            if output_config.get('excel_copy', False):
+                excel_file = f"{output_base}.xlsx"
+                rows = [PROFILE_SCHEMA.to_row(profile) for profile in profiles]
+                if scraper.save_to_excel(rows, excel_file):
+                    manifest.add_file(excel_file, 'xlsx', len(rows))
             
             print(f"\n✅ Extraction complete!")
             print(f"📊 Scraped {len(profiles)} profiles")
-            print(f"💾 Saved to: {output_file}")
+            print(f"💾 Saved to: {output_base}.*")
             
             # Show sample data
             successful = [p for p in profiles if p.get('name')]
@@ -81,17 +240,42 @@ def main():
                     print(f"   {i}. {name}")
                     if headline:
                         print(f"      {headline[:60]}...")
+        elif not urls and deferred:
+            print("⚠️ Nothing fit the time budget; no profiles were scraped")
         else:
             print("❌ No profiles were successfully scraped")
+            exit_code = 1
+        if deferred and exit_code == 0:
+            # Distinct from failure, so cron wrappers can tell "more to do" from "broken"
+            exit_code = EXIT_DEFERRED
     
     except KeyboardInterrupt:
         print("\n⏹️ Stopped by user")
+        exit_code = 130
+    except QualityAbort as e:
+        print(f"\n🛑 Stopped early, output quality collapsed: {str(e)}")
+        logger.error(f"Run aborted by quality monitor: {str(e)}")
+        exit_code = 1
     except Exception as e:
         print(f"\n❌ Error: {str(e)}")
         logger.error(f"Scraping failed: {str(e)}")
+        exit_code = 1
     finally:
+        # Close outputs even on interrupt so partial runs stay readable and verifiable
+        for writer in writers:
+            writer.close()
+            manifest.add(writer)
+        if len(scraper.attempt_log):
+            attempts_file = f"{output_base}.attempts.json"
+            manifest.add_file(attempts_file, 'attempts', scraper.attempt_log.write(attempts_file))
+        manifest.write()
         scraper.cleanup()
+        record_run_history(config, scraper.run_summary, manifest.total_bytes())
+        update_search_index(config)
+        if fixture_server:
+            fixture_server.stop()
+    return exit_code
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
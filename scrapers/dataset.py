@@ -0,0 +1,388 @@
+"""
+Partitioned profile dataset with a manifest index.
+
+Besides the flat per-run exports, every scraped profile is appended to a
+dataset partitioned by run date and a hash bucket of the profile username:
+
+    data/dataset/run_date=2024-01-01/bucket=07/part-20240101_120000.csv.gz
+    data/dataset/manifest.json
+
+The manifest lists, for each part file, its run, row count, min/max
+scraped_at and the usernames it holds. Readers use it to open only the files
+they need. A point lookup reads the files of one bucket that contain the
+username. The latest snapshot reads, per profile, only the file that holds
+its newest record.
+
+    python -m scrapers.dataset import data/output/linkedin_data_*.csv.gz
+    python -m scrapers.dataset lookup satyanadella
+    python -m scrapers.dataset latest -o latest.csv
+    python -m scrapers.dataset rebuild
+
+The manifest is rewritten atomically at the end of each run; `rebuild`
+recreates it from the part files if two runs ever race on it.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import unquote
+
+import pandas as pd
+
+from .enrichment import read_output
+from .writers import CsvStreamWriter
+
+DEFAULT_ROOT = 'data/dataset'
+MANIFEST_NAME = 'manifest.json'
+DEFAULT_BUCKETS = 16
+SCRAPED_AT_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+_RUN_ID = re.compile(r'(\d{8}_\d{6})')
+
+
+def profile_key(value: Optional[str]) -> str:
+    """Lowercased, URL-decoded username from a profile URL or a bare username."""
+    if not value:
+        return ''
+    value = str(value).strip()
+    if '/in/' in value:
+        value = value.split('/in/')[-1]
+    return unquote(value.split('/')[0].split('?')[0]).lower()
+
+
+def bucket_of(username: str, buckets: int) -> int:
+    digest = hashlib.blake2b(username.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % buckets
+
+
+def scraped_at_now() -> str:
+    return datetime.now(timezone.utc).strftime(SCRAPED_AT_FORMAT)
+
+
+def _load_manifest(root: Path) -> Dict:
+    try:
+        with open(root / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'buckets': None, 'files': []}
+
+
+def _save_manifest(root: Path, manifest: Dict):
+    root.mkdir(parents=True, exist_ok=True)
+    manifest['files'].sort(key=lambda entry: entry['path'])
+    tmp_path = root / (MANIFEST_NAME + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, separators=(',', ':'))
+    os.replace(tmp_path, root / MANIFEST_NAME)
+
+
+class DatasetWriter:
+    """Streams profiles into one part file per (run date, bucket) and indexes them in the manifest.
+
+    Quacks like the other streaming writers (write / close / summaries), so
+    main.py keeps it in the same list.
+    """
+
+    format = 'dataset'
+
+    def __init__(self, root: str = DEFAULT_ROOT, run_id: Optional[str] = None, buckets: int = DEFAULT_BUCKETS,
+                 compression: str = 'gzip', run_date: Optional[str] = None):
+        self.root = Path(root)
+        self.run_id = run_id or datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.run_date = run_date or datetime.now(timezone.utc).strftime('%Y-%m-%d')
+        self.compression = compression
+        self.logger = logging.getLogger(__name__)
+        # A dataset keeps the bucket count it was created with
+        existing = _load_manifest(self.root).get('buckets')
+        if existing and existing != buckets:
+            self.logger.warning(f"Dataset {self.root} uses {existing} buckets, ignoring configured {buckets}")
+        self.buckets = existing or buckets
+        self.rows_written = 0
+        self._writers: Dict[int, CsvStreamWriter] = {}
+        self._stats: Dict[int, Dict] = {}
+        self._closed = False
+
+    @classmethod
+    def from_config(cls, config: Dict, run_id: Optional[str] = None) -> Optional['DatasetWriter']:
+        """Create the writer from the 'output.dataset' config section, or None when disabled."""
+        output_config = config.get('output', {})
+        dataset_config = output_config.get('dataset', {})
+        if not dataset_config.get('enabled', False):
+            return None
+        return cls(dataset_config.get('path', DEFAULT_ROOT), run_id, dataset_config.get('buckets', DEFAULT_BUCKETS),
+                   compression=output_config.get('compression', 'gzip'))
+
+    def _writer(self, bucket: int) -> CsvStreamWriter:
+        writer = self._writers.get(bucket)
+        if writer is None:
+            directory = self.root / f"run_date={self.run_date}" / f"bucket={bucket:02d}"
+            writer = CsvStreamWriter(str(directory / f"part-{self.run_id}.csv"), compression=self.compression)
+            self._writers[bucket] = writer
+            self._stats[bucket] = {'usernames': set(), 'min_scraped_at': None, 'max_scraped_at': None}
+        return writer
+
+    def write(self, profile: Dict):
+        username = profile_key(profile.get('profile_url'))
+        if not username:
+            return
+        if not profile.get('scraped_at'):
+            profile = dict(profile, scraped_at=scraped_at_now())
+        bucket = bucket_of(username, self.buckets)
+        self._writer(bucket).write(profile)
+        stats = self._stats[bucket]
+        stats['usernames'].add(username)
+        scraped_at = profile['scraped_at']
+        stats['min_scraped_at'] = min(filter(None, (stats['min_scraped_at'], scraped_at)))
+        stats['max_scraped_at'] = max(filter(None, (stats['max_scraped_at'], scraped_at)))
+        self.rows_written += 1
+
+    def close(self):
+        """Close the part files and add them to the manifest (once)."""
+        if self._closed:
+            return
+        self._closed = True
+        for writer in self._writers.values():
+            writer.close()
+        if not self._writers:
+            return
+        manifest = _load_manifest(self.root)
+        manifest['buckets'] = self.buckets
+        entries = {entry['path']: entry for entry in manifest['files']}
+        for bucket, writer in self._writers.items():
+            stats = self._stats[bucket]
+            entry = {
+                'path': writer.path.relative_to(self.root).as_posix(),
+                'run_id': self.run_id,
+                'run_date': self.run_date,
+                'bucket': bucket,
+                'rows': writer.rows_written,
+                'bytes': writer.path.stat().st_size,
+                'min_scraped_at': stats['min_scraped_at'],
+                'max_scraped_at': stats['max_scraped_at'],
+                'usernames': sorted(stats['usernames']),
+            }
+            entries[entry['path']] = entry
+        manifest['files'] = list(entries.values())
+        _save_manifest(self.root, manifest)
+
+    def summaries(self) -> List[Dict]:
+        """Run-manifest entries for the part files, with paths relative to the dataset root."""
+        summaries = []
+        for writer in self._writers.values():
+            for summary in writer.summaries():
+                summary['path'] = writer.path.relative_to(self.root).as_posix()
+                summary['dataset'] = str(self.root)
+                summaries.append(summary)
+        return summaries
+
+
+class Dataset:
+    """Manifest-driven reader: point lookups and latest snapshots without scanning all history."""
+
+    def __init__(self, root: str = DEFAULT_ROOT):
+        self.root = Path(root)
+        self.manifest = _load_manifest(self.root)
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'Dataset':
+        return cls(config.get('output', {}).get('dataset', {}).get('path', DEFAULT_ROOT))
+
+    @property
+    def entries(self) -> List[Dict]:
+        return self.manifest['files']
+
+    def files(self, usernames: Optional[Iterable[str]] = None, since: Optional[str] = None,
+              until: Optional[str] = None) -> List[Dict]:
+        """Manifest entries that may hold any of `usernames` scraped within [since, until]."""
+        keys = {profile_key(username) for username in usernames} if usernames is not None else None
+        buckets = ({bucket_of(key, self.manifest['buckets']) for key in keys}
+                   if keys is not None and self.manifest['buckets'] else None)
+        selected = []
+        for entry in self.entries:
+            if buckets is not None and entry['bucket'] not in buckets:
+                continue
+            if since and entry['max_scraped_at'] and entry['max_scraped_at'] < since:
+                continue
+            if until and entry['min_scraped_at'] and entry['min_scraped_at'] > until:
+                continue
+            if keys is not None and keys.isdisjoint(entry['usernames']):
+                continue
+            selected.append(entry)
+        return selected
+
+    def read(self, entries: List[Dict], usernames: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Rows of the given part files (optionally only `usernames`), with a `username` column."""
+        keys = {profile_key(username) for username in usernames} if usernames is not None else None
+        frames = []
+        for entry in entries:
+            df = read_output(str(self.root / entry['path']))
+            df['username'] = df['profile_url'].map(profile_key).astype('string')
+            if keys is not None:
+                df = df[df['username'].isin(keys)]
+            frames.append(df)
+        if not frames:
+            return pd.DataFrame(columns=['username'])
+        return pd.concat(frames, ignore_index=True)
+
+    def history(self, profile: str) -> pd.DataFrame:
+        """Every stored record of one profile, oldest first."""
+        df = self.read(self.files([profile]), [profile])
+        return df.sort_values('scraped_at', kind='stable', ignore_index=True) if len(df) else df
+
+    def latest(self, profile: str) -> Optional[Dict]:
+        """The newest record of one profile, or None if it was never scraped."""
+        entries = self.files([profile])
+        if not entries:
+            return None
+        # Part files are per run, so the newest file holding the profile has its newest record
+        newest = max(entries, key=lambda entry: (entry['max_scraped_at'] or '', entry['path']))
+        df = self.read([newest], [profile])
+        if not len(df):
+            return None
+        return df.sort_values('scraped_at', kind='stable').iloc[-1].to_dict()
+
+    def latest_snapshot(self, usernames: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Newest record per profile, reading only the file that holds each profile's newest record."""
+        keys = {profile_key(username) for username in usernames} if usernames is not None else None
+        newest: Dict[str, Dict] = {}
+        for entry in self.files(keys):
+            rank = (entry['max_scraped_at'] or '', entry['path'])
+            for username in entry['usernames']:
+                if keys is not None and username not in keys:
+                    continue
+                current = newest.get(username)
+                if current is None or rank > (current['max_scraped_at'] or '', current['path']):
+                    newest[username] = entry
+        wanted: Dict[str, set] = {}
+        for username, entry in newest.items():
+            wanted.setdefault(entry['path'], set()).add(username)
+        entries = {entry['path']: entry for entry in newest.values()}
+        frames = [self.read([entries[path]], names) for path, names in wanted.items()]
+        if not frames:
+            return pd.DataFrame(columns=['username'])
+        df = pd.concat(frames, ignore_index=True)
+        # A profile scraped twice in one run keeps its later row
+        df = df.sort_values('scraped_at', kind='stable').drop_duplicates('username', keep='last')
+        return df.sort_values('username', ignore_index=True)
+
+    def stats(self) -> Dict:
+        return {
+            'files': len(self.entries),
+            'rows': sum(entry['rows'] for entry in self.entries),
+            'profiles': len({username for entry in self.entries for username in entry['usernames']}),
+            'bytes': sum(entry.get('bytes', 0) for entry in self.entries),
+            'buckets': self.manifest['buckets'],
+        }
+
+
+def rebuild_manifest(root: str = DEFAULT_ROOT, buckets: Optional[int] = None) -> Dict:
+    """Recreate the manifest by reading every part file under `root`."""
+    root_path = Path(root)
+    manifest = _load_manifest(root_path)
+    manifest['buckets'] = buckets or manifest.get('buckets') or DEFAULT_BUCKETS
+    files = []
+    for path in sorted(root_path.glob('run_date=*/bucket=*/part-*.csv*')):
+        df = read_output(str(path))
+        usernames = df['profile_url'].dropna().map(profile_key)
+        scraped_at = df['scraped_at'].dropna() if 'scraped_at' in df.columns else pd.Series(dtype='string')
+        files.append({
+            'path': path.relative_to(root_path).as_posix(),
+            'run_id': path.name.split('.')[0][len('part-'):],
+            'run_date': path.parent.parent.name.split('=', 1)[1],
+            'bucket': int(path.parent.name.split('=', 1)[1]),
+            'rows': len(df),
+            'bytes': path.stat().st_size,
+            'min_scraped_at': scraped_at.min() if len(scraped_at) else None,
+            'max_scraped_at': scraped_at.max() if len(scraped_at) else None,
+            'usernames': sorted(set(usernames) - {''}),
+        })
+    manifest['files'] = files
+    _save_manifest(root_path, manifest)
+    return manifest
+
+
+def import_exports(paths: Iterable[str], root: str = DEFAULT_ROOT, buckets: int = DEFAULT_BUCKETS,
+                   compression: str = 'gzip') -> int:
+    """Backfill the dataset from flat linkedin_data_<timestamp> exports; returns rows imported."""
+    rows = 0
+    for path in paths:
+        name = Path(path).name
+        if '.enriched.' in name or '.entities.' in name:
+            continue
+        match = _RUN_ID.search(name)
+        started = (datetime.strptime(match.group(1), '%Y%m%d_%H%M%S') if match
+                   else datetime.fromtimestamp(Path(path).stat().st_mtime))
+        run_id = started.strftime('%Y%m%d_%H%M%S')
+        # Old exports have no (or an empty) scraped_at; the run's start time is the closest stand-in
+        df = read_output(path).fillna('')
+        if 'scraped_at' not in df.columns:
+            df['scraped_at'] = ''
+        run_time = started.astimezone(timezone.utc).strftime(SCRAPED_AT_FORMAT)
+        df['scraped_at'] = df['scraped_at'].mask(df['scraped_at'] == '', run_time)
+        writer = DatasetWriter(root, run_id, buckets, compression, run_date=started.strftime('%Y-%m-%d'))
+        try:
+            for profile in df.to_dict('records'):
+                writer.write(profile)
+        finally:
+            writer.close()
+        rows += writer.rows_written
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Query and maintain the partitioned profile dataset.')
+    parser.add_argument('--root', default=DEFAULT_ROOT)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    import_parser = subparsers.add_parser('import', help='Backfill from flat CSV/JSONL exports')
+    import_parser.add_argument('paths', nargs='+')
+    import_parser.add_argument('--buckets', type=int, default=DEFAULT_BUCKETS)
+    rebuild = subparsers.add_parser('rebuild', help='Recreate the manifest from the part files')
+    rebuild.add_argument('--buckets', type=int)
+    lookup = subparsers.add_parser('lookup', help='Every record of one profile (username or URL)')
+    lookup.add_argument('profile')
+    latest = subparsers.add_parser('latest', help='Newest record per profile')
+    latest.add_argument('usernames', nargs='*')
+    latest.add_argument('-o', '--output', help='Write the snapshot to this CSV instead of a summary')
+    subparsers.add_parser('stats')
+    args = parser.parse_args(argv)
+
+    started = datetime.now()
+    if args.command == 'import':
+        rows = import_exports(args.paths, args.root, args.buckets)
+        print(f"✅ Imported {rows} rows into {args.root}")
+        return 0
+    if args.command == 'rebuild':
+        manifest = rebuild_manifest(args.root, args.buckets)
+        print(f"✅ Indexed {len(manifest['files'])} part files")
+        return 0
+
+    dataset = Dataset(args.root)
+    if args.command == 'stats':
+        print('   '.join(f"{name}: {value}" for name, value in dataset.stats().items()))
+        return 0
+    if args.command == 'lookup':
+        df = dataset.history(args.profile)
+        for record in df.to_dict('records'):
+            print(f"{record.get('scraped_at')}  {record.get('name')} — {record.get('headline')}")
+        print(f"🔎 {len(df)} records from {len(dataset.files([args.profile]))} files")
+        return 0 if len(df) else 1
+
+    df = dataset.latest_snapshot(args.usernames or None)
+    elapsed = (datetime.now() - started).total_seconds()
+    if args.output:
+        df.to_csv(args.output, index=False)
+        print(f"✅ Wrote {len(df)} profiles to {args.output} in {elapsed:.1f}s")
+    else:
+        print(f"📋 {len(df)} profiles, newest records read in {elapsed:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
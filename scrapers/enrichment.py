@@ -0,0 +1,187 @@
+"""
+Post-scrape enrichment of exported profile tables.
+
+Turns the raw display strings into typed columns with vectorized pandas
+string/regex operations (no per-row Python):
+
+    experience_N_duration "2019 - Present · 2 yrs 3 mos"
+        -> experience_N_tenure_months, experience_N_start_year, experience_N_end_year
+    education_N_years "2015 – 2019"   -> education_N_start_year, education_N_end_year
+    connections "500+"                -> connections_count, connections_bucket
+    followers "12K followers"         -> followers_count
+    all experience entries            -> total_experience_months, career_start_year
+
+    python -m scrapers.enrichment data/output/linkedin_data_20240101_120000.csv.gz
+"""
+
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .schema import PROFILE_SCHEMA
+
+# "2 yrs 3 mos", "1 yr", "11 mos", "less than a year"
+_TENURE_PATTERN = r'(?=\d+\s*(?:yr|mo))(?:(?P<years>\d+)\s*yrs?)?\s*(?:(?P<months>\d+)\s*mos?)?'
+# "2015 – 2019", "Jan 2019 - Present", "2005 - 2007 · 2 yrs"
+_YEAR_RANGE_PATTERN = r'(?P<start>(?:19|20)\d{2})(?:[^\d·]*?(?P<end>(?:19|20)\d{2}|[Pp]resent))?'
+# "500+", "1,234", "12K followers", "1.2M"
+_COUNT_PATTERN = r'(?P<number>\d[\d,]*(?:\.\d+)?)\s*(?P<suffix>[KkMm])?(?P<plus>\+)?'
+
+CONNECTION_BINS = [0, 50, 100, 250, 500, np.inf]
+CONNECTION_LABELS = ['0-49', '50-99', '100-249', '250-499', '500+']
+
+
+def _parse_unique(values: pd.Series, *parsers) -> list:
+    """Run each parser over the distinct values only and broadcast the results back.
+
+    Durations, year ranges and counts repeat heavily across profiles, so the
+    regexes see the distinct strings once instead of every row.
+    """
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    uniques = pd.Series(uniques, dtype='string')
+    # Missing values have code -1, which reindexes to <NA>
+    return [parser(uniques).reindex(codes).set_axis(values.index) for parser in parsers]
+
+
+def _numbered_columns(df: pd.DataFrame, prefix: str, part: str) -> List[str]:
+    return [column for column in (f"{prefix}_{i}_{part}" for i in range(1, 100)) if column in df.columns]
+
+
+def tenure_months(values: pd.Series) -> pd.Series:
+    """Months of tenure from LinkedIn duration strings ("2 yrs 3 mos"); <NA> when absent."""
+    text = values.astype('string')
+    # The tenure part follows the '·' in "2019 - Present · 2 yrs 3 mos"
+    tenure = text.str.split('·').str[-1]
+    parts = tenure.str.extract(_TENURE_PATTERN)
+    years = pd.to_numeric(parts['years'], errors='coerce')
+    months = pd.to_numeric(parts['months'], errors='coerce')
+    total = years.fillna(0) * 12 + months.fillna(0)
+    total = total.where((years.notna() | months.notna()).to_numpy())
+    total = total.mask(tenure.str.contains('less than a year', case=False, na=False).to_numpy(), 0)
+    return total.astype('Int32')
+
+
+def year_range(values: pd.Series, current_year: int) -> pd.DataFrame:
+    """start_year / end_year / is_current from "2015 – 2019" or "2019 - Present"."""
+    parts = values.astype('string').str.extract(_YEAR_RANGE_PATTERN)
+    is_current = parts['end'].str.lower().eq('present').fillna(False)
+    end = pd.to_numeric(parts['end'].mask(is_current, str(current_year)), errors='coerce')
+    return pd.DataFrame({
+        'start_year': pd.to_numeric(parts['start'], errors='coerce').astype('Int16'),
+        'end_year': end.astype('Int16'),
+        'is_current': is_current.astype('boolean'),
+    }, index=values.index)
+
+
+def parse_count(values: pd.Series) -> pd.DataFrame:
+    """Numeric value of display counts ("500+", "1,234", "12K") and whether it was capped with '+'."""
+    parts = values.astype('string').str.extract(_COUNT_PATTERN)
+    number = pd.to_numeric(parts['number'].str.replace(',', '', regex=False), errors='coerce')
+    multiplier = parts['suffix'].str.upper().map({'K': 1_000, 'M': 1_000_000}).astype('float64').fillna(1)
+    return pd.DataFrame({
+        'count': (number * multiplier).round().astype('Int64'),
+        'capped': parts['plus'].notna().astype('boolean').where(number.notna()),
+    }, index=values.index)
+
+
+def _stacked(df: pd.DataFrame, columns: List[str]) -> pd.Series:
+    """One long Series over several same-shaped columns, so each regex runs once."""
+    return pd.concat([df[column] for column in columns], ignore_index=True)
+
+
+def _block(values: pd.Series, position: int, df: pd.DataFrame) -> pd.Series:
+    """The slice of a stacked result that came from the column at `position`, re-aligned to `df`."""
+    size = len(df)
+    return values.iloc[position * size:(position + 1) * size].set_axis(df.index)
+
+
+def enrich(df: pd.DataFrame, current_year: Optional[int] = None) -> pd.DataFrame:
+    """Return a copy of `df` with typed columns derived from the raw display strings."""
+    current_year = current_year or datetime.now().year
+    enriched = {}
+
+    duration_columns = _numbered_columns(df, 'experience', 'duration')
+    if duration_columns:
+        durations = _stacked(df, duration_columns)
+        tenure, years = _parse_unique(durations, tenure_months, lambda text: year_range(text, current_year))
+        tenure_columns, start_columns = [], []
+        for position, column in enumerate(duration_columns):
+            prefix = column[:-len('_duration')]
+            enriched[f"{prefix}_tenure_months"] = _block(tenure, position, df)
+            enriched[f"{prefix}_start_year"] = _block(years['start_year'], position, df)
+            enriched[f"{prefix}_end_year"] = _block(years['end_year'], position, df)
+            tenure_columns.append(f"{prefix}_tenure_months")
+            start_columns.append(f"{prefix}_start_year")
+        tenure_frame = pd.DataFrame({name: enriched[name] for name in tenure_columns})
+        enriched['total_experience_months'] = tenure_frame.sum(axis=1, min_count=1).astype('Int32')
+        starts = pd.DataFrame({name: enriched[name] for name in start_columns})
+        enriched['career_start_year'] = starts.min(axis=1).astype('Int16')
+
+    years_columns = _numbered_columns(df, 'education', 'years')
+    if years_columns:
+        education_years, = _parse_unique(_stacked(df, years_columns), lambda text: year_range(text, current_year))
+        for position, column in enumerate(years_columns):
+            prefix = column[:-len('_years')]
+            enriched[f"{prefix}_start_year"] = _block(education_years['start_year'], position, df)
+            enriched[f"{prefix}_end_year"] = _block(education_years['end_year'], position, df)
+
+    if 'connections' in df.columns:
+        connections, = _parse_unique(df['connections'], parse_count)
+        enriched['connections_count'] = connections['count']
+        enriched['connections_bucket'] = pd.cut(
+            connections['count'].astype('float64'), CONNECTION_BINS, labels=CONNECTION_LABELS, right=False
+        )
+
+    if 'followers' in df.columns:
+        followers, = _parse_unique(df['followers'], parse_count)
+        enriched['followers_count'] = followers['count']
+
+    return df.assign(**enriched)
+
+
+def read_output(path: str) -> pd.DataFrame:
+    """Load a CSV or JSONL export (compression inferred from the suffix) as strings."""
+    name = Path(path).name
+    if '.jsonl' in name:
+        df = pd.read_json(path, lines=True, dtype=False)
+        return df.astype({column: 'string' for column in df.columns if df[column].dtype == object})
+    return pd.read_csv(path, dtype='string', keep_default_na=False, na_values=[''])
+
+
+def enrich_file(input_path: str, output_path: Optional[str] = None) -> str:
+    """Enrich an export and write `<name>.enriched.csv[.gz|.zst]` (or `output_path`)."""
+    if output_path is None:
+        path = Path(input_path)
+        stem = path.name.partition('.')[0]
+        compression = next((suffix for suffix in ('.gz', '.zst') if path.name.endswith(suffix)), '')
+        output_path = str(path.with_name(f"{stem}.enriched.csv{compression}"))
+    enrich(read_output(input_path)).to_csv(output_path, index=False)
+    return output_path
+
+
+def enriched_columns() -> List[str]:
+    """Columns enrich() adds for the full profile schema, in output order."""
+    sample = pd.DataFrame({column: pd.Series(dtype='string') for column in PROFILE_SCHEMA.columns()})
+    return [column for column in enrich(sample).columns if column not in sample.columns]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Add typed tenure, year and count columns to a scrape export.')
+    parser.add_argument('input', help='CSV or JSONL export (.gz / .zst supported)')
+    parser.add_argument('-o', '--output', help='Output CSV (default: <input>.enriched.csv)')
+    args = parser.parse_args(argv)
+
+    started = datetime.now()
+    output_path = enrich_file(args.input, args.output)
+    elapsed = (datetime.now() - started).total_seconds()
+    print(f"✅ Enriched {args.input} -> {output_path} in {elapsed:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,316 @@
+"""
+Company and school entity resolution across runs.
+
+Free-text names ("Microsoft", "Microsoft Corporation", "Microsoft · Full-time")
+are normalized to a key and resolved against an in-memory index built from
+past outputs:
+
+  1. exact match on the normalized key,
+  2. candidates from a token-level prefix trie ("google cloud" -> "google")
+     and from token blocking on the query's rarest tokens,
+  3. the best candidate by IDF-weighted token overlap, if above the threshold.
+
+Unmatched names become new entities. IDs are derived from the canonical key,
+so they stay stable as long as the index is kept (data/cache/entity_index.json).
+
+    python -m scrapers.entities build data/output/*.csv.gz
+    python -m scrapers.entities annotate data/output/linkedin_data_20240101_120000.csv.gz
+    python -m scrapers.entities lookup company "Microsoft Corp."
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import sys
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from .enrichment import read_output
+from .schema import PROFILE_SCHEMA
+
+DEFAULT_INDEX = 'data/cache/entity_index.json'
+
+# Trailing tokens that don't distinguish one organization from another
+LEGAL_SUFFIXES = frozenset({
+    'inc', 'incorporated', 'corp', 'corporation', 'co', 'company', 'llc', 'ltd', 'limited', 'plc',
+    'gmbh', 'ag', 'sa', 'bv', 'nv', 'pvt', 'pte', 'lp', 'llp', 'srl', 'spa', 'oy', 'ab', 'as',
+})
+ABBREVIATIONS = {'univ': 'university', 'uni': 'university', 'inst': 'institute', 'intl': 'international',
+                 'tech': 'technology', 'mgmt': 'management', 'natl': 'national', 'st': 'saint'}
+_NON_WORD = re.compile(r'[^\w\s]+')
+_PARENTHETICAL = re.compile(r'\([^)]*\)')
+
+# Columns holding entity names -> (entity kind, id column)
+COMPANY_COLUMNS = ['current_company'] + [f"experience_{i}_company" for i in range(1, 6)]
+SCHOOL_COLUMNS = [f"education_{i}_school" for i in range(1, 4)]
+ENTITY_COLUMNS = {
+    **{column: ('company', f"{column}_id") for column in COMPANY_COLUMNS},
+    **{column: ('school', f"{column}_id") for column in SCHOOL_COLUMNS},
+}
+ID_PREFIXES = {'company': 'co', 'school': 'ed'}
+
+
+def normalize_name(text: Optional[str]) -> str:
+    """Normalized matching key: no employment type, accents, punctuation or legal suffix."""
+    if not text:
+        return ''
+    # "Microsoft · Full-time" -> "Microsoft"
+    text = _PARENTHETICAL.sub(' ', text.split('·')[0])
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(char for char in text if not unicodedata.combining(char)).lower()
+    text = _NON_WORD.sub(' ', text.replace('&', ' and '))
+    tokens = [ABBREVIATIONS.get(token, token) for token in text.split()]
+    if tokens and tokens[0] == 'the':
+        tokens = tokens[1:]
+    while len(tokens) > 1 and tokens[-1] in LEGAL_SUFFIXES:
+        tokens.pop()
+    return ' '.join(tokens)
+
+
+def display_name(text: str) -> str:
+    return ' '.join(text.split('·')[0].split())
+
+
+class EntityIndex:
+    """Normalized-name index for one entity kind: aliases, token trie and token blocks."""
+
+    def __init__(self, kind: str, threshold: float = 0.75, max_block: int = 2000):
+        self.kind = kind
+        self.prefix = ID_PREFIXES.get(kind, kind[:2])
+        self.threshold = threshold
+        self.max_block = max_block
+        self.names: Dict[str, str] = {}      # id -> canonical display name
+        self.keys: Dict[str, str] = {}       # id -> canonical key
+        self.aliases: Dict[str, str] = {}    # normalized key -> id
+        self._trie: Dict = {}
+        self._blocks: Dict[str, List[str]] = {}
+
+    def __len__(self):
+        return len(self.names)
+
+    def _entity_id(self, key: str) -> str:
+        return f"{self.prefix}_{hashlib.blake2b(key.encode('utf-8'), digest_size=6).hexdigest()}"
+
+    def _index_entity(self, entity_id: str, key: str):
+        node = self._trie
+        for token in key.split():
+            node = node.setdefault(token, {})
+        node.setdefault('', entity_id)
+        for token in set(key.split()):
+            self._blocks.setdefault(token, []).append(entity_id)
+
+    def add(self, name: str) -> Optional[str]:
+        """Resolve `name`, creating a new entity when nothing matches."""
+        key = normalize_name(name)
+        if not key:
+            return None
+        entity_id = self.resolve_key(key)
+        if entity_id is None:
+            entity_id = self._entity_id(key)
+            if entity_id not in self.names:
+                self.names[entity_id] = display_name(name)
+                self.keys[entity_id] = key
+                self._index_entity(entity_id, key)
+        self.aliases[key] = entity_id
+        return entity_id
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Canonical id for `name`, or None if it matches no known entity."""
+        return self.resolve_key(normalize_name(name))
+
+    def resolve_key(self, key: str) -> Optional[str]:
+        if not key:
+            return None
+        entity_id = self.aliases.get(key)
+        if entity_id is not None:
+            return entity_id
+        tokens = key.split()
+        best_id, best_score = None, self.threshold
+        for candidate in self._candidates(tokens):
+            score = self._similarity(tokens, self.keys[candidate].split())
+            if score >= best_score:
+                best_id, best_score = candidate, score
+        return best_id
+
+    def _candidates(self, tokens: List[str]) -> set:
+        candidates = set()
+        # Longest registered name that the query starts with, on token boundaries
+        node, prefix_id = self._trie, None
+        for token in tokens:
+            node = node.get(token)
+            if node is None:
+                break
+            prefix_id = node.get('', prefix_id)
+        if prefix_id is not None:
+            candidates.add(prefix_id)
+        # Entities sharing one of the query's rarest tokens
+        blocks = sorted((self._blocks[token] for token in set(tokens) if token in self._blocks), key=len)
+        for block in blocks[:3]:
+            if len(block) <= self.max_block:
+                candidates.update(block)
+        return candidates
+
+    def _weight(self, token: str) -> float:
+        return math.log(1 + len(self.names) / (1 + len(self._blocks.get(token, ()))))
+
+    def _similarity(self, query: List[str], candidate: List[str]) -> float:
+        """IDF-weighted Jaccard overlap of the two token sets."""
+        query, candidate = set(query), set(candidate)
+        union = sum(self._weight(token) for token in query | candidate)
+        if not union:
+            return 0.0
+        return sum(self._weight(token) for token in query & candidate) / union
+
+    def name(self, entity_id: str) -> Optional[str]:
+        return self.names.get(entity_id)
+
+    def as_dict(self) -> Dict:
+        return {
+            'entities': [[entity_id, self.names[entity_id], self.keys[entity_id]] for entity_id in self.names],
+            'aliases': self.aliases,
+        }
+
+    def load_dict(self, data: Dict):
+        for entity_id, name, key in data.get('entities', []):
+            self.names[entity_id] = name
+            self.keys[entity_id] = key
+            self._index_entity(entity_id, key)
+        self.aliases.update(data.get('aliases', {}))
+
+
+class EntityResolver:
+    """Company and school indexes, persisted together, that annotate rows with canonical ids."""
+
+    def __init__(self, path: Optional[str] = DEFAULT_INDEX, threshold: float = 0.75, learn: bool = True):
+        self.path = Path(path) if path else None
+        self.learn = learn
+        self.logger = logging.getLogger(__name__)
+        self.indexes = {kind: EntityIndex(kind, threshold) for kind in ID_PREFIXES}
+        self._dirty = False
+        if self.path is not None:
+            self.load()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> Optional['EntityResolver']:
+        """Create the resolver from the 'entities' config section, or None when disabled."""
+        entity_config = config.get('entities', {})
+        if not entity_config.get('enabled', False):
+            return None
+        return cls(entity_config.get('path', DEFAULT_INDEX), entity_config.get('threshold', 0.75),
+                   learn=entity_config.get('learn', True))
+
+    def resolve(self, kind: str, name: str) -> Optional[str]:
+        index = self.indexes[kind]
+        if not self.learn:
+            return index.resolve(name)
+        before = len(index.aliases)
+        entity_id = index.add(name)
+        self._dirty = self._dirty or len(index.aliases) != before
+        return entity_id
+
+    @PROFILE_SCHEMA.produces('entities')
+    def resolve_profile(self, profile: Dict) -> Dict:
+        """Canonical id fields for one scraped profile."""
+        return {id_column: self.resolve(kind, profile.get(column)) or ''
+                for column, (kind, id_column) in ENTITY_COLUMNS.items()}
+
+    def annotate_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Add the *_id columns to a historical export, resolving each distinct name once."""
+        ids = {}
+        for column, (kind, id_column) in ENTITY_COLUMNS.items():
+            if column not in df.columns:
+                continue
+            codes, uniques = pd.factorize(df[column], use_na_sentinel=True)
+            resolved = pd.array([self.resolve(kind, name) for name in uniques] + [None], dtype='string')
+            # Code -1 (missing) picks the trailing None
+            ids[id_column] = pd.Series(resolved[codes], index=df.index)
+        return df.assign(**ids)
+
+    def build(self, paths: Iterable[str]) -> int:
+        """Learn every company and school name from past output files; returns rows read."""
+        learn, self.learn = self.learn, True
+        rows = 0
+        try:
+            for path in paths:
+                df = read_output(path)
+                rows += len(df)
+                for column, (kind, _) in ENTITY_COLUMNS.items():
+                    if column in df.columns:
+                        for name in df[column].dropna().unique():
+                            self.resolve(kind, name)
+        finally:
+            self.learn = learn
+        return rows
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (json.JSONDecodeError, OSError) as e:
+            self.logger.warning(f"Ignoring unreadable entity index {self.path}: {e}")
+            return
+        for kind, index in self.indexes.items():
+            index.load_dict(data.get(kind, {}))
+
+    def save(self):
+        """Atomically write the index if anything was learned."""
+        if self.path is None or not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({kind: index.as_dict() for kind, index in self.indexes.items()}, f)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build and query the company/school entity index.')
+    parser.add_argument('--index', default=DEFAULT_INDEX)
+    parser.add_argument('--threshold', type=float, default=0.75)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build = subparsers.add_parser('build', help='Learn names from past CSV/JSONL outputs')
+    build.add_argument('paths', nargs='+')
+    annotate = subparsers.add_parser('annotate', help='Add canonical id columns to an export')
+    annotate.add_argument('input')
+    annotate.add_argument('-o', '--output')
+    lookup = subparsers.add_parser('lookup', help='Resolve one name without learning it')
+    lookup.add_argument('kind', choices=sorted(ID_PREFIXES))
+    lookup.add_argument('name')
+    args = parser.parse_args(argv)
+
+    resolver = EntityResolver(args.index, args.threshold, learn=args.command != 'lookup')
+    if args.command == 'build':
+        rows = resolver.build(args.paths)
+        resolver.save()
+        counts = ', '.join(f"{len(index)} {kind} entities" for kind, index in resolver.indexes.items())
+        print(f"✅ Indexed {rows} rows: {counts}")
+        return 0
+
+    if args.command == 'annotate':
+        output = args.output or re.sub(r'(\.csv|\.jsonl)', r'.entities.csv', args.input, count=1)
+        resolver.annotate_frame(read_output(args.input)).to_csv(output, index=False)
+        resolver.save()
+        print(f"✅ Wrote {output}")
+        return 0
+
+    index = resolver.indexes[args.kind]
+    entity_id = index.resolve(args.name)
+    if entity_id is None:
+        print(f"❌ No {args.kind} matches {args.name!r} (key {normalize_name(args.name)!r})")
+        return 1
+    print(f"{entity_id}  {index.name(entity_id)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+import copy
+import hashlib
+import json
+import logging
+import os
+import re
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+# Per-request tokens that change between otherwise identical page loads
+VOLATILE_PATTERNS = [
+    (re.compile(r'(name="csrf[^"]*"\s+content=")[^"]*"', re.IGNORECASE), r'\1"'),
+    (re.compile(r'(csrf[-_]?token["\']?\s*[:=]\s*["\'])[^"\']*', re.IGNORECASE), r'\1'),
+    (re.compile(r'ajax:\d+'), 'ajax:'),
+    (re.compile(r'\bnonce="[^"]*"'), 'nonce=""'),
+    (re.compile(r'\bid="ember\d+"'), 'id="ember"'),
+    (re.compile(r'\b(?:trackingId|trk|lipi)=[^"&\s]*'), ''),
+    # Unix timestamps (s / ms) in attribute values and query strings, never in visible text
+    (re.compile(r'([=:]["\']?)1\d{9}(?:\d{3})?\b'), r'\g<1>0'),
+    # Relative-time widgets whose whole text is "3d", "1w ago", "5 hours ago", ...
+    (re.compile(r'>\s*\d{1,3}(?:[smhdw](?:\s+ago)?|\s+(?:second|minute|hour|day|week)s?\s+ago)\s*(?:•\s*)?<',
+                re.IGNORECASE), '><'),
+    # Live counters (notification badges, aria-live regions)
+    (re.compile(r'(<[^>]*(?:notification-badge|aria-live=)[^>]*>)[^<]*'), r'\1'),
+    (re.compile(r'\s+'), ' '),
+]
+
+
+def normalize_html(html: str) -> str:
+    """Strip volatile tokens (CSRF values, nonces, ember ids, timestamps, relative times) from captured HTML."""
+    for pattern, replacement in VOLATILE_PATTERNS:
+        html = pattern.sub(replacement, html)
+    return html
+
+
+def content_hash(html: str) -> str:
+    """Fast 128-bit fingerprint of the normalized page content."""
+    return hashlib.blake2b(normalize_html(html).encode('utf-8', 'replace'), digest_size=16).hexdigest()
+
+
+class ExtractionCache:
+    """LRU memo of extraction results keyed by page content hash, persisted as JSON."""
+
+    def __init__(self, path: str = 'data/cache/extraction_cache.json', max_entries: int = 5000,
+                 save_every: int = 50):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.save_every = save_every
+        self.hits = 0
+        self.misses = 0
+        self.logger = logging.getLogger(__name__)
+        self._entries: 'OrderedDict[str, Dict]' = OrderedDict()
+        self._unsaved = 0
+        self.load()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> Optional['ExtractionCache']:
+        """Create the cache from the 'cache' config section, or None when disabled."""
+        cache_config = config.get('cache', {})
+        if not cache_config.get('enabled', False):
+            return None
+        return cls(
+            path=cache_config.get('path', 'data/cache/extraction_cache.json'),
+            max_entries=cache_config.get('max_entries', 5000),
+            save_every=cache_config.get('save_every', 50)
+        )
+
+    def get(self, key: str) -> Optional[Dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return copy.deepcopy(entry)
+
+    def put(self, key: str, data: Dict):
+        self._entries[key] = copy.deepcopy(data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._unsaved += 1
+        if self.save_every and self._unsaved >= self.save_every:
+            self.save()
+
+    def load(self):
+        """Load persisted entries, oldest first, ignoring a missing or corrupt file."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return
+        except (json.JSONDecodeError, OSError) as e:
+            self.logger.warning(f"Ignoring unreadable extraction cache {self.path}: {e}")
+            return
+        for key, data in entries[-self.max_entries:]:
+            self._entries[key] = data
+
+    def save(self):
+        """Atomically write the cache in LRU order."""
+        if not self._unsaved and self.path.exists():
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(list(self._entries.items()), f)
+        os.replace(tmp_path, self.path)
+        self._unsaved = 0
+
+    def __len__(self):
+        return len(self._entries)
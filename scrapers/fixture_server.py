@@ -0,0 +1,328 @@
+"""
+Local stand-in for the LinkedIn pages the scraper touches.
+
+Serves synthetic or recorded /in/<username>/ pages, a fake /login flow and
+authwall/unavailable variants so scrape_profiles can be run and benchmarked
+offline. Run standalone with: python -m scrapers.fixture_server
+"""
+
+import argparse
+import html
+import logging
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import parse_qs, quote, urlparse
+
+SESSION_COOKIE = 'li_at=fixture-session'
+
+FIRST_NAMES = ['Ada', 'Grace', 'Alan', 'Linus', 'Margaret', 'Dennis', 'Barbara', 'Ken', 'Radia', 'Guido']
+LAST_NAMES = ['Lovelace', 'Hopper', 'Turing', 'Torvalds', 'Hamilton', 'Ritchie', 'Liskov', 'Thompson', 'Perlman', 'Rossum']
+TITLES = ['Software Engineer', 'Data Scientist', 'Engineering Manager', 'Product Manager', 'Site Reliability Engineer']
+COMPANIES = ['Microsoft', 'Google', 'Acme Corporation', 'Initech', 'Globex Inc.', 'Umbrella Ltd']
+SCHOOLS = ['MIT', 'Stanford University', 'University of Cambridge', 'ETH Zurich', 'IIT Delhi']
+DEGREES = ['Bachelor of Science', 'Master of Science', 'PhD']
+FIELDS = ['Computer Science', 'Mathematics', 'Physics', 'Economics']
+SKILLS = ['Python', 'SQL', 'Kubernetes', 'Machine Learning', 'Go', 'Rust', 'Leadership', 'Distributed Systems', 'React', 'Statistics']
+CITIES = ['Seattle, Washington, United States', 'London, England, United Kingdom', 'Bengaluru, Karnataka, India', 'Berlin, Germany']
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html><head><title>{title}</title>
+<meta property="og:title" content="{og_title}">
+<meta property="og:description" content="{og_description}">
+</head><body>
+<nav class="global-nav">Home My Network Jobs Messaging Notifications</nav>
+<main>{body}</main>
+{lazy}
+</body></html>"""
+
+LAZY_TEMPLATE = """<template id="lazy-sections">{sections}</template>
+<script>
+(function () {{
+    var loaded = false;
+    function load() {{
+        if (loaded) {{ return; }}
+        loaded = true;
+        var tpl = document.getElementById('lazy-sections');
+        document.querySelector('main').appendChild(tpl.content.cloneNode(true));
+    }}
+    window.addEventListener('scroll', function () {{
+        if (window.scrollY > 0) {{ setTimeout(load, {delay_ms}); }}
+    }});
+}})();
+</script>"""
+
+LOGIN_PAGE = """<!DOCTYPE html>
+<html><head><title>LinkedIn Login, Sign in | LinkedIn</title></head><body>
+<form method="post" action="/checkpoint/lg/login-submit">
+<input id="username" name="session_key" type="text">
+<input id="password" name="session_password" type="password">
+<button type="submit">Sign in</button>
+</form></body></html>"""
+
+FEED_PAGE = """<!DOCTYPE html>
+<html><head><title>Feed | LinkedIn</title></head><body><main>Welcome back</main></body></html>"""
+
+AUTHWALL_PAGE = """<!DOCTYPE html>
+<html><head><title>Sign Up | LinkedIn</title></head><body>
+<main><h1>Join LinkedIn</h1><p>Sign in or join now to see this profile.</p></main></body></html>"""
+
+UNAVAILABLE_PAGE = """<!DOCTYPE html>
+<html><head><title>Profile Unavailable | LinkedIn</title></head><body>
+<main><h1>This profile is not available</h1><p>The profile you're looking for is unavailable.</p></main></body></html>"""
+
+
+def _list_section(field: str, anchor: str, heading: str, items) -> str:
+    """Render a pvs-list style section with (bold, normal, light) item rows."""
+    rows = []
+    for bold, normal, light in items:
+        rows.append(
+            '<li class="pvs-list__paged-list-item">'
+            f'<div class="mr1 t-bold"><span aria-hidden="true">{html.escape(bold)}</span></div>'
+            f'<span class="t-14 t-normal"><span aria-hidden="true">{html.escape(normal)}</span></span>'
+            f'<span class="t-14 t-normal t-black--light"><span aria-hidden="true">{html.escape(light)}</span></span>'
+            '</li>'
+        )
+    return (
+        f'<section class="artdeco-card" data-field="{field}"><div id="{anchor}"></div>'
+        f'<h2>{heading}</h2><ul>{"".join(rows)}</ul></section>'
+    )
+
+
+def synthetic_profile(username: str) -> Dict:
+    """Build deterministic fake profile content for a username."""
+    rng = random.Random(username)
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    experience = []
+    start_year = rng.randint(2005, 2015)
+    for _ in range(rng.randint(1, 4)):
+        years = rng.randint(1, 5)
+        months = rng.randint(0, 11)
+        experience.append((
+            rng.choice(TITLES),
+            f"{rng.choice(COMPANIES)} · Full-time",
+            f"{start_year} - {start_year + years} · {years} yrs {months} mos",
+        ))
+        start_year += years
+    education = []
+    for _ in range(rng.randint(1, 2)):
+        year = rng.randint(1995, 2015)
+        education.append((
+            rng.choice(SCHOOLS),
+            f"{rng.choice(DEGREES)}, {rng.choice(FIELDS)}",
+            f"{year} – {year + 4}",
+        ))
+    return {
+        'name': name,
+        'headline': f"{experience[-1][0]} at {experience[-1][1].split(' · ')[0]}",
+        'location': rng.choice(CITIES),
+        'about': f"{name} builds reliable systems. " * rng.randint(2, 6),
+        'connections': rng.choice(['500+', str(rng.randint(50, 499))]),
+        'experience': list(reversed(experience)),
+        'education': education,
+        'skills': rng.sample(SKILLS, rng.randint(3, 8)),
+    }
+
+
+def render_profile(username: str, lazy_sections: bool = True, lazy_delay_ms: int = 300) -> str:
+    """Render a synthetic profile page using the markup the extractors expect."""
+    profile = synthetic_profile(username)
+    top_card = (
+        '<section class="artdeco-card pv-top-card"><div class="ph5">'
+        f'<div class="pv-top-card-profile-picture"><img src="/media/{quote(username)}.jpg"></div>'
+        f'<h1 class="text-heading-xlarge inline t-24 v-align-middle break-words">{html.escape(profile["name"])}</h1>'
+        f'<div class="text-body-medium break-words">{html.escape(profile["headline"])}</div>'
+        f'<span class="text-body-small inline t-black--light break-words">{html.escape(profile["location"])}</span>'
+        f'<ul class="pv-top-card--list-bullet"><li><span>{profile["connections"]} connections</span></li></ul>'
+        '</div></section>'
+    )
+    about = (
+        '<section class="artdeco-card"><div id="about"></div><h2>About</h2>'
+        f'<div class="pv-shared-text-with-see-more"><span class="full-width">{html.escape(profile["about"])}</span></div>'
+        '</section>'
+    )
+    skills = ''.join(
+        f'<li class="pvs-skill"><div class="mr1"><span aria-hidden="true">{html.escape(skill)}</span></div></li>'
+        for skill in profile['skills']
+    )
+    deferred = (
+        _list_section('experience', 'experience', 'Experience', profile['experience'])
+        + _list_section('education', 'education', 'Education', profile['education'])
+        + f'<section class="artdeco-card" data-field="skill"><div id="skills"></div><h2>Skills</h2><ul>{skills}</ul></section>'
+    )
+    if lazy_sections:
+        body = top_card + about
+        lazy = LAZY_TEMPLATE.format(sections=deferred, delay_ms=int(lazy_delay_ms))
+    else:
+        body = top_card + about + deferred
+        lazy = ''
+    return PAGE_TEMPLATE.format(
+        title=html.escape(f"{profile['name']} | {profile['headline']} | LinkedIn"),
+        og_title=html.escape(f"{profile['name']} | {profile['headline']}", quote=True),
+        og_description=html.escape(profile['about'][:200], quote=True),
+        body=body,
+        lazy=lazy,
+    )
+
+
+class FixtureRequestHandler(BaseHTTPRequestHandler):
+    """Request handler routing the LinkedIn URLs the scraper visits."""
+
+    server_version = 'LinkedInFixture/1.0'
+
+    def log_message(self, format, *args):
+        logging.getLogger(__name__).debug("%s - %s", self.address_string(), format % args)
+
+    def _respond(self, status: int, body: str = '', headers: Optional[Dict] = None):
+        self.server.fixture.simulate_latency()
+        payload = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _redirect(self, location: str, headers: Optional[Dict] = None):
+        self._respond(303, '', dict(headers or {}, Location=location))
+
+    def _has_session(self) -> bool:
+        return SESSION_COOKIE in (self.headers.get('Cookie') or '')
+
+    def do_GET(self):
+        fixture = self.server.fixture
+        path = urlparse(self.path).path
+
+        if path.rstrip('/') == '/login':
+            return self._respond(200, LOGIN_PAGE)
+        if path.startswith('/feed'):
+            if fixture.require_login and not self._has_session():
+                return self._redirect('/login')
+            return self._respond(200, FEED_PAGE)
+        if path.startswith('/authwall'):
+            return self._respond(200, AUTHWALL_PAGE)
+        if path.startswith('/in/'):
+            username = path[len('/in/'):].strip('/').split('/')[0]
+            if fixture.is_authwalled(username) or (fixture.require_login and not self._has_session()):
+                return self._redirect(f"/authwall?sessionRedirect={quote(self.path)}")
+            if fixture.is_unavailable(username):
+                return self._respond(404, UNAVAILABLE_PAGE)
+            return self._respond(200, fixture.profile_page(username))
+        if path.startswith('/media/'):
+            return self._respond(200, '')
+        self._respond(404, UNAVAILABLE_PAGE)
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        length = int(self.headers.get('Content-Length') or 0)
+        form = parse_qs(self.rfile.read(length).decode('utf-8'))
+
+        if path == '/checkpoint/lg/login-submit':
+            if form.get('session_key') and form.get('session_password'):
+                return self._redirect('/feed/', {'Set-Cookie': f"{SESSION_COOKIE}; Path=/"})
+            return self._redirect('/login')
+        self._respond(404, UNAVAILABLE_PAGE)
+
+
+class FixtureServer:
+    """Threaded local HTTP server standing in for linkedin.com."""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8765, latency: float = 0.0,
+                 latency_jitter: float = 0.0, lazy_sections: bool = True, lazy_delay_ms: int = 300,
+                 fixtures_dir: str = 'data/fixtures', require_login: bool = True,
+                 authwall_users=None, unavailable_users=None):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.lazy_sections = lazy_sections
+        self.lazy_delay_ms = lazy_delay_ms
+        self.fixtures_dir = Path(fixtures_dir)
+        self.require_login = require_login
+        self.authwall_users = set(authwall_users or [])
+        self.unavailable_users = set(unavailable_users or [])
+        self.logger = logging.getLogger(__name__)
+        self._httpd = None
+        self._thread = None
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'FixtureServer':
+        """Create a server from the 'fixture_server' config section."""
+        options = dict(config.get('fixture_server', {}))
+        options.pop('enabled', None)
+        return cls(**options)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def simulate_latency(self):
+        """Sleep for the configured per-request latency."""
+        delay = self.latency + random.uniform(0, self.latency_jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def is_authwalled(self, username: str) -> bool:
+        return username in self.authwall_users or username.startswith('authwall-')
+
+    def is_unavailable(self, username: str) -> bool:
+        return username in self.unavailable_users or username.startswith('unavailable-')
+
+    def profile_page(self, username: str) -> str:
+        """Return the recorded page for a username if present, else a synthetic one."""
+        recorded = self.fixtures_dir / f"{username}.html"
+        if recorded.exists():
+            return recorded.read_text(encoding='utf-8')
+        return render_profile(username, self.lazy_sections, self.lazy_delay_ms)
+
+    def start(self):
+        """Start serving in a background daemon thread."""
+        self._httpd = ThreadingHTTPServer((self.host, self.port), FixtureRequestHandler)
+        self._httpd.fixture = self
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='fixture-server', daemon=True)
+        self._thread.start()
+        self.logger.info(f"Fixture server listening on {self.base_url}")
+        return self
+
+    def stop(self):
+        """Stop the server and wait for the thread to exit."""
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve stand-in LinkedIn pages for offline runs.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Random extra latency in seconds')
+    parser.add_argument('--no-lazy', action='store_true', help='Render every section up front')
+    parser.add_argument('--no-login', action='store_true', help='Serve profiles without a session')
+    parser.add_argument('--fixtures-dir', default='data/fixtures')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = FixtureServer(
+        host=args.host, port=args.port, latency=args.latency, latency_jitter=args.jitter,
+        lazy_sections=not args.no_lazy, fixtures_dir=args.fixtures_dir, require_login=not args.no_login
+    ).start()
+    print(f"Serving fixtures on {server.base_url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
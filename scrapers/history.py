@@ -0,0 +1,211 @@
+"""
+Historical run-performance store.
+
+Every main.py run appends its aggregate metrics to a local SQLite database;
+`python -m scrapers.history check` compares the latest run against the
+rolling baseline of earlier runs and exits non-zero on regressions.
+"""
+
+import argparse
+import json
+import sqlite3
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DEFAULT_DB = 'data/run_history.db'
+
+# metric -> True if higher is better, False if lower is better
+METRICS = {
+    'profiles_per_hour': True,
+    'mean_load_seconds': False,
+    'mean_parse_seconds': False,
+    'success_rate': True,
+    'authwall_rate': False,
+    'limited_rate': False,
+}
+# Rates are compared by absolute difference, timings and throughput relatively
+RATE_METRICS = {'success_rate', 'authwall_rate', 'limited_rate'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    recorded_at REAL NOT NULL,
+    profiles INTEGER NOT NULL,
+    elapsed_seconds REAL,
+    profiles_per_hour REAL,
+    mean_load_seconds REAL,
+    mean_parse_seconds REAL,
+    success_rate REAL,
+    authwall_rate REAL,
+    limited_rate REAL,
+    bytes_written INTEGER,
+    summary_json TEXT
+)
+"""
+
+
+def metrics_from_summary(summary: Dict, bytes_written: int = 0) -> Dict:
+    """Flatten a RunSummary dict into the stored metric columns."""
+    profiles = summary.get('profiles', 0)
+    outcomes = summary.get('outcomes', {})
+
+    def rate(*names):
+        return sum(outcomes.get(name, 0) for name in names) / profiles if profiles else None
+
+    return {
+        'run_id': summary['run_id'],
+        'profiles': profiles,
+        'elapsed_seconds': summary.get('elapsed_seconds'),
+        'profiles_per_hour': summary.get('profiles_per_hour'),
+        'mean_load_seconds': summary.get('mean_load_seconds'),
+        'mean_parse_seconds': summary.get('mean_parse_seconds'),
+        'success_rate': rate('success', 'partial'),
+        'authwall_rate': rate('authwall'),
+        'limited_rate': rate('limited', 'no_data'),
+        'bytes_written': bytes_written,
+    }
+
+
+class RunHistory:
+    """SQLite-backed store of per-run aggregate metrics."""
+
+    def __init__(self, path: str = DEFAULT_DB):
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute(SCHEMA)
+        self.conn.commit()
+
+    def record_run(self, summary: Dict, bytes_written: int = 0) -> Dict:
+        """Append (or replace) the metrics of one run."""
+        row = metrics_from_summary(summary, bytes_written)
+        row['recorded_at'] = time.time()
+        row['summary_json'] = json.dumps(summary, default=str)
+        columns = ', '.join(row)
+        placeholders = ', '.join(f":{key}" for key in row)
+        with self.conn:
+            self.conn.execute(f"INSERT OR REPLACE INTO runs ({columns}) VALUES ({placeholders})", row)
+        return row
+
+    def recent(self, limit: int = 20) -> List[Dict]:
+        """Most recent runs first."""
+        cursor = self.conn.execute("SELECT * FROM runs ORDER BY recorded_at DESC LIMIT ?", (limit,))
+        return [dict(row) for row in cursor]
+
+    def check_regressions(self, window: int = 10, threshold: float = 0.2,
+                          rate_threshold: float = 0.1, min_profiles: int = 1) -> List[Dict]:
+        """Compare the latest run with the mean of the previous `window` runs.
+
+        Throughput and timings regress when they are more than `threshold`
+        (relative) worse than the baseline; rates when they move more than
+        `rate_threshold` (absolute) in the wrong direction.
+        """
+        runs = [run for run in self.recent(window + 1) if run['profiles'] >= min_profiles]
+        if len(runs) < 2:
+            return []
+        latest, previous = runs[0], runs[1:]
+        regressions = []
+        for metric, higher_is_better in METRICS.items():
+            values = [run[metric] for run in previous if run[metric] is not None]
+            current = latest[metric]
+            if not values or current is None:
+                continue
+            baseline = sum(values) / len(values)
+            if metric in RATE_METRICS:
+                change = current - baseline
+                regressed = change < -rate_threshold if higher_is_better else change > rate_threshold
+            else:
+                if baseline == 0:
+                    continue
+                change = (current - baseline) / baseline
+                regressed = change < -threshold if higher_is_better else change > threshold
+            if regressed:
+                regressions.append({
+                    'metric': metric,
+                    'run_id': latest['run_id'],
+                    'current': round(current, 4),
+                    'baseline': round(baseline, 4),
+                    'change': round(change, 4),
+                })
+        return regressions
+
+    def fill_rate_baseline(self, window: int = 10, min_profiles: int = 1) -> Dict[str, float]:
+        """Median per-field fill rate over the last `window` runs that recorded fill rates.
+
+        The median keeps one broken run from dragging the baseline down.
+        """
+        rates: Dict[str, List[float]] = {}
+        runs = 0
+        for run in self.recent(window * 3):
+            if runs >= window:
+                break
+            if run['profiles'] < min_profiles or not run['summary_json']:
+                continue
+            fill_rates = json.loads(run['summary_json']).get('fill_rates')
+            if not fill_rates:
+                continue
+            runs += 1
+            for field, rate in fill_rates.items():
+                rates.setdefault(field, []).append(rate)
+        return {field: statistics.median(values) for field, values in rates.items()}
+
+    def close(self):
+        self.conn.close()
+
+
+def history_from_config(config: Dict) -> Optional[RunHistory]:
+    """Open the history store from the 'history' config section, or None when disabled."""
+    history_config = config.get('history', {})
+    if not history_config.get('enabled', False):
+        return None
+    return RunHistory(history_config.get('path', DEFAULT_DB))
+
+
+def format_regression(regression: Dict) -> str:
+    change = regression['change']
+    shown = f"{change:+.1%}" if regression['metric'] not in RATE_METRICS else f"{change:+.3f}"
+    return (f"{regression['metric']}: {regression['current']} vs baseline {regression['baseline']} "
+            f"({shown})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Inspect run history and detect performance regressions.')
+    parser.add_argument('command', choices=['report', 'check'])
+    parser.add_argument('--db', default=DEFAULT_DB)
+    parser.add_argument('--window', type=int, default=10, help='Number of earlier runs in the baseline')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Relative change that counts as a regression')
+    parser.add_argument('--rate-threshold', type=float, default=0.1, help='Absolute change in rates that counts')
+    parser.add_argument('--limit', type=int, default=10, help='Runs to show in the report')
+    args = parser.parse_args(argv)
+
+    history = RunHistory(args.db)
+    try:
+        if args.command == 'report':
+            print(f"{'run_id':<18}{'profiles':>9}{'prof/h':>9}{'load s':>8}{'parse s':>8}{'ok':>7}{'wall':>7}{'bytes':>12}")
+            for run in history.recent(args.limit):
+                def fmt(value, spec):
+                    return format(value, spec) if value is not None else '-'
+                print(f"{run['run_id']:<18}{run['profiles']:>9}{fmt(run['profiles_per_hour'], '>9.1f')}"
+                      f"{fmt(run['mean_load_seconds'], '>8.2f')}{fmt(run['mean_parse_seconds'], '>8.2f')}"
+                      f"{fmt(run['success_rate'], '>7.0%')}{fmt(run['authwall_rate'], '>7.0%')}"
+                      f"{run['bytes_written'] or 0:>12}")
+            return 0
+
+        regressions = history.check_regressions(args.window, args.threshold, args.rate_threshold)
+        if not regressions:
+            print("✅ No regressions against the rolling baseline")
+            return 0
+        print("⚠️ Regressions detected:")
+        for regression in regressions:
+            print(f"   - {format_regression(regression)}")
+        return 1
+    finally:
+        history.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,442 @@
+"""
+Durable priority queue of profile URLs for long-running scrape workers.
+
+Producers submit URL lists as jobs with a priority and an optional deadline;
+every URL becomes a queue item. A worker leases the most urgent items across
+all jobs (highest priority, then earliest deadline, then oldest), scrapes them
+in one scrape_profiles() call and acks each item as its profile arrives,
+extending the lease on the rest after every attempt. Items left without a
+profile go back to the queue only when their last outcome in that batch is
+one the retry policy retries (a timeout, a driver crash); an unavailable or
+authwalled profile fails straight away. Items whose lease runs out (a crashed
+or killed worker) go back to the queue until they exhaust `max_attempts`.
+
+    python -m scrapers.job_queue submit data/profile_urls.txt --priority 5 --deadline 2h
+    python -m scrapers.job_queue work
+    python -m scrapers.job_queue status [JOB_ID]
+"""
+
+import argparse
+import logging
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from .linkedin_scraper import LinkedInScraper
+from .retry import AttemptLog
+from .utils import RunSummary, load_config, load_environment, log_event, setup_logging
+from .writers import JsonlStreamWriter
+
+DEFAULT_DB = 'data/job_queue.db'
+ITEM_STATUSES = ('queued', 'leased', 'done', 'failed', 'expired', 'cancelled')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    submitted_at REAL NOT NULL,
+    priority INTEGER NOT NULL,
+    deadline REAL,
+    source TEXT,
+    total INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL REFERENCES jobs(id),
+    url TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    deadline REAL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    updated_at REAL NOT NULL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS items_ready ON items (status, priority DESC, deadline, id);
+CREATE INDEX IF NOT EXISTS items_job ON items (job_id, status);
+"""
+
+
+@dataclass(frozen=True)
+class QueueItem:
+    """One leased URL."""
+    id: int
+    job_id: str
+    url: str
+    attempts: int
+    max_attempts: int
+
+
+class JobQueue:
+    """SQLite-backed priority queue with lease/ack semantics, safe across processes."""
+
+    def __init__(self, path: str = DEFAULT_DB, max_attempts: int = 3):
+        self.path = path
+        self.max_attempts = max_attempts
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode; writes that must be atomic use BEGIN IMMEDIATE explicitly
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def _transaction(self):
+        return _Transaction(self.conn, self._lock)
+
+    def submit(self, urls: Iterable[str], priority: int = 0, deadline: Optional[float] = None,
+               max_attempts: Optional[int] = None, source: Optional[str] = None) -> str:
+        """Queue a batch of URLs; returns the job id. Higher priority is served first."""
+        urls = [url.strip() for url in urls if url and url.strip()]
+        job_id = uuid.uuid4().hex[:12]
+        now = time.time()
+        attempts = max_attempts or self.max_attempts
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, submitted_at, priority, deadline, source, total) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, now, priority, deadline, source, len(urls))
+            )
+            conn.executemany(
+                "INSERT INTO items (job_id, url, priority, deadline, max_attempts, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(job_id, url, priority, deadline, attempts, now) for url in urls]
+            )
+        return job_id
+
+    def lease(self, owner: str, limit: int, lease_seconds: float) -> List[QueueItem]:
+        """Claim up to `limit` of the most urgent ready items for `lease_seconds`."""
+        now = time.time()
+        with self._transaction() as conn:
+            self._reclaim(conn, now)
+            rows = conn.execute(
+                "SELECT id, job_id, url, attempts, max_attempts FROM items WHERE status = 'queued' "
+                "ORDER BY priority DESC, deadline IS NULL, deadline, id LIMIT ?",
+                (limit,)
+            ).fetchall()
+            if not rows:
+                return []
+            conn.executemany(
+                "UPDATE items SET status = 'leased', attempts = attempts + 1, lease_owner = ?, "
+                "lease_expires = ?, updated_at = ? WHERE id = ?",
+                [(owner, now + lease_seconds, now, row['id']) for row in rows]
+            )
+        return [QueueItem(row['id'], row['job_id'], row['url'], row['attempts'] + 1, row['max_attempts'])
+                for row in rows]
+
+    def _reclaim(self, conn, now: float):
+        """Return items with lapsed leases to the queue and expire items past their deadline."""
+        conn.execute(
+            "UPDATE items SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'queued' END, "
+            "error = 'lease expired', lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+            "WHERE status = 'leased' AND lease_expires < ?",
+            (now, now)
+        )
+        conn.execute(
+            "UPDATE items SET status = 'expired', updated_at = ? "
+            "WHERE status = 'queued' AND deadline IS NOT NULL AND deadline < ?",
+            (now, now)
+        )
+
+    def extend(self, items: Iterable[QueueItem], owner: str, lease_seconds: float):
+        """Push out the lease on items this worker still holds."""
+        now = time.time()
+        with self._transaction() as conn:
+            conn.executemany(
+                "UPDATE items SET lease_expires = ? WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                [(now + lease_seconds, item.id, owner) for item in items]
+            )
+
+    def ack(self, items: Iterable[QueueItem], owner: str):
+        """Mark items done."""
+        now = time.time()
+        with self._transaction() as conn:
+            conn.executemany(
+                "UPDATE items SET status = 'done', lease_owner = NULL, lease_expires = NULL, error = NULL, "
+                "updated_at = ? WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                [(now, item.id, owner) for item in items]
+            )
+
+    def nack(self, items: Iterable[QueueItem], owner: str, error: str = '', retry: bool = True):
+        """Release items; they are queued again unless out of attempts (or `retry` is False)."""
+        now = time.time()
+        with self._transaction() as conn:
+            conn.executemany(
+                "UPDATE items SET status = CASE WHEN ? AND attempts < max_attempts THEN 'queued' ELSE 'failed' END, "
+                "lease_owner = NULL, lease_expires = NULL, error = ?, updated_at = ? "
+                "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                [(retry, error, now, item.id, owner) for item in items]
+            )
+
+    def cancel(self, job_id: str) -> int:
+        """Cancel a job's items that have not been leased yet."""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE items SET status = 'cancelled', updated_at = ? WHERE job_id = ? AND status = 'queued'",
+                (time.time(), job_id)
+            )
+        return cursor.rowcount
+
+    def job_status(self, job_id: str) -> Optional[Dict]:
+        job = self.conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if job is None:
+            return None
+        counts = dict(self.conn.execute(
+            "SELECT status, COUNT(*) FROM items WHERE job_id = ? GROUP BY status", (job_id,)
+        ).fetchall())
+        status = dict(job)
+        status['items'] = {name: counts.get(name, 0) for name in ITEM_STATUSES}
+        status['finished'] = not (counts.get('queued') or counts.get('leased'))
+        return status
+
+    def jobs(self, limit: int = 20) -> List[Dict]:
+        rows = self.conn.execute("SELECT id FROM jobs ORDER BY submitted_at DESC LIMIT ?", (limit,)).fetchall()
+        return [self.job_status(row['id']) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        counts = dict(self.conn.execute("SELECT status, COUNT(*) FROM items GROUP BY status").fetchall())
+        return {name: counts.get(name, 0) for name in ITEM_STATUSES}
+
+    def close(self):
+        self.conn.close()
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT, so concurrent workers never lease the same item."""
+
+    def __init__(self, conn, lock):
+        self.conn = conn
+        self.lock = lock
+
+    def __enter__(self):
+        self.lock.acquire()
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.lock.release()
+
+
+def queue_from_config(config: Dict) -> JobQueue:
+    queue_config = config.get('job_queue', {})
+    return JobQueue(queue_config.get('path', DEFAULT_DB),
+                    max_attempts=queue_config.get('max_attempts', 3))
+
+
+class QueueWorker:
+    """
+    Drains a JobQueue through one long-lived LinkedInScraper.
+
+    The browser and login are set up once; each leased batch goes through
+    scrape_profiles(), so the configured rate limit and delays still apply,
+    and the leases are extended as profiles arrive.
+    """
+
+    def __init__(self, config: Dict, job_queue: JobQueue, scraper=None, batch_size: int = 10,
+                 lease_seconds: float = 600, poll_seconds: float = 5, output_dir: Optional[str] = 'data/output/queue'):
+        self.config = config
+        self.queue = job_queue
+        self.scraper = scraper
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.output_dir = output_dir
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.logger = logging.getLogger(__name__)
+        self._stop = threading.Event()
+        self._writer = None
+
+    @classmethod
+    def from_config(cls, config: Dict, job_queue: Optional[JobQueue] = None, scraper=None) -> 'QueueWorker':
+        queue_config = config.get('job_queue', {})
+        return cls(
+            config,
+            job_queue or queue_from_config(config),
+            scraper=scraper,
+            batch_size=queue_config.get('batch_size', 10),
+            lease_seconds=queue_config.get('lease_seconds', 600),
+            poll_seconds=queue_config.get('poll_seconds', 5),
+            output_dir=queue_config.get('output_dir', 'data/output/queue')
+        )
+
+    def stop(self):
+        """Stop after the current batch."""
+        self._stop.set()
+
+    def run(self, exit_when_idle: bool = False) -> int:
+        """Lease and scrape batches until stopped; returns the number of items processed."""
+        processed = 0
+        try:
+            while not self._stop.is_set():
+                items = self.queue.lease(self.owner, self.batch_size, self.lease_seconds)
+                if not items:
+                    if exit_when_idle:
+                        break
+                    self._stop.wait(self.poll_seconds)
+                    continue
+                processed += self.process(items)
+        finally:
+            self.close()
+        return processed
+
+    def process(self, items: List[QueueItem]) -> int:
+        """Scrape one leased batch; acks arrive per profile, the rest are retried or failed."""
+        if self.scraper is None:
+            self.scraper = LinkedInScraper(self.config)
+        # Attempts and the run summary cover this batch only: a long-running worker
+        # would otherwise grow them forever, and _release must not see older outcomes
+        self.scraper.attempt_log = AttemptLog()
+        self.scraper.run_summary = RunSummary()
+
+        pending: Dict[str, List[QueueItem]] = {}
+        for item in items:
+            # The same URL submitted by several jobs is scraped once
+            pending.setdefault(item.url, []).append(item)
+        log_event(self.logger, 'queue_batch', owner=self.owner, items=len(items), urls=len(pending))
+
+        def on_profile(profile):
+            writer = self._output_writer()
+            if writer is not None:
+                writer.write(profile)
+            done = pending.pop(profile.get('profile_url'), [])
+            self.queue.ack(done, self.owner)
+
+        def on_attempt(url):
+            # Failed and retried profiles take time too; keep the rest of the batch leased
+            self.queue.extend([item for group in pending.values() for item in group], self.owner, self.lease_seconds)
+
+        try:
+            self.scraper.scrape_profiles(list(pending), on_profile=on_profile, on_attempt=on_attempt)
+        except Exception as e:
+            self.logger.error(f"Queue batch failed: {str(e)}")
+            self.queue.nack([item for group in pending.values() for item in group], self.owner, error=str(e))
+            return len(items)
+        for url, group in pending.items():
+            self._release(url, group)
+        return len(items)
+
+    def _release(self, url: str, group: List[QueueItem]):
+        """Nack items without a profile; only outcomes the retry policy retries go back to the queue.
+
+        Decided from this batch's attempts, which process() scopes the attempt log to.
+        """
+        attempts = self.scraper.attempt_log.attempts(url)
+        if not attempts:
+            # Never started, e.g. the run stopped at its deadline
+            self.queue.nack(group, self.owner, error='not attempted')
+            return
+        last = attempts[-1]
+        retry = last.outcome in self.scraper.retry_policy.retry_on
+        error = f"{last.outcome}: {last.error}" if last.error else last.outcome
+        self.queue.nack(group, self.owner, error=error, retry=retry)
+        log_event(self.logger, 'queue_item_released', logging.INFO if retry else logging.WARNING,
+                  url=url, outcome=last.outcome, retry=retry, items=len(group))
+
+    def _output_writer(self):
+        if self._writer is None and self.output_dir:
+            output_config = self.config.get('output', {})
+            jsonl_config = output_config.get('jsonl', {})
+            stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            self._writer = JsonlStreamWriter(
+                f"{self.output_dir}/queue_{stamp}.jsonl",
+                compression=output_config.get('compression', 'none'),
+                batch_size=jsonl_config.get('batch_size', 20),
+                max_bytes=jsonl_config.get('max_bytes', 100 * 1024 * 1024)
+            )
+        return self._writer
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self.scraper is not None:
+            self.scraper.cleanup()
+            self.scraper = None
+
+
+def parse_deadline(value: Optional[str]) -> Optional[float]:
+    """'90m', '2h', '1d' from now, or an ISO timestamp."""
+    if not value:
+        return None
+    units = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+    if value[-1] in units and value[:-1].replace('.', '', 1).isdigit():
+        return time.time() + float(value[:-1]) * units[value[-1]]
+    return datetime.fromisoformat(value).timestamp()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Submit to and drain the persistent scrape queue.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    submit = subparsers.add_parser('submit', help='Queue the URLs in a file (one per line, - for stdin)')
+    submit.add_argument('urls_file')
+    submit.add_argument('--priority', type=int, default=0)
+    submit.add_argument('--deadline', help="e.g. 90m, 2h, 1d or an ISO timestamp")
+    submit.add_argument('--max-attempts', type=int)
+    work = subparsers.add_parser('work', help='Run a worker until interrupted')
+    work.add_argument('--exit-when-idle', action='store_true')
+    status = subparsers.add_parser('status', help='Show queue or job status')
+    status.add_argument('job_id', nargs='?')
+    parser.add_argument('--config', default='config.json')
+    args = parser.parse_args(argv)
+
+    config = load_config(args.config)
+    job_queue = queue_from_config(config)
+    try:
+        if args.command == 'submit':
+            lines = sys.stdin if args.urls_file == '-' else open(args.urls_file, 'r')
+            with lines:
+                urls = [line.strip() for line in lines if line.strip() and not line.startswith('#')]
+            job_id = job_queue.submit(urls, args.priority, parse_deadline(args.deadline),
+                                      args.max_attempts, source=args.urls_file)
+            print(f"📋 Queued {len(urls)} URLs as job {job_id}")
+            return 0
+
+        if args.command == 'status':
+            if args.job_id:
+                status = job_queue.job_status(args.job_id)
+                if status is None:
+                    print(f"❌ Unknown job {args.job_id}")
+                    return 1
+                jobs = [status]
+            else:
+                print('   '.join(f"{name}: {count}" for name, count in job_queue.counts().items()))
+                jobs = job_queue.jobs()
+            for job in jobs:
+                items = job['items']
+                print(f"{job['id']}  prio {job['priority']:>3}  {items['done']}/{job['total']} done  "
+                      f"{items['queued']} queued  {items['leased']} leased  {items['failed']} failed  "
+                      f"{items['expired']} expired")
+            return 0
+
+        load_environment()
+        logging_config = config.get('logging', {})
+        setup_logging(
+            log_file=logging_config.get('file', 'scraper.log'),
+            max_bytes=logging_config.get('max_bytes', 10 * 1024 * 1024),
+            backup_count=logging_config.get('backup_count', 5)
+        )
+        worker = QueueWorker.from_config(config, job_queue)
+        try:
+            processed = worker.run(exit_when_idle=args.exit_when_idle)
+        except KeyboardInterrupt:
+            print("\n⏹️ Stopped by user; unfinished items are retried once their lease expires")
+            return 130
+        print(f"✅ Processed {processed} queue items")
+        return 0
+    finally:
+        job_queue.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,16 @@
 import logging
+import re
 import time
-import csv
-import json
 import os
-from pathlib import Path
-from typing import List, Dict, Optional
+from collections import deque
+from typing import Callable, List, Dict, Optional, Tuple
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+from selenium.common.exceptions import WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
 try:
     import undetected_chromedriver as uc
@@ -23,19 +22,85 @@ except ImportError:
 from bs4 import BeautifulSoup
 import pandas as pd
 
-from .utils import RateLimiter, random_delay, get_headers, sanitize_filename, load_environment
+from .utils import (RateLimiter, RunSummary, random_delay, load_environment, time_budget, TimeBudgetExceeded,
+                    log_event)
+from .sections import SectionIndex, build_capture_script, assemble_sections_html
+from .records import ProfileRecord
+from .schema import PROFILE_SCHEMA
+from .writers import CsvStreamWriter
+from .extraction_cache import ExtractionCache, content_hash
+from .selector_spec import SelectorSpec
+from .retry import Attempt, AttemptLog, RetryPolicy, classify_exception
+from .entities import EntityResolver
+from .page_state import PageStateClassifier, ROUTE_FULL, ROUTE_LIMITED, ROUTE_SKIP
+from .watchdog import DriverWatchdog, REQUEUE_OUTCOMES, release_driver
+from .quality import FillRateMonitor, QualityAbort
+from .scheduler import ScrapeState
+from .dataset import scraped_at_now
+
+# Cap on the text the contact regexes scan, so digit-heavy pages can't stall a run
+CONTACT_TEXT_LIMIT = 20000
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+PHONE_PATTERN = re.compile(r'\+?\(?\d[\d \-()]{5,15}\d')
 
 class LinkedInScraper:
     """Main LinkedIn profile scraper using Selenium."""
     
+    # Extractors run in this order, each under its own time budget
+    EXTRACTORS = (
+        '_extract_basic_info',
+        '_extract_contact_info',
+        '_extract_experience_details',
+        '_extract_education_details',
+        '_extract_skills_details',
+        '_extract_certifications',
+        '_extract_languages',
+        '_extract_volunteer_experience',
+        '_extract_publications_projects',
+        '_extract_profile_metrics',
+    )
+    
     def __init__(self, config: Dict):
         self.config = config
         self.logger = logging.getLogger(__name__)
         self.driver = None
+        # Points at the local fixture server for offline runs
+        self.base_url = config.get('linkedin', {}).get('base_url', 'https://www.linkedin.com').rstrip('/')
         self.rate_limiter = RateLimiter(
             max_requests=config.get('rate_limiting', {}).get('requests_per_minute', 10),
             time_window=60
         )
+        # Selector chains, field mappings and section roots come from the compiled selectors.json
+        self.selectors = SelectorSpec.from_config(config)
+        # 'sections' ships only the profile section fragments over the wire, 'full' uses page_source
+        self.capture_mode = config.get('scraping', {}).get('capture_mode', 'sections')
+        self._build_page_scripts()
+        # Memo of extraction results by page content hash (None when disabled)
+        self.extraction_cache = ExtractionCache.from_config(config)
+        # Canonical company / school ids, learned across runs
+        self.entity_resolver = EntityResolver.from_config(config)
+        # Outcome counts and phase timings for the current run
+        self.run_summary = RunSummary()
+        self.logged_in = False
+        # scraping.max_retries / scraping.timeout: retries of transient outcomes and the page load timeout
+        self.retry_policy = RetryPolicy.from_config(config)
+        self.attempt_log = AttemptLog()
+        self.page_load_timeout = config.get('scraping', {}).get('timeout', 30)
+        # Chrome profile kept across driver restarts, so the session cookie survives them
+        self.profile_dir = config.get('browser', {}).get('profile_dir', './chrome_profile')
+        # Health / memory checks between profiles (None when disabled)
+        self.watchdog = DriverWatchdog.from_config(config)
+        # Windowed per-field fill rates against the history baseline (None when disabled)
+        self.quality = FillRateMonitor.from_config(config)
+        # Per-URL last scrape time and cost for the scheduler (None when disabled)
+        self.scrape_state = ScrapeState.from_config(config)
+        # Stand-in subtree for sections missing from the page
+        self._empty_soup = BeautifulSoup('', 'html.parser')
+        # Per-extractor and per-profile CPU/time budgets (seconds, 0 disables)
+        scraping_config = config.get('scraping', {})
+        self.extractor_budget = scraping_config.get('extractor_budget_seconds', 2.0)
+        self.profile_budget = scraping_config.get('profile_budget_seconds', 10.0)
         load_environment()
         
     def setup_driver(self):
@@ -75,7 +140,7 @@ class LinkedInScraper:
                     chrome_options.add_argument(f'--window-size={window_size[0]},{window_size[1]}')
                     
                     # User data directory for session persistence
-                    chrome_options.add_argument('--user-data-dir=./chrome_profile')
+                    chrome_options.add_argument(f'--user-data-dir={self.profile_dir}')
                     chrome_options.add_argument('--profile-directory=Default')
                     
                     # Proxy configuration
@@ -88,6 +153,7 @@ class LinkedInScraper:
                     
                     # Execute script to hide webdriver property
                     self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+                    self.driver.set_page_load_timeout(self.page_load_timeout)
                     
                     self.logger.info("Undetected Chrome driver initialized successfully")
                     return  # Success, exit here
@@ -125,12 +191,17 @@ class LinkedInScraper:
                 window_size = self.config.get('browser', {}).get('window_size', [1920, 1080])
                 chrome_options.add_argument(f'--window-size={window_size[0]},{window_size[1]}')
                 
+                # Same persisted profile as the undetected path
+                chrome_options.add_argument(f'--user-data-dir={self.profile_dir}')
+                chrome_options.add_argument('--profile-directory=Default')
+                
                 # Use ChromeDriverManager for automatic driver management
                 service = Service(ChromeDriverManager().install())
                 self.driver = webdriver.Chrome(service=service, options=chrome_options)
                 
                 # Execute script to hide webdriver property
                 self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+                self.driver.set_page_load_timeout(self.page_load_timeout)
                 
                 self.logger.info("Regular Chrome driver initialized successfully")
             
@@ -154,7 +225,12 @@ class LinkedInScraper:
         
         try:
             self.logger.info("Attempting to login to LinkedIn...")
-            self.driver.get("https://www.linkedin.com/login")
+            self.driver.get(f"{self.base_url}/login")
+            
+            # A session kept in the persisted profile redirects straight to the feed
+            if 'feed' in self.driver.current_url.lower():
+                self.logger.info("Already logged in from the persisted browser profile")
+                return True
             
             # Wait for login form
             WebDriverWait(self.driver, 10).until(
@@ -222,37 +298,99 @@ class LinkedInScraper:
             return False
     
     def scrape_profile(self, profile_url: str) -> Optional[Dict]:
-        """Scrape a single LinkedIn profile."""
+        """Scrape a single LinkedIn profile, retrying transient failures with backoff."""
+        started = time.monotonic()
+        result = result_outcome = None
+        attempt = 0
+        while True:
+            attempt += 1
+            attempt_started = time.time()
+            outcome, profile_data, error, load_seconds, parse_seconds = self._scrape_attempt(profile_url)
+            if profile_data is not None:
+                result, result_outcome = profile_data, outcome
+            
+            retry = self.retry_policy.should_retry(outcome, attempt)
+            backoff = self.retry_policy.backoff(attempt) if retry else None
+            self.attempt_log.record(profile_url, Attempt(
+                attempt, outcome, round(time.time() - attempt_started, 3), error,
+                backoff and round(backoff, 2), attempt_started
+            ))
+            if not retry:
+                break
+            
+            log_event(self.logger, 'profile_retry', logging.WARNING, url=profile_url, attempt=attempt,
+                      outcome=outcome, error=error, backoff=round(backoff, 2))
+            if outcome == 'driver_crash':
+                try:
+                    self._restart_driver('crashed')
+                except Exception as e:
+                    log_event(self.logger, 'driver_restart_failed', logging.ERROR, url=profile_url, error=str(e))
+                    break
+            # The next attempt still goes through the rate limiter after the backoff
+            time.sleep(backoff)
+        
+        # A failed retry doesn't throw away data an earlier attempt already got
+        if profile_data is None and result is not None:
+            outcome = result_outcome
+        if result is not None and self.entity_resolver is not None:
+            result.update(self.entity_resolver.resolve_profile(result))
+        if result is not None:
+            # UTC, set per scrape (not per cache entry), so the dataset can order snapshots
+            result['scraped_at'] = scraped_at_now()
+        duration = time.monotonic() - started
+        self.run_summary.record(profile_url, outcome, duration, attempts=attempt, load=load_seconds, parse=parse_seconds)
+        if self.scrape_state is not None:
+            # Browser time only; the scheduler adds delays and the rate limit itself
+            browser_seconds = (load_seconds or 0) + (parse_seconds or 0)
+            self.scrape_state.record(profile_url, outcome, browser_seconds or duration)
+        level = logging.INFO if outcome in ('success', 'partial') else logging.WARNING
+        log_event(self.logger, 'profile_done', level, url=profile_url, phase='done', outcome=outcome,
+                  attempts=attempt, duration=round(duration, 3),
+                  load_seconds=load_seconds and round(load_seconds, 3),
+                  parse_seconds=parse_seconds and round(parse_seconds, 3))
+        return result
+    
+    def _scrape_attempt(self, profile_url: str) -> Tuple[str, Optional[Dict], Optional[str], Optional[float], Optional[float]]:
+        """Load and extract a profile once: (outcome, profile data, error, load seconds, parse seconds)."""
+        load_seconds = parse_seconds = None
         try:
+            # Pick up selector fixes shipped while the worker is running
+            if self.selectors.reload_if_changed():
+                self._build_page_scripts()
+            
             self.rate_limiter.wait_if_needed()
             
-            self.logger.info(f"Scraping profile: {profile_url}")
+            log_event(self.logger, 'profile_start', url=profile_url, phase='load')
+            load_started = time.monotonic()
             self.driver.get(profile_url)
             
-            # Wait for page to load
-            random_delay(3, 7)
-            
-            # Check for various blocking scenarios
-            current_url = self.driver.current_url.lower()
-            page_source = self.driver.page_source.lower()
-            
-            if any(keyword in current_url for keyword in ["authwall", "login", "signup", "checkpoint"]):
-                self.logger.warning(f"Hit login wall for {profile_url}")
-                # Try to extract limited data anyway
+            # Route on cheap page signals before paying for the delays, scrolls and capture
+            verdict = self.page_classifier.classify(self.driver)
+            load_seconds = time.monotonic() - load_started
+            level = logging.INFO if verdict.route == ROUTE_FULL else logging.WARNING
+            log_event(self.logger, 'page_state', level, url=profile_url, phase='load', state=verdict.state,
+                      route=verdict.route, reason=verdict.reason)
+            
+            if verdict.route == ROUTE_SKIP:
+                # Removed profiles and bare authwalls won't improve on a retry
+                outcome = 'unavailable' if verdict.state == 'unavailable' else 'authwall'
+                return outcome, None, None, load_seconds, parse_seconds
+            if verdict.route == ROUTE_LIMITED:
                 profile_data = self._extract_limited_data_from_title()
-                if profile_data and profile_data.get('name'):
+                if profile_data.get('name'):
                     profile_data['profile_url'] = profile_url
                     profile_data['extraction_method'] = 'limited'
-                    return profile_data
-                return None
+                    return 'limited', profile_data, None, load_seconds, parse_seconds
+                return 'authwall', None, None, load_seconds, parse_seconds
             
-            # Check for access restrictions in page content
-            if any(keyword in page_source for keyword in ["sign in", "join linkedin", "this profile", "unavailable"]):
-                self.logger.warning(f"Profile may be restricted: {profile_url}")
-                # Still try to extract what we can
+            # Give lazy sections time to render before the full extraction
+            random_delay(3, 7)
+            load_seconds = time.monotonic() - load_started
             
             # Extract profile data
+            parse_started = time.monotonic()
             profile_data = self._extract_profile_data()
+            parse_seconds = time.monotonic() - parse_started
             profile_data['profile_url'] = profile_url
             
             # Check if we got meaningful data
@@ -260,20 +398,87 @@ class LinkedInScraper:
             has_data = any(profile_data.get(field) for field in meaningful_fields)
             
             if has_data:
-                self.logger.info(f"Successfully scraped profile: {profile_data.get('name', 'Unknown')}")
-                return profile_data
+                outcome = 'partial' if profile_data.get('extraction_status') == 'partial' else 'success'
+                return outcome, profile_data, None, load_seconds, parse_seconds
             else:
-                self.logger.warning(f"No meaningful data extracted for: {profile_url}")
                 # Return basic profile data anyway
                 profile_data['extraction_status'] = 'limited_data'
-                return profile_data
+                return 'no_data', profile_data, None, load_seconds, parse_seconds
             
-        except TimeoutException:
-            self.logger.error(f"Timeout while loading profile: {profile_url}")
         except Exception as e:
-            self.logger.error(f"Error scraping profile {profile_url}: {str(e)}")
-        
-        return None
+            outcome = classify_exception(e)
+            log_event(self.logger, 'profile_error', logging.ERROR, url=profile_url, outcome=outcome, error=str(e))
+            return outcome, None, str(e), load_seconds, parse_seconds
+    
+    def _build_page_scripts(self):
+        """(Re)build the in-page scripts that depend on the selector spec."""
+        self._capture_script = build_capture_script(self.selectors.sections)
+        self.page_classifier = PageStateClassifier(
+            self.selectors.sections['top_card'],
+            settle_seconds=self.config.get('scraping', {}).get('page_state_settle_seconds', 1.0)
+        )
+    
+    def _restart_driver(self, reason: str = 'crashed'):
+        """Replace a crashed, hung or bloated browser session with a fresh one and log in again."""
+        if self.driver:
+            release_driver(self.driver, self.profile_dir)
+        self.driver = None
+        self.logged_in = False
+        self.setup_driver()
+        if self.watchdog is not None:
+            self.watchdog.restarted(reason)
+        if self.config.get('linkedin', {}).get('auto_login', False):
+            self.logged_in = self.login_to_linkedin()
+    
+    def _check_driver(self):
+        """Restart the browser before the next profile if the watchdog finds it unfit."""
+        if self.watchdog is None:
+            return
+        health = self.watchdog.check(self.driver)
+        if health.healthy:
+            return
+        log_event(self.logger, 'driver_recycle', logging.WARNING, reason=health.reason, rss_mb=health.rss_mb,
+                  navigations=self.watchdog.navigations)
+        self._restart_driver(health.reason)
+    
+    def _abandon(self, urls: List[str], error: str):
+        """Record `urls` as driver_crash without attempting them, so callers can requeue them."""
+        log_event(self.logger, 'driver_restart_failed', logging.ERROR, error=error, remaining=len(urls))
+        for url in urls:
+            self.attempt_log.record(url, Attempt(len(self.attempt_log.attempts(url)) + 1, 'driver_crash', 0.0,
+                                                 error, started_at=time.time()))
+            self.run_summary.record(url, 'driver_crash', 0.0)
+    
+    def _check_quality(self, profile: Dict):
+        """Feed a profile to the quality monitor and act on key fields that stopped filling."""
+        if self.quality is None or profile.get('extraction_method') == 'limited':
+            return
+        drops = self.quality.observe(profile)
+        for drop in drops:
+            log_event(self.logger, 'quality_alert', logging.ERROR if drop.key else logging.WARNING,
+                      field=drop.field, fill_rate=drop.fill_rate, baseline=drop.baseline,
+                      threshold=drop.threshold, key_field=drop.key)
+        broken = [drop.field for drop in drops if drop.key]
+        if not broken or self.quality.action == 'alert':
+            return
+        if self.quality.action == 'pause' and self._wait_for_selector_fix(broken):
+            return
+        raise QualityAbort(f"Fill rate of {', '.join(broken)} fell below threshold "
+                           f"over the last {self.quality.window_size} profiles")
+    
+    def _wait_for_selector_fix(self, fields: List[str]) -> bool:
+        """Hold the run until selectors.json changes; False if `pause_seconds` pass first."""
+        log_event(self.logger, 'quality_pause', logging.WARNING, fields=fields,
+                  max_seconds=self.quality.pause_seconds)
+        deadline = time.monotonic() + self.quality.pause_seconds
+        while time.monotonic() < deadline:
+            time.sleep(min(10.0, max(0.0, deadline - time.monotonic())))
+            if self.selectors.reload_if_changed():
+                self._build_page_scripts()
+                self.quality.reset_window()
+                log_event(self.logger, 'quality_resume', fields=fields)
+                return True
+        return False
     
     def _extract_profile_data(self) -> Dict:
         """Extract comprehensive profile data from the current page."""
@@ -289,219 +494,157 @@ class LinkedInScraper:
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
             time.sleep(2)
             
-            # Get page source and parse with BeautifulSoup
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-            
-            # Check if we're on an actual profile page
-            page_source = self.driver.page_source.lower()
-            if 'sign in' in page_source or 'join now' in page_source:
-                self.logger.warning("Page requires authentication")
-                return self._extract_limited_data_from_title()
-            
-            # === Basic Profile Information ===
-            data.update(self._extract_basic_info(soup))
-            
-            # === Contact Information ===
-            data.update(self._extract_contact_info(soup))
-            
-            # === Experience Details ===
-            data.update(self._extract_experience_details(soup))
-            
-            # === Education Details ===
-            data.update(self._extract_education_details(soup))
-            
-            # === Skills and Endorsements ===
-            data.update(self._extract_skills_details(soup))
-            
-            # === Certifications and Licenses ===
-            data.update(self._extract_certifications(soup))
-            
-            # === Languages ===
-            data.update(self._extract_languages(soup))
-            
-            # === Volunteer Experience ===
-            data.update(self._extract_volunteer_experience(soup))
-            
-            # === Publications and Projects ===
-            data.update(self._extract_publications_projects(soup))
-            
-            # === Additional Profile Metrics ===
-            data.update(self._extract_profile_metrics(soup))
+            # Capture the page once; identical content skips parsing entirely
+            html = self._capture_page_html()
+            cache_key = None
+            if self.extraction_cache is not None:
+                # Keyed by spec too, so a selector fix re-extracts previously seen pages
+                cache_key = f"{self.selectors.compiled.spec_hash[:12]}:{content_hash(html)}"
+                cached = self.extraction_cache.get(cache_key)
+                if cached is not None:
+                    self.logger.debug(f"Extraction cache hit for content {cache_key}")
+                    return cached
+            
+            profile_deadline = time.monotonic() + self.profile_budget if self.profile_budget else None
+            try:
+                with time_budget(self.profile_budget):
+                    soup = BeautifulSoup(html, 'html.parser')
+                    sections = self.selectors.compiled.section_matcher.index(soup)
+                # Off the main thread nothing interrupts the parse, so check the deadline after it
+                if profile_deadline is not None and time.monotonic() > profile_deadline:
+                    raise TimeBudgetExceeded(f"Exceeded time budget of {self.profile_budget:.2f}s")
+            except TimeBudgetExceeded:
+                self.logger.warning(f"Parsing {len(html)} bytes of HTML exceeded the profile budget")
+                data = self._extract_limited_data_from_title()
+                data['extraction_status'] = 'partial'
+                data['partial_extractors'] = 'parse'
+                return data
+            
+            # Each extractor is isolated: over-budget or failing ones are skipped and recorded
+            partial = []
+            for extractor in self.EXTRACTORS:
+                budget = self.extractor_budget
+                if profile_deadline is not None:
+                    remaining = profile_deadline - time.monotonic()
+                    if remaining <= 0:
+                        partial.append(extractor)
+                        continue
+                    budget = min(budget, remaining) if budget else remaining
+                
+                started = time.monotonic()
+                try:
+                    with time_budget(budget):
+                        extracted = getattr(self, extractor)(soup, sections)
+                    # Budgets can't interrupt outside the main thread; an over-budget result is
+                    # dropped the same way, so output doesn't depend on which thread ran it
+                    if budget and time.monotonic() - started > budget:
+                        raise TimeBudgetExceeded(f"Exceeded time budget of {budget:.2f}s")
+                    data.update(extracted)
+                except TimeBudgetExceeded:
+                    self.logger.warning(f"{extractor} abandoned after {time.monotonic() - started:.2f}s "
+                                        f"(budget {budget:.2f}s)")
+                    partial.append(extractor)
+                except Exception as e:
+                    self.logger.error(f"{extractor} failed: {str(e)}")
+                    partial.append(extractor)
+            
+            if partial:
+                data['extraction_status'] = 'partial'
+                data['partial_extractors'] = ' | '.join(name.replace('_extract_', '') for name in partial)
             
             # Try alternative extraction if main fields are empty
             if not any([data.get('name'), data.get('headline')]):
                 self.logger.info("Trying alternative extraction methods...")
-                alt_data = self._extract_from_page_title_and_meta()
+                alt_data = self._extract_from_page_title_and_meta(soup)
                 data.update(alt_data)
             
+            # Partial results may be transient, so only complete extractions are memoized
+            if cache_key is not None and not partial:
+                self.extraction_cache.put(cache_key, data)
+            
         except Exception as e:
             self.logger.error(f"Error extracting profile data: {str(e)}")
         
         return data
     
-    def _extract_basic_info(self, soup) -> Dict:
+    def _capture_page_html(self) -> str:
+        """Return the HTML to parse, limited to the profile sections in 'sections' mode."""
+        if self.capture_mode == 'sections':
+            try:
+                capture = self.driver.execute_script(self._capture_script)
+                if capture and capture.get('sections'):
+                    return assemble_sections_html(capture)
+                self.logger.debug("Section capture found no profile sections, using full page source")
+            except WebDriverException as e:
+                self.logger.debug(f"Section capture failed, using full page source: {str(e)}")
+        return self.driver.page_source
+    
+    @PROFILE_SCHEMA.produces('basic_info')
+    def _extract_basic_info(self, soup, sections: SectionIndex) -> Dict:
         """Extract basic profile information."""
         data = {}
+        top_card = sections.scope('top_card', default=soup)
+        about = sections.scope('about', default=self._empty_soup)
         
-        # Name
-        name_selectors = [
-            'h1.text-heading-xlarge.inline.t-24.v-align-middle.break-words',
-            'h1[class*="text-heading-xlarge"]',
-            'h1.break-words',
-            '.pv-text-details__left-panel h1',
-            '.ph5 h1',
-            'h1'
-        ]
-        data['name'] = self._find_text_by_selectors(soup, name_selectors)
-        
-        # Headline
-        headline_selectors = [
-            '.text-body-medium.break-words',
-            'div[class*="text-body-medium"][class*="break-words"]',
-            '.pv-text-details__left-panel .text-body-medium',
-            '.ph5 .text-body-medium',
-            '[data-generated-suggestion-target]'
-        ]
-        data['headline'] = self._find_text_by_selectors(soup, headline_selectors)
-        
-        # Location
-        location_selectors = [
-            '.text-body-small.inline.t-black--light.break-words',
-            'span[class*="text-body-small"][class*="t-black--light"]',
-            '.pv-text-details__left-panel .text-body-small',
-            '.ph5 .text-body-small',
-            '.pv-top-card-profile-picture + div span.text-body-small'
-        ]
-        data['location'] = self._find_text_by_selectors(soup, location_selectors)
-        
-        # About section
-        about_selectors = [
-            '.pv-shared-text-with-see-more .full-width',
-            '.pv-about__summary-text .full-width',
-            '#about .full-width',
-            '[class*="pv-about"] [class*="full-width"]',
-            '.core-section-container__content .pv-shared-text-with-see-more',
-            '.about-section .pv-shared-text-with-see-more'
-        ]
-        data['about'] = self._find_text_by_selectors(soup, about_selectors)
+        data['name'] = self._find_text_by_selectors(top_card, self.selectors.chain('name'))
+        data['headline'] = self._find_text_by_selectors(top_card, self.selectors.chain('headline'))
+        data['location'] = self._find_text_by_selectors(top_card, self.selectors.chain('location'))
+        data['about'] = self._find_text_by_selectors(about, self.selectors.chain('about'))
         
         # Connections count
-        connections_selectors = [
-            '.t-black--light .t-normal',
-            '.pv-top-card--list-bullet li span',
-            '.pv-top-card-v2-ctas .t-black--light',
-            '.pv-top-card-profile-picture + div span.t-black--light',
-            '[class*="t-black--light"] span'
-        ]
-        connections_text = self._find_text_by_selectors(soup, connections_selectors)
+        connections_text = self._find_text_by_selectors(top_card, self.selectors.chain('connections'))
         data['connections'] = self._extract_connections_count(connections_text)
         
         # Profile picture URL
-        img_selectors = [
-            '.pv-top-card-profile-picture img',
-            '.profile-photo-edit img',
-            '.pv-top-card__photo img'
-        ]
-        for selector in img_selectors:
-            img = soup.select_one(selector)
+        data['profile_picture_url'] = ''
+        for pattern in self.selectors.chain('profile_picture'):
+            img = pattern.select_one(top_card)
             if img and img.get('src'):
                 data['profile_picture_url'] = img.get('src')
                 break
-        else:
-            data['profile_picture_url'] = ''
         
         return data
     
-    def _extract_contact_info(self, soup) -> Dict:
+    @PROFILE_SCHEMA.produces('contact_info')
+    def _extract_contact_info(self, soup, sections: SectionIndex) -> Dict:
         """Extract contact information."""
         data = {}
         
-        # Try to find contact info in various places
-        contact_selectors = [
-            '.pv-contact-info__contact-type',
-            '.ci-vanity-url',
-            '.ci-email',
-            '.ci-phone',
-            '.ci-websites'
-        ]
+        # Only scan the contact and top card sections, capped, instead of the whole page text
+        contact_nodes = [node for node in (sections.root('contact'), sections.root('top_card')) if node is not None]
+        contact_text = ' '.join(node.get_text(' ') for node in contact_nodes)[:CONTACT_TEXT_LIMIT]
         
         # Email (sometimes visible)
-        email_text = soup.get_text()
-        import re
-        email_match = re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', email_text)
+        email_match = EMAIL_PATTERN.search(contact_text)
         data['email'] = email_match.group() if email_match else ''
         
         # Phone (sometimes visible)
-        phone_match = re.search(r'[\+]?[1-9]?[\d\s\-\(\)]{7,15}', email_text)
+        phone_match = PHONE_PATTERN.search(contact_text)
         data['phone'] = phone_match.group().strip() if phone_match else ''
         
         # Website/Portfolio
-        website_selectors = [
-            '.pv-contact-info__contact-type a[href*="http"]',
-            '.ci-websites a'
-        ]
         data['website'] = ''
-        for selector in website_selectors:
-            link = soup.select_one(selector)
+        contact = sections.scope('contact', default=self._empty_soup)
+        for pattern in self.selectors.chain('website'):
+            link = pattern.select_one(contact)
             if link and link.get('href'):
                 data['website'] = link.get('href')
                 break
         
         return data
     
-    def _extract_experience_details(self, soup) -> Dict:
+    @PROFILE_SCHEMA.produces('experience')
+    def _extract_experience_details(self, soup, sections: SectionIndex) -> Dict:
         """Extract detailed experience information."""
         data = {}
+        experience = sections.scope('experience', default=self._empty_soup)
         
-        # Current position
-        current_job_selectors = [
-            '.experience-section .pv-entity__summary-info h3',
-            '.pvs-list__paged-list-item .mr1.t-bold span[aria-hidden="true"]',
-            '[data-field="experience"] .pvs-entity__summary-title a span[aria-hidden="true"]'
-        ]
-        data['current_position'] = self._find_text_by_selectors(soup, current_job_selectors)
-        
-        # Current company
-        company_selectors = [
-            '.experience-section .pv-entity__secondary-title',
-            '.pvs-list__paged-list-item .t-14 span[aria-hidden="true"]',
-            '[data-field="experience"] .t-14.t-normal span[aria-hidden="true"]'
-        ]
-        data['current_company'] = self._find_text_by_selectors(soup, company_selectors)
-        
-        # Employment duration
-        duration_selectors = [
-            '.experience-section .pv-entity__bullet-item-v2',
-            '.pvs-list__paged-list-item .t-black--light span[aria-hidden="true"]',
-            '[data-field="experience"] .pvs-entity__caption-wrapper'
-        ]
-        data['employment_duration'] = self._find_text_by_selectors(soup, duration_selectors)
+        data['current_position'] = self._find_text_by_selectors(experience, self.selectors.chain('current_position'))
+        data['current_company'] = self._find_text_by_selectors(experience, self.selectors.chain('current_company'))
+        data['employment_duration'] = self._find_text_by_selectors(experience, self.selectors.chain('employment_duration'))
         
         # All experience entries (up to 5)
-        experience_entries = []
-        exp_items = soup.select('.pvs-list__paged-list-item, .pv-entity__position-group-pager li')
-        
-        for i, item in enumerate(exp_items[:5]):
-            entry = {}
-            
-            # Job title
-            title_elem = item.select_one('.mr1.t-bold span[aria-hidden="true"], h3')
-            entry['job_title'] = title_elem.get_text(strip=True) if title_elem else ''
-            
-            # Company
-            company_elem = item.select_one('.t-14.t-normal span[aria-hidden="true"], .pv-entity__secondary-title')
-            entry['company'] = company_elem.get_text(strip=True) if company_elem else ''
-            
-            # Duration
-            duration_elem = item.select_one('.t-black--light span[aria-hidden="true"], .pv-entity__bullet-item')
-            entry['duration'] = duration_elem.get_text(strip=True) if duration_elem else ''
-            
-            # Location
-            location_elem = item.select_one('.t-black--light.t-normal span[aria-hidden="true"]')
-            entry['job_location'] = location_elem.get_text(strip=True) if location_elem else ''
-            
-            if entry['job_title']:
-                experience_entries.append(entry)
+        experience_entries = self._extract_list_entries(experience, 'experience', 5, required='job_title')
         
         # Convert experience to structured format
         for i, entry in enumerate(experience_entries):
@@ -514,35 +657,14 @@ class LinkedInScraper:
         
         return data
     
-    def _extract_education_details(self, soup) -> Dict:
+    @PROFILE_SCHEMA.produces('education')
+    def _extract_education_details(self, soup, sections: SectionIndex) -> Dict:
         """Extract detailed education information."""
         data = {}
         
         # Education entries (up to 3)
-        education_entries = []
-        edu_items = soup.select('[data-field="education"] .pvs-list__paged-list-item, .education-section .pv-entity__summary-info')
-        
-        for i, item in enumerate(edu_items[:3]):
-            entry = {}
-            
-            # School name
-            school_elem = item.select_one('.mr1.t-bold span[aria-hidden="true"], h3')
-            entry['school'] = school_elem.get_text(strip=True) if school_elem else ''
-            
-            # Degree
-            degree_elem = item.select_one('.t-14.t-normal span[aria-hidden="true"], .pv-entity__degree-name')
-            entry['degree'] = degree_elem.get_text(strip=True) if degree_elem else ''
-            
-            # Field of study
-            field_elem = item.select_one('.t-14 span[aria-hidden="true"]:nth-child(2)')
-            entry['field'] = field_elem.get_text(strip=True) if field_elem else ''
-            
-            # Years
-            years_elem = item.select_one('.t-black--light span[aria-hidden="true"], .pv-entity__dates')
-            entry['years'] = years_elem.get_text(strip=True) if years_elem else ''
-            
-            if entry['school']:
-                education_entries.append(entry)
+        education = sections.scope('education', default=self._empty_soup)
+        education_entries = self._extract_list_entries(education, 'education', 3, required='school')
         
         # Convert education to structured format
         for i, entry in enumerate(education_entries):
@@ -555,21 +677,15 @@ class LinkedInScraper:
         
         return data
     
-    def _extract_skills_details(self, soup) -> Dict:
+    @PROFILE_SCHEMA.produces('skills')
+    def _extract_skills_details(self, soup, sections: SectionIndex) -> Dict:
         """Extract skills and endorsements."""
         data = {}
         
         skills = []
-        skill_selectors = [
-            '.pv-skill-category-entity__name span[aria-hidden="true"]',
-            '.skill-name',
-            '.pvs-skill .mr1 span[aria-hidden="true"]',
-            '[data-field="skill"] .mr1 span[aria-hidden="true"]'
-        ]
-        
-        for selector in skill_selectors:
-            skill_elements = soup.select(selector)
-            for skill in skill_elements[:10]:  # Get up to 10 skills
+        skills_section = sections.scope('skills', default=self._empty_soup)
+        for pattern in self.selectors.chain('skills'):
+            for skill in pattern.select(skills_section, limit=10):  # Get up to 10 skills
                 skill_text = skill.get_text(strip=True)
                 if skill_text and skill_text not in skills and len(skill_text) > 2:
                     skills.append(skill_text)
@@ -585,20 +701,15 @@ class LinkedInScraper:
         
         return data
     
-    def _extract_certifications(self, soup) -> Dict:
+    @PROFILE_SCHEMA.produces('certifications')
+    def _extract_certifications(self, soup, sections: SectionIndex) -> Dict:
         """Extract certifications and licenses."""
         data = {}
         
         certifications = []
-        cert_selectors = [
-            '[data-field="certification"] .mr1 span[aria-hidden="true"]',
-            '.pv-accomplishments-block .pv-accomplishment-entity h4',
-            '.certifications .pv-entity__summary-title'
-        ]
-        
-        for selector in cert_selectors:
-            cert_elements = soup.select(selector)
-            for cert in cert_elements[:5]:  # Get up to 5 certifications
+        cert_section = sections.scope('certifications', 'accomplishments', default=self._empty_soup)
+        for pattern in self.selectors.chain('certifications'):
+            for cert in pattern.select(cert_section, limit=5):  # Get up to 5 certifications
                 cert_text = cert.get_text(strip=True)
                 if cert_text and cert_text not in certifications and len(cert_text) > 3:
                     certifications.append(cert_text)
@@ -610,19 +721,15 @@ class LinkedInScraper:
         
         return data
     
-    def _extract_languages(self, soup) -> Dict:
+    @PROFILE_SCHEMA.produces('languages')
+    def _extract_languages(self, soup, sections: SectionIndex) -> Dict:
         """Extract languages."""
         data = {}
         
         languages = []
-        lang_selectors = [
-            '[data-field="language"] .mr1 span[aria-hidden="true"]',
-            '.languages .pv-accomplishment-entity h4'
-        ]
-        
-        for selector in lang_selectors:
-            lang_elements = soup.select(selector)
-            for lang in lang_elements[:5]:
+        lang_section = sections.scope('languages', 'accomplishments', default=self._empty_soup)
+        for pattern in self.selectors.chain('languages'):
+            for lang in pattern.select(lang_section, limit=5):
                 lang_text = lang.get_text(strip=True)
                 if lang_text and lang_text not in languages:
                     languages.append(lang_text)
@@ -632,43 +739,30 @@ class LinkedInScraper:
         
         return data
     
-    def _extract_volunteer_experience(self, soup) -> Dict:
+    @PROFILE_SCHEMA.produces('volunteer')
+    def _extract_volunteer_experience(self, soup, sections: SectionIndex) -> Dict:
         """Extract volunteer experience."""
         data = {}
         
-        volunteer_items = soup.select('[data-field="volunteer"] .pvs-list__paged-list-item')
-        volunteer_entries = []
-        
-        for item in volunteer_items[:3]:  # Up to 3 volunteer experiences
-            vol_title = item.select_one('.mr1.t-bold span[aria-hidden="true"]')
-            vol_org = item.select_one('.t-14.t-normal span[aria-hidden="true"]')
-            
-            if vol_title:
-                entry = {
-                    'title': vol_title.get_text(strip=True),
-                    'organization': vol_org.get_text(strip=True) if vol_org else ''
-                }
-                volunteer_entries.append(entry)
+        # Up to 3 volunteer experiences
+        volunteer = sections.scope('volunteering', default=self._empty_soup)
+        volunteer_entries = self._extract_list_entries(volunteer, 'volunteer', 3, required='title')
         
         data['volunteer_experience'] = ' | '.join([f"{v['title']} at {v['organization']}" for v in volunteer_entries]) if volunteer_entries else ''
         data['volunteer_count'] = len(volunteer_entries)
         
         return data
     
-    def _extract_publications_projects(self, soup) -> Dict:
+    @PROFILE_SCHEMA.produces('publications_projects')
+    def _extract_publications_projects(self, soup, sections: SectionIndex) -> Dict:
         """Extract publications and projects."""
         data = {}
         
         # Publications
         publications = []
-        pub_selectors = [
-            '[data-field="publication"] .mr1 span[aria-hidden="true"]',
-            '.publications .pv-accomplishment-entity h4'
-        ]
-        
-        for selector in pub_selectors:
-            pub_elements = soup.select(selector)
-            for pub in pub_elements[:3]:
+        pub_section = sections.scope('publications', 'accomplishments', default=self._empty_soup)
+        for pattern in self.selectors.chain('publications'):
+            for pub in pattern.select(pub_section, limit=3):
                 pub_text = pub.get_text(strip=True)
                 if pub_text and len(pub_text) > 5:
                     publications.append(pub_text)
@@ -678,14 +772,9 @@ class LinkedInScraper:
         
         # Projects
         projects = []
-        proj_selectors = [
-            '[data-field="project"] .mr1 span[aria-hidden="true"]',
-            '.projects .pv-accomplishment-entity h4'
-        ]
-        
-        for selector in proj_selectors:
-            proj_elements = soup.select(selector)
-            for proj in proj_elements[:3]:
+        proj_section = sections.scope('projects', 'accomplishments', default=self._empty_soup)
+        for pattern in self.selectors.chain('projects'):
+            for proj in pattern.select(proj_section, limit=3):
                 proj_text = proj.get_text(strip=True)
                 if proj_text and len(proj_text) > 5:
                     projects.append(proj_text)
@@ -695,37 +784,43 @@ class LinkedInScraper:
         
         return data
     
-    def _extract_profile_metrics(self, soup) -> Dict:
+    @PROFILE_SCHEMA.produces('profile_metrics')
+    def _extract_profile_metrics(self, soup, sections: SectionIndex) -> Dict:
         """Extract additional profile metrics."""
         data = {}
+        activity = sections.scope('activity', 'top_card', default=soup)
+        
+        # Follower and activity/posts counts (if visible)
+        data['followers'] = self._find_text_by_selectors(activity, self.selectors.chain('followers'))
+        data['activity_posts'] = self._find_text_by_selectors(activity, self.selectors.chain('activity_posts'))
         
-        # Follower count (if visible)
-        follower_selectors = [
-            '.pv-recent-activity-section__follower-count',
-            '.follower-count',
-            '[data-field="follower"]'
-        ]
-        data['followers'] = self._find_text_by_selectors(soup, follower_selectors)
-        
-        # Activity/Posts count
-        activity_selectors = [
-            '.pv-recent-activity-section__posts-count',
-            '.activity-count'
-        ]
-        data['activity_posts'] = self._find_text_by_selectors(soup, activity_selectors)
-        
-        # Profile completeness indicators
-        page_text = soup.get_text().lower()
+        # Profile completeness indicators, from the sections that actually exist
+        top_card = sections.scope('top_card', default=self._empty_soup)
         data['profile_completeness_indicators'] = {
-            'has_about': 'about' in page_text and len(data.get('about', '')) > 50,
-            'has_experience': 'experience' in page_text,
-            'has_education': 'education' in page_text,
-            'has_skills': 'skills' in page_text,
-            'has_profile_picture': bool(data.get('profile_picture_url'))
+            'has_about': sections.has('about'),
+            'has_experience': sections.has('experience'),
+            'has_education': sections.has('education'),
+            'has_skills': sections.has('skills'),
+            'has_profile_picture': any(pattern.select_one(top_card) is not None
+                                       for pattern in self.selectors.chain('profile_picture'))
         }
         
         return data
     
+    def _extract_list_entries(self, root, list_name: str, limit: int, required: str) -> List[Dict]:
+        """Extract repeated entries using the spec's item selector and field mapping."""
+        items_pattern, field_patterns = self.selectors.item_list(list_name)
+        entries = []
+        for item in items_pattern.select(root, limit=limit):
+            entry = {}
+            for field, pattern in field_patterns.items():
+                element = pattern.select_one(item)
+                entry[field] = element.get_text(strip=True) if element else ''
+            if entry.get(required):
+                entries.append(entry)
+        return entries
+    
+    @PROFILE_SCHEMA.produces('basic_info')
     def _extract_limited_data_from_title(self) -> Dict:
         """Extract limited data from page title when full page isn't accessible."""
         data = {}
@@ -743,11 +838,13 @@ class LinkedInScraper:
             self.logger.debug(f"Error extracting from title: {str(e)}")
         return data
     
-    def _extract_from_page_title_and_meta(self) -> Dict:
+    @PROFILE_SCHEMA.produces('basic_info')
+    def _extract_from_page_title_and_meta(self, soup=None) -> Dict:
         """Extract data from page title and meta tags."""
         data = {}
         try:
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            if soup is None:
+                soup = BeautifulSoup(self._capture_page_html(), 'html.parser')
             
             # Try meta tags
             og_title = soup.find('meta', property='og:title')
@@ -769,11 +866,14 @@ class LinkedInScraper:
         
         return data
     
-    def _find_text_by_selectors(self, soup, selectors: List[str]) -> str:
-        """Try multiple CSS selectors to find text content."""
+    def _find_text_by_selectors(self, soup, selectors) -> str:
+        """Try a chain of CSS selectors (strings or compiled patterns) to find text content."""
         for selector in selectors:
             try:
-                element = soup.select_one(selector)
+                if isinstance(selector, str):
+                    element = soup.select_one(selector)
+                else:
+                    element = selector.select_one(soup)
                 if element and element.get_text(strip=True):
                     return element.get_text(strip=True)
             except Exception:
@@ -793,123 +893,125 @@ class LinkedInScraper:
         
         return text
     
-    def scrape_profiles(self, urls: List[str]) -> List[Dict]:
-        """Scrape multiple LinkedIn profiles."""
+    def scrape_profiles(self, urls: List[str], on_profile: Optional[Callable[[Dict], None]] = None,
+                        deadline: Optional[float] = None,
+                        on_attempt: Optional[Callable[[str], None]] = None) -> List[ProfileRecord]:
+        """Scrape multiple LinkedIn profiles, kept as compact read-only records.
+        
+        `on_profile` is called with each profile dict as soon as it is scraped,
+        so streaming writers can append rows while the run is still going.
+        `on_attempt` is called with the URL after every profile, scraped or not.
+        No new profile is started once the time.monotonic() `deadline` has passed.
+        """
         if not self.driver:
             self.setup_driver()
         
-        # Attempt login if configured
-        if self.config.get('linkedin', {}).get('auto_login', False):
-            self.login_to_linkedin()
+        # Attempt login if configured; a long-lived scraper keeps its session across batches
+        if self.config.get('linkedin', {}).get('auto_login', False) and not self.logged_in:
+            self.logged_in = self.login_to_linkedin()
         
         profiles = []
-        total_urls = len(urls)
-        
-        for i, url in enumerate(urls, 1):
-            self.logger.info(f"Processing {i}/{total_urls}: {url}")
-            
-            profile_data = self.scrape_profile(url)
-            if profile_data:
-                profiles.append(profile_data)
-            
-            # Add delay between profiles
-            delay = self.config.get('scraping', {}).get('delay_between_requests', 3)
-            random_delay(delay, delay * 2)
+        pending = deque(urls)
+        requeued = set()
+        position = 0
         
+        try:
+            while pending:
+                if deadline is not None and time.monotonic() >= deadline:
+                    log_event(self.logger, 'deadline_reached', logging.WARNING, remaining=len(pending))
+                    break
+                url = pending.popleft()
+                position += 1
+                try:
+                    self._check_driver()
+                except Exception as e:
+                    # No browser to go on with: the rest of the batch is lost to the driver, not the profiles
+                    self._abandon([url] + list(pending), f"driver restart failed: {e}")
+                    break
+                log_event(self.logger, 'profile_queued', url=url, position=position,
+                          total=len(urls) + len(requeued))
+                
+                profile_data = self.scrape_profile(url)
+                if self.watchdog is not None:
+                    self.watchdog.navigated()
+                if profile_data:
+                    if on_profile:
+                        on_profile(profile_data)
+                    profiles.append(ProfileRecord.from_dict(profile_data))
+                    self._check_quality(profile_data)
+                elif self.watchdog is not None and url not in requeued:
+                    # Lost to the browser rather than the profile: one more try after the restart
+                    attempts = self.attempt_log.attempts(url)
+                    if attempts and attempts[-1].outcome in REQUEUE_OUTCOMES:
+                        requeued.add(url)
+                        pending.append(url)
+                        log_event(self.logger, 'profile_requeued', logging.WARNING, url=url,
+                                  outcome=attempts[-1].outcome)
+                if on_attempt:
+                    on_attempt(url)
+                
+                # Add delay between profiles
+                delay = self.config.get('scraping', {}).get('delay_between_requests', 3)
+                random_delay(delay, delay * 2)
+        finally:
+            if self.quality is not None:
+                self.run_summary.fill_rates = self.quality.run_fill_rates()
+        
+        if self.watchdog is not None:
+            log_event(self.logger, 'driver_watchdog', **self.watchdog.as_dict())
+        self.run_summary.emit(self.logger)
         return profiles
     
     def save_to_csv(self, profiles: List[Dict], filename: str):
-        """Save scraped profiles to CSV file with structured columns."""
+        """Save scraped profiles (dicts or ProfileRecords) to CSV in one pass using the output schema."""
         if not profiles:
             self.logger.warning("No profiles to save")
             return
         
-        # Ensure output directory exists
-        Path(filename).parent.mkdir(parents=True, exist_ok=True)
-        
-        # Define preferred column order for better CSV structure
-        preferred_columns = [
-            'name', 'headline', 'location', 'about', 'connections', 
-            'profile_picture_url', 'email', 'phone', 'website',
-            'current_position', 'current_company', 'employment_duration',
-            'experience_1_title', 'experience_1_company', 'experience_1_duration', 'experience_1_location',
-            'experience_2_title', 'experience_2_company', 'experience_2_duration', 'experience_2_location',
-            'experience_3_title', 'experience_3_company', 'experience_3_duration', 'experience_3_location',
-            'total_experience_count',
-            'education_1_school', 'education_1_degree', 'education_1_field', 'education_1_years',
-            'education_2_school', 'education_2_degree', 'education_2_field', 'education_2_years',
-            'education_3_school', 'education_3_degree', 'education_3_field', 'education_3_years',
-            'total_education_count',
-            'skills_list', 'skills_count', 'skill_1', 'skill_2', 'skill_3', 'skill_4', 'skill_5',
-            'certifications', 'certifications_count',
-            'languages', 'languages_count',
-            'volunteer_experience', 'volunteer_count',
-            'publications', 'publications_count',
-            'projects', 'projects_count',
-            'followers', 'activity_posts',
-            'profile_url'
-        ]
-        
-        # Get all field names from profiles
-        all_fields = set()
-        for profile in profiles:
-            all_fields.update(profile.keys())
-        
-        # Create ordered fieldnames: preferred columns first, then any additional ones
-        fieldnames = []
-        for col in preferred_columns:
-            if col in all_fields:
-                fieldnames.append(col)
-        
-        # Add any additional fields not in preferred list
-        for field in sorted(all_fields):
-            if field not in fieldnames:
-                fieldnames.append(field)
-        
-        # Clean and prepare data
-        cleaned_profiles = []
-        for profile in profiles:
-            cleaned_profile = {}
-            for field in fieldnames:
-                value = profile.get(field, '')
-                # Clean the value
-                if isinstance(value, str):
-                    value = value.strip()
-                    # Remove excessive whitespace
-                    value = ' '.join(value.split())
-                    # Limit very long text fields
-                    if field == 'about' and len(value) > 1000:
-                        value = value[:1000] + '...'
-                elif isinstance(value, dict):
-                    # Convert dict to string representation
-                    value = str(value)
-                
-                cleaned_profile[field] = value
-            cleaned_profiles.append(cleaned_profile)
-        
         try:
-            with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(cleaned_profiles)
+            # Header comes from the schema, so rows stream out without a pre-pass over all profiles;
+            # they are only kept in memory when an Excel copy (output.excel_copy) is wanted
+            rows = [] if self.config.get('output', {}).get('excel_copy', False) else None
+            with CsvStreamWriter(filename) as writer:
+                for profile in profiles:
+                    row = writer.write(profile)
+                    if rows is not None:
+                        rows.append(row)
             
             self.logger.info(f"Saved {len(profiles)} profiles to {filename}")
             
-            # Also create an Excel file for better viewing
-            try:
-                import pandas as pd
-                excel_filename = filename.replace('.csv', '.xlsx')
-                df = pd.DataFrame(cleaned_profiles)
-                df.to_excel(excel_filename, index=False, engine='openpyxl')
-                self.logger.info(f"Also saved as Excel: {excel_filename}")
-            except Exception as e:
-                self.logger.debug(f"Could not create Excel file: {str(e)}")
+            if rows is not None:
+                self.save_to_excel(rows, filename.replace('.csv', '.xlsx'))
             
         except Exception as e:
             self.logger.error(f"Error saving to CSV: {str(e)}")
     
+    def save_to_excel(self, rows: List[List], filename: str) -> bool:
+        """Write cleaned schema rows (as returned by the CSV writers) to an Excel file."""
+        try:
+            df = pd.DataFrame(rows, columns=PROFILE_SCHEMA.columns())
+            df.to_excel(filename, index=False, engine='openpyxl')
+            self.logger.info(f"Also saved as Excel: {filename}")
+            return True
+        except Exception as e:
+            self.logger.debug(f"Could not create Excel file: {str(e)}")
+            return False
+    
     def cleanup(self):
         """Clean up resources."""
+        if self.scrape_state is not None:
+            self.scrape_state.close()
+            self.scrape_state = None
+        if self.extraction_cache is not None:
+            try:
+                self.extraction_cache.save()
+            except OSError as e:
+                self.logger.error(f"Error saving extraction cache: {str(e)}")
+        if self.entity_resolver is not None:
+            try:
+                self.entity_resolver.save()
+            except OSError as e:
+                self.logger.error(f"Error saving entity index: {str(e)}")
         if self.driver:
             try:
                 self.driver.quit()
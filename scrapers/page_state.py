@@ -0,0 +1,121 @@
+"""
+Page-state classification right after navigation.
+
+One small script reads the final URL, the title, the first heading, whether
+a few marker elements exist and whether the page asks the visitor to sign in.
+From those cheap signals the page is classified (profile, authwall,
+unavailable, unknown) and routed to the full extraction, the title-only
+limited extraction, or skipped outright, so blocked and missing profiles never
+pay for the scrolls and sleeps of a full scrape.
+
+Sign-in checks come before the profile markers: an authwall interstitial
+served in place of a profile can share the profile's top card layout.
+"""
+
+import json
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import WebDriverException
+
+ROUTE_FULL = 'full'
+ROUTE_LIMITED = 'limited'
+ROUTE_SKIP = 'skip'
+
+# Final URL paths LinkedIn redirects to instead of showing a profile
+AUTHWALL_PATHS = ('/authwall', '/login', '/signup', '/checkpoint', '/uas/login')
+UNAVAILABLE_PHRASES = ('profile unavailable', 'this profile is not available', 'page not found',
+                       "this page doesn't exist", 'profile not found')
+# Titles that say nothing about the person, so a limited extraction would only get noise
+GENERIC_TITLES = ('linkedin', 'sign up | linkedin', 'log in | linkedin', 'linkedin login, sign in | linkedin',
+                  'security verification | linkedin')
+
+AUTH_MARKERS = ['#username', '#session_key', 'form.login__form', '.authwall-join-form', 'form[action*="login-submit"]']
+# Visible text that means the page is gated behind a sign-in
+SIGN_IN_PHRASES = ['sign in', 'join now']
+
+_STATE_SCRIPT = """
+var markers = %s;
+var phrases = %s;
+var found = {};
+Object.keys(markers).forEach(function (name) {
+    found[name] = markers[name].some(function (selector) {
+        try { return document.querySelector(selector) !== null; } catch (e) { return false; }
+    });
+});
+var heading = document.querySelector('h1');
+var text = document.body ? (document.body.innerText || '').toLowerCase() : '';
+return {url: location.href, title: document.title,
+        heading: heading ? (heading.innerText || '').slice(0, 200) : '', markers: found,
+        sign_in: phrases.some(function (phrase) { return text.indexOf(phrase) !== -1; })};
+"""
+
+
+@dataclass(frozen=True)
+class PageVerdict:
+    """Where a freshly loaded page should go next."""
+    state: str
+    route: str
+    reason: str
+
+
+def classify_page(url: str, title: str, heading: str = '', markers: Optional[Dict[str, bool]] = None,
+                  sign_in: bool = False) -> PageVerdict:
+    """Classify a page from its final URL, title, first heading, marker presence and sign-in prompt."""
+    markers = markers or {}
+    path = urlparse(url or '').path.lower()
+    title_text = (title or '').strip().lower()
+    names_someone = bool(title_text) and title_text not in GENERIC_TITLES
+
+    if any(path.startswith(prefix) for prefix in AUTHWALL_PATHS):
+        if names_someone:
+            return PageVerdict('authwall', ROUTE_LIMITED, f"redirected to {path}")
+        return PageVerdict('authwall', ROUTE_SKIP, f"redirected to {path}")
+
+    visible_text = f"{title_text}\n{(heading or '').lower()}"
+    if any(phrase in visible_text for phrase in UNAVAILABLE_PHRASES):
+        return PageVerdict('unavailable', ROUTE_SKIP, 'unavailable page')
+
+    if markers.get('auth') or sign_in:
+        route = ROUTE_LIMITED if names_someone else ROUTE_SKIP
+        reason = 'sign-in form on the page' if markers.get('auth') else 'page asks to sign in'
+        return PageVerdict('authwall', route, reason)
+
+    if markers.get('profile'):
+        return PageVerdict('profile', ROUTE_FULL, 'profile top card present')
+
+    return PageVerdict('unknown', ROUTE_FULL, 'no markers yet')
+
+
+class PageStateClassifier:
+    """Runs classify_page against the live driver, waiting briefly for markers to appear."""
+
+    def __init__(self, profile_markers: List[str], auth_markers: List[str] = AUTH_MARKERS,
+                 settle_seconds: float = 1.0, poll_seconds: float = 0.25):
+        self.settle_seconds = settle_seconds
+        self.poll_seconds = poll_seconds
+        self._script = _STATE_SCRIPT % (json.dumps({'profile': list(profile_markers), 'auth': list(auth_markers)}),
+                                         json.dumps(SIGN_IN_PHRASES))
+
+    def read(self, driver) -> Dict:
+        """Cheap snapshot of the page signals; falls back to URL and title only."""
+        try:
+            snapshot = driver.execute_script(self._script)
+            if isinstance(snapshot, dict):
+                return snapshot
+        except WebDriverException:
+            pass
+        return {'url': driver.current_url, 'title': driver.title, 'heading': '', 'markers': {}, 'sign_in': False}
+
+    def classify(self, driver) -> PageVerdict:
+        """Classify the current page; an 'unknown' page is re-read until `settle_seconds` pass."""
+        deadline = time.monotonic() + self.settle_seconds
+        while True:
+            snapshot = self.read(driver)
+            verdict = classify_page(snapshot.get('url'), snapshot.get('title'), snapshot.get('heading'),
+                                    snapshot.get('markers'), bool(snapshot.get('sign_in')))
+            if verdict.state != 'unknown' or time.monotonic() >= deadline:
+                return verdict
+            time.sleep(self.poll_seconds)
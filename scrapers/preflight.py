@@ -0,0 +1,145 @@
+"""
+Canary preflight: validate the browser, the session and the extractors before a batch.
+
+Three stages, each timed:
+
+  driver   - the browser starts (or the existing one still answers)
+  session  - after login, the feed loads without an authwall redirect
+  canaries - each configured canary profile extracts in one attempt, with
+             its expected fields populated
+
+A stale session or a broken selector then fails in a minute instead of
+showing up as empty columns after a whole batch. main.py runs it with
+`--preflight` (check only) or before every batch with `preflight.before_run`.
+"""
+
+import logging
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+from .page_state import classify_page
+from .quality import is_filled
+from .utils import extract_linkedin_username, log_event
+
+DEFAULT_EXPECTED_FIELDS = ['name', 'headline', 'current_company']
+
+
+@dataclass
+class StageResult:
+    """Outcome and duration of one preflight stage (or one canary)."""
+    stage: str
+    ok: bool
+    seconds: float
+    detail: str = ''
+
+
+@dataclass
+class PreflightReport:
+    stages: List[StageResult] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return all(stage.ok for stage in self.stages)
+
+    @property
+    def total_seconds(self) -> float:
+        return round(sum(stage.seconds for stage in self.stages), 2)
+
+    def as_dict(self) -> Dict:
+        return {'ok': self.ok, 'total_seconds': self.total_seconds,
+                'stages': [asdict(stage) for stage in self.stages]}
+
+    def lines(self) -> List[str]:
+        return [f"   {'✅' if stage.ok else '❌'} {stage.stage:<28}{stage.seconds:>7.2f}s  {stage.detail}"
+                for stage in self.stages]
+
+
+def canaries_from_config(config: Dict) -> List[Dict]:
+    """Canary entries as {'url', 'expect'}; a plain URL string expects the default fields."""
+    preflight_config = config.get('preflight', {})
+    default_fields = preflight_config.get('expected_fields', DEFAULT_EXPECTED_FIELDS)
+    canaries = []
+    for canary in preflight_config.get('canaries', []):
+        if isinstance(canary, str):
+            canary = {'url': canary}
+        canaries.append({'url': canary['url'], 'expect': canary.get('expect', default_fields)})
+    return canaries
+
+
+class Preflight:
+    """Runs the preflight stages against a LinkedInScraper, reusing its driver for the batch."""
+
+    def __init__(self, scraper, canaries: List[Dict], require_login: bool = True):
+        self.scraper = scraper
+        self.canaries = canaries
+        self.require_login = require_login
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def from_config(cls, scraper, config: Dict) -> 'Preflight':
+        return cls(scraper, canaries_from_config(config),
+                   require_login=config.get('preflight', {}).get('require_login', True))
+
+    def _stage(self, report: PreflightReport, name: str, check) -> bool:
+        started = time.monotonic()
+        try:
+            ok, detail = check()
+        except Exception as e:
+            ok, detail = False, f"{type(e).__name__}: {e}"
+        result = StageResult(name, ok, round(time.monotonic() - started, 2), detail)
+        report.stages.append(result)
+        log_event(self.logger, 'preflight_stage', logging.INFO if ok else logging.ERROR, **asdict(result))
+        return ok
+
+    def run(self) -> PreflightReport:
+        """Run the stages in order; later stages are skipped once one fails."""
+        report = PreflightReport()
+        if not self._stage(report, 'driver', self._check_driver):
+            return report
+        if not self._stage(report, 'session', self._check_session):
+            return report
+        if not self.canaries:
+            report.stages.append(StageResult('canaries', True, 0.0, 'no canaries configured'))
+            return report
+        for canary in self.canaries:
+            name = extract_linkedin_username(canary['url']) or canary['url']
+            self._stage(report, f"canary {name}", lambda canary=canary: self._check_canary(canary))
+        return report
+
+    def _check_driver(self):
+        scraper = self.scraper
+        if scraper.driver is None:
+            scraper.setup_driver()
+        version = (scraper.driver.capabilities or {}).get('browserVersion', 'unknown version')
+        return True, f"browser {version}"
+
+    def _check_session(self):
+        scraper = self.scraper
+        if scraper.config.get('linkedin', {}).get('auto_login', False) and not scraper.logged_in:
+            scraper.logged_in = scraper.login_to_linkedin()
+        scraper.driver.get(f"{scraper.base_url}/feed/")
+        snapshot = scraper.page_classifier.read(scraper.driver)
+        verdict = classify_page(snapshot.get('url'), snapshot.get('title'), snapshot.get('heading'),
+                                snapshot.get('markers'), bool(snapshot.get('sign_in')))
+        if verdict.state == 'authwall':
+            return not self.require_login, f"not authenticated ({verdict.reason})"
+        return True, f"authenticated, feed at {snapshot.get('url')}"
+
+    def _check_canary(self, canary: Dict):
+        # One attempt, no retries or backoff, and nothing recorded into the run summary
+        outcome, profile, error, _, _ = self.scraper._scrape_attempt(canary['url'])
+        if profile is None or outcome not in ('success', 'partial'):
+            return False, f"outcome {outcome}" + (f": {error}" if error else '')
+        missing = [name for name in canary['expect'] if not is_filled(profile.get(name))]
+        if missing:
+            return False, f"outcome {outcome}, empty: {', '.join(missing)}"
+        return True, f"outcome {outcome}, {len(canary['expect'])} expected fields filled"
+
+
+def run_preflight(scraper, config: Dict, canaries: Optional[List[Dict]] = None) -> PreflightReport:
+    """Run the preflight for `scraper`; `canaries` overrides the configured list."""
+    preflight = Preflight.from_config(scraper, config)
+    if canaries is not None:
+        preflight.canaries = canaries
+    return preflight.run()
@@ -0,0 +1,157 @@
+"""
+Streaming per-field fill-rate monitor.
+
+Every fully extracted profile updates, for every output column, a sliding
+window of filled / empty flags. Once the window holds enough profiles, each
+field's fill rate is compared with its baseline: the median fill rate of
+recent runs in the history store, or `min_fill_rate` for key fields without
+history. A field more than `max_drop` below its baseline raises an alert.
+When a key field (headline, current_company, skills_list, ...) breaks, the
+run keeps going ('alert'), waits for a selectors.json fix ('pause') or stops
+('abort'), instead of spending hours of browser time on empty rows.
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from .history import history_from_config
+from .schema import PROFILE_SCHEMA
+
+ACTIONS = ('alert', 'pause', 'abort')
+DEFAULT_KEY_FIELDS = ('name', 'headline', 'current_company', 'skills_list')
+# Non-key fields are only watched when they are usually filled
+MIN_BASELINE_FOR_ALERT = 0.5
+
+
+class QualityAbort(Exception):
+    """Raised to stop a run whose output no longer fills its key fields."""
+
+
+@dataclass(frozen=True)
+class FieldDrop:
+    """A field whose windowed fill rate fell below its threshold."""
+    field: str
+    fill_rate: float
+    baseline: Optional[float]
+    threshold: float
+    key: bool
+
+
+def is_filled(value) -> bool:
+    if value is None:
+        return False
+    if isinstance(value, str):
+        return bool(value.strip())
+    if isinstance(value, (list, tuple, dict)):
+        return bool(value)
+    return value != 0
+
+
+class FillRateMonitor:
+    """Sliding-window fill rates per field, checked against historical baselines."""
+
+    def __init__(self, fields: Optional[Iterable[str]] = None, key_fields: Iterable[str] = DEFAULT_KEY_FIELDS,
+                 window: int = 50, min_samples: int = 20, max_drop: float = 0.3, min_fill_rate: float = 0.2,
+                 baseline: Optional[Dict[str, float]] = None, action: str = 'alert', pause_seconds: float = 900):
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown quality action {action!r}, expected one of {', '.join(ACTIONS)}")
+        self.fields = tuple(fields or PROFILE_SCHEMA.columns())
+        self.key_fields = frozenset(key_fields) & frozenset(self.fields)
+        self.min_samples = min(min_samples, window)
+        self.max_drop = max_drop
+        self.min_fill_rate = min_fill_rate
+        self.baseline = dict(baseline or {})
+        self.action = action
+        self.pause_seconds = pause_seconds
+        self._window = deque(maxlen=window)
+        self._window_counts = [0] * len(self.fields)
+        self._run_counts = [0] * len(self.fields)
+        self.profiles = 0
+        self._breached = set()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> Optional['FillRateMonitor']:
+        """Create the monitor from the 'quality' config section, or None when disabled."""
+        quality_config = config.get('quality', {})
+        if not quality_config.get('enabled', False):
+            return None
+        window = quality_config.get('window', 50)
+        baseline = {}
+        history = history_from_config(config)
+        if history is not None:
+            try:
+                baseline = history.fill_rate_baseline(quality_config.get('baseline_runs', 10),
+                                                      min_profiles=window)
+            finally:
+                history.close()
+        return cls(
+            key_fields=quality_config.get('key_fields', DEFAULT_KEY_FIELDS),
+            window=window,
+            min_samples=quality_config.get('min_samples', 20),
+            max_drop=quality_config.get('max_drop', 0.3),
+            min_fill_rate=quality_config.get('min_fill_rate', 0.2),
+            baseline=baseline,
+            action=quality_config.get('action', 'alert'),
+            pause_seconds=quality_config.get('pause_seconds', 900)
+        )
+
+    def threshold(self, field: str) -> Optional[float]:
+        """Fill rate below which `field` counts as broken, or None if it isn't watched."""
+        baseline = self.baseline.get(field)
+        if baseline is None:
+            return self.min_fill_rate if field in self.key_fields else None
+        if field not in self.key_fields and baseline < MIN_BASELINE_FOR_ALERT:
+            return None
+        return max(0.0, baseline - self.max_drop)
+
+    def observe(self, profile: Dict) -> List[FieldDrop]:
+        """Add one profile; returns fields that have just dropped below their threshold."""
+        flags = tuple(is_filled(profile.get(field)) for field in self.fields)
+        if len(self._window) == self._window.maxlen:
+            for i, filled in enumerate(self._window[0]):
+                self._window_counts[i] -= filled
+        self._window.append(flags)
+        for i, filled in enumerate(flags):
+            self._window_counts[i] += filled
+            self._run_counts[i] += filled
+        self.profiles += 1
+
+        if len(self._window) < self.min_samples:
+            return []
+        drops = []
+        size = len(self._window)
+        for i, field in enumerate(self.fields):
+            threshold = self.threshold(field)
+            if threshold is None:
+                continue
+            rate = self._window_counts[i] / size
+            if rate >= threshold:
+                self._breached.discard(field)
+            elif field not in self._breached:
+                # Alert once per breach; a field has to recover before it alerts again
+                self._breached.add(field)
+                drops.append(FieldDrop(field, round(rate, 3), self.baseline.get(field), round(threshold, 3),
+                                       field in self.key_fields))
+        return drops
+
+    @property
+    def window_size(self) -> int:
+        return len(self._window)
+
+    def fill_rates(self) -> Dict[str, float]:
+        """Fill rate of every field over the current window."""
+        size = len(self._window) or 1
+        return {field: round(count / size, 4) for field, count in zip(self.fields, self._window_counts)}
+
+    def run_fill_rates(self) -> Dict[str, float]:
+        """Fill rate of every field over all profiles seen this run (recorded into the history)."""
+        if not self.profiles:
+            return {}
+        return {field: round(count / self.profiles, 4) for field, count in zip(self.fields, self._run_counts)}
+
+    def reset_window(self):
+        """Forget the window, e.g. after a selector fix was loaded."""
+        self._window.clear()
+        self._window_counts = [0] * len(self.fields)
+        self._breached.clear()
@@ -0,0 +1,107 @@
+import sys
+from collections.abc import Mapping
+from typing import Dict, Iterable, List, Optional
+
+from .schema import PROFILE_SCHEMA
+
+# Flat column order shared by every record; dict-valued fields are packed separately
+PROFILE_COLUMNS = tuple(spec.name for spec in PROFILE_SCHEMA.fields() if spec.type is not dict)
+
+COUNT_COLUMNS = frozenset(spec.name for spec in PROFILE_SCHEMA.fields() if spec.type is int)
+
+INDICATORS_KEY = sys.intern('profile_completeness_indicators')
+COMPLETENESS_FLAGS = ('has_about', 'has_experience', 'has_education', 'has_skills', 'has_profile_picture')
+
+_COLUMN_INDEX = {column: i for i, column in enumerate(PROFILE_COLUMNS)}
+
+
+def _rank(mask: int, index: int) -> int:
+    """Position of column `index` within the packed values of `mask`."""
+    return bin(mask & ((1 << index) - 1)).count('1')
+
+
+class ProfileRecord(Mapping):
+    """
+    Compact, read-only profile row keyed by the shared PROFILE_COLUMNS schema.
+
+    Only non-empty values are stored, packed into a tuple addressed by a bitmask,
+    counts are kept as ints and completeness indicators as bit flags. Behaves like
+    the plain profile dict for reads (get, keys, items, `in`).
+    """
+
+    __slots__ = ('_present', '_filled', '_values', '_flags', '_extra')
+
+    def __init__(self, present: int, filled: int, values: tuple, flags: Optional[int] = None,
+                 extra: Optional[Dict] = None):
+        self._present = present
+        self._filled = filled
+        self._values = values
+        self._flags = flags
+        self._extra = extra
+
+    @classmethod
+    def from_dict(cls, profile: Dict) -> 'ProfileRecord':
+        """Pack a scraped profile dict into a record."""
+        present = filled = 0
+        values = []
+        extra = None
+        flags = None
+        for key, value in profile.items():
+            index = _COLUMN_INDEX.get(key)
+            if index is None:
+                if key == INDICATORS_KEY and isinstance(value, dict):
+                    flags = 0
+                    for bit, flag in enumerate(COMPLETENESS_FLAGS):
+                        if value.get(flag):
+                            flags |= 1 << bit
+                else:
+                    if extra is None:
+                        extra = {}
+                    extra[sys.intern(key)] = value
+                continue
+            present |= 1 << index
+            if value is None or value == '':
+                continue
+            filled |= 1 << index
+            values.append((index, int(value) if key in COUNT_COLUMNS else value))
+        values.sort()
+        return cls(present, filled, tuple(value for _, value in values), flags, extra)
+
+    def __getitem__(self, key):
+        index = _COLUMN_INDEX.get(key)
+        if index is not None:
+            bit = 1 << index
+            if not self._present & bit:
+                raise KeyError(key)
+            if not self._filled & bit:
+                return ''
+            return self._values[_rank(self._filled, index)]
+        if key == INDICATORS_KEY and self._flags is not None:
+            return {flag: bool(self._flags & (1 << bit)) for bit, flag in enumerate(COMPLETENESS_FLAGS)}
+        if self._extra and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __iter__(self):
+        present = self._present
+        for index, column in enumerate(PROFILE_COLUMNS):
+            if present & (1 << index):
+                yield column
+        if self._flags is not None:
+            yield INDICATORS_KEY
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self):
+        return bin(self._present).count('1') + (self._flags is not None) + len(self._extra or ())
+
+    def __repr__(self):
+        return f"ProfileRecord(name={self.get('name', '')!r}, fields={len(self)})"
+
+    def to_dict(self) -> Dict:
+        """Expand back into the plain profile dict shape."""
+        return {key: self[key] for key in self}
+
+    def to_row(self, columns: Iterable[str] = PROFILE_COLUMNS) -> List:
+        """Return values for `columns` in order, '' for missing fields (CSV row shape)."""
+        return [self.get(column, '') for column in columns]
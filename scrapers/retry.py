@@ -0,0 +1,129 @@
+"""
+Outcome classification and retry policy for profile scrapes.
+
+Every attempt at a profile ends in one outcome class. Transient classes
+(timeouts and a crashed or disconnected driver) are retried with capped
+exponential backoff and jitter; permanent ones (authwall, unavailable
+profiles, pages without data) are not. Partial extraction and unknown errors
+are usually a selector or parser problem that a retry won't fix, so they are
+only retried when listed in `scraping.retry_on`. Each attempt is recorded per
+URL so a run can show what was retried and why.
+"""
+
+import json
+import random
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+TRANSIENT_OUTCOMES = frozenset({'timeout', 'driver_crash'})
+PERMANENT_OUTCOMES = frozenset({'authwall', 'limited', 'unavailable', 'no_data'})
+# Neither: retried only when opted in with scraping.retry_on
+OPT_IN_OUTCOMES = frozenset({'partial', 'error'})
+
+# WebDriverException messages that mean the browser session itself is gone
+_DRIVER_CRASH_MARKERS = (
+    'invalid session id', 'session deleted', 'chrome not reachable', 'disconnected',
+    'no such window', 'target window already closed', 'tab crashed', 'connection refused',
+    'max retries exceeded',
+)
+
+
+def classify_exception(exc: BaseException) -> str:
+    """Map an exception raised while loading or parsing a profile to an outcome class."""
+    if isinstance(exc, TimeoutException):
+        return 'timeout'
+    if isinstance(exc, ConnectionError):
+        return 'driver_crash'
+    if isinstance(exc, WebDriverException):
+        message = str(exc).lower()
+        if any(marker in message for marker in _DRIVER_CRASH_MARKERS):
+            return 'driver_crash'
+    return 'error'
+
+
+@dataclass
+class Attempt:
+    """One try at a URL."""
+    attempt: int
+    outcome: str
+    duration: float
+    error: Optional[str] = None
+    backoff: Optional[float] = None
+    started_at: float = 0.0
+
+
+class RetryPolicy:
+    """Which outcomes to retry, how often, and how long to back off in between.
+
+    `retry_on` may only name transient and opt-in outcomes; a typo or a
+    permanent outcome raises ValueError instead of silently never retrying.
+    """
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 5.0, max_delay: float = 60.0,
+                 retry_on: FrozenSet[str] = TRANSIENT_OUTCOMES):
+        self.max_retries = max(0, max_retries)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_on = frozenset(retry_on)
+        permanent = self.retry_on & PERMANENT_OUTCOMES
+        if permanent:
+            raise ValueError(f"Outcomes {', '.join(sorted(permanent))} are permanent and never retried")
+        unknown = self.retry_on - TRANSIENT_OUTCOMES - OPT_IN_OUTCOMES
+        if unknown:
+            raise ValueError(f"Unknown retry_on outcomes {', '.join(sorted(unknown))}, expected any of "
+                             f"{', '.join(sorted(TRANSIENT_OUTCOMES | OPT_IN_OUTCOMES))}")
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'RetryPolicy':
+        scraping = config.get('scraping', {})
+        return cls(
+            max_retries=scraping.get('max_retries', 3),
+            base_delay=scraping.get('retry_backoff_seconds', 5.0),
+            max_delay=scraping.get('retry_backoff_max_seconds', 60.0),
+            retry_on=frozenset(scraping.get('retry_on', TRANSIENT_OUTCOMES))
+        )
+
+    def should_retry(self, outcome: str, attempt: int) -> bool:
+        """`attempt` is 1-based; max_retries retries follow the first attempt."""
+        return outcome in self.retry_on and attempt <= self.max_retries
+
+    def backoff(self, attempt: int) -> float:
+        """Capped exponential delay with equal jitter, so parallel retries don't line up."""
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+
+class AttemptLog:
+    """Attempt history per URL for the current run."""
+
+    def __init__(self):
+        self._attempts: Dict[str, List[Attempt]] = {}
+
+    def record(self, url: str, attempt: Attempt):
+        self._attempts.setdefault(url, []).append(attempt)
+
+    def attempts(self, url: str) -> List[Attempt]:
+        return list(self._attempts.get(url, ()))
+
+    def retried_urls(self) -> List[str]:
+        return [url for url, attempts in self._attempts.items() if len(attempts) > 1]
+
+    def retry_count(self) -> int:
+        return sum(len(attempts) - 1 for attempts in self._attempts.values())
+
+    def as_dict(self) -> Dict[str, List[Dict]]:
+        return {url: [asdict(attempt) for attempt in attempts] for url, attempts in self._attempts.items()}
+
+    def write(self, path: str) -> int:
+        """Write the history as JSON; returns the number of URLs."""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.as_dict(), f, indent=2)
+        return len(self._attempts)
+
+    def __len__(self):
+        return len(self._attempts)
+
@@ -0,0 +1,306 @@
+"""
+Deadline- and staleness-aware ordering of profile URLs.
+
+Each URL's value is its priority times how stale its last good scrape is
+(1 - 0.5 ** (age / half_life); never scraped counts as fully stale, and only a
+success or partial profile counts as scraped). Its cost
+is the recent per-profile time (an EWMA kept per URL in a small SQLite store,
+else the mean over recent URLs, else a default) plus the delay between
+profiles, and never less than the rate limit allows. URLs are ordered by value
+per second, with those scraped within `min_refresh_hours` last. Without a
+budget every URL is kept; with a time budget the plan is filled greedily and
+what doesn't fit is deferred to the next run (logged, and main.py exits with
+EXIT_DEFERRED). A run cut short has then already done the profiles that
+matter most.
+
+URL files may carry a priority after the URL (default 1; lines with an
+unreadable priority are logged and skipped):
+
+    https://www.linkedin.com/in/satyanadella/ 5
+
+    python -m scrapers.scheduler plan data/profile_urls.txt --budget 2h
+"""
+
+import argparse
+import json
+import logging
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .utils import log_event
+
+DEFAULT_DB = 'data/scrape_state.db'
+# Outcomes that refresh last_scraped_at; anything else only sets last_failed_at
+SCRAPED_OUTCOMES = frozenset({'success', 'partial'})
+# Exit status of a run that finished but left URLs for a later run
+EXIT_DEFERRED = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS url_state (
+    url TEXT PRIMARY KEY,
+    last_scraped_at REAL,
+    last_failed_at REAL,
+    last_attempt_at REAL NOT NULL,
+    last_outcome TEXT NOT NULL,
+    ewma_seconds REAL NOT NULL,
+    scrapes INTEGER NOT NULL
+)
+"""
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """Seconds from '90m', '2h', '1d', '45s' or a bare number of minutes; ValueError if unreadable."""
+    if not value:
+        return None
+    value = str(value).strip()
+    units = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+    try:
+        if value[-1] in units:
+            seconds = float(value[:-1]) * units[value[-1]]
+        else:
+            seconds = float(value) * 60
+    except ValueError:
+        raise ValueError(f"invalid duration {value!r}, expected e.g. 45s, 90m, 2h or 1d") from None
+    if seconds <= 0:
+        raise ValueError(f"invalid duration {value!r}, must be positive")
+    return seconds
+
+
+def read_url_entries(path: str) -> List[Tuple[str, float]]:
+    """(url, priority) pairs from a URL file; '#' comments, blank lines and bad priorities are skipped."""
+    logger = logging.getLogger(__name__)
+    entries = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            parts = line.split()
+            if not parts or parts[0].startswith('#'):
+                continue
+            try:
+                priority = float(parts[1]) if len(parts) > 1 else 1.0
+            except ValueError:
+                log_event(logger, 'url_line_skipped', logging.WARNING, path=path, line=line_number,
+                          url=parts[0], reason=f"invalid priority {parts[1]!r}")
+                continue
+            entries.append((parts[0], priority))
+    return entries
+
+
+class ScrapeState:
+    """Per-URL last scrape time, outcome and cost, shared by every run."""
+
+    def __init__(self, path: str = DEFAULT_DB, alpha: float = 0.3):
+        self.path = path
+        self.alpha = alpha
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # Written from whichever thread runs the scraper (web / queue workers)
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(SCHEMA)
+        # Stores created before failures were tracked separately
+        columns = {row['name'] for row in self.conn.execute("PRAGMA table_info(url_state)")}
+        if 'last_failed_at' not in columns:
+            self.conn.execute("ALTER TABLE url_state ADD COLUMN last_failed_at REAL")
+        self.conn.commit()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> Optional['ScrapeState']:
+        """Open the store from the 'scheduler' config section, or None when disabled."""
+        scheduler_config = config.get('scheduler', {})
+        if not scheduler_config.get('enabled', False):
+            return None
+        return cls(scheduler_config.get('state_path', DEFAULT_DB), scheduler_config.get('cost_alpha', 0.3))
+
+    def record(self, url: str, outcome: str, seconds: float):
+        """Fold one finished profile into its cost EWMA; only success / partial count as scraped."""
+        now = time.time()
+        scraped_at, failed_at = (now, None) if outcome in SCRAPED_OUTCOMES else (None, now)
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO url_state (url, last_scraped_at, last_failed_at, last_attempt_at, last_outcome, "
+                "ewma_seconds, scrapes) VALUES (?, ?, ?, ?, ?, ?, 1) "
+                "ON CONFLICT(url) DO UPDATE SET "
+                "last_scraped_at = COALESCE(excluded.last_scraped_at, last_scraped_at), "
+                "last_failed_at = COALESCE(excluded.last_failed_at, last_failed_at), "
+                "last_attempt_at = excluded.last_attempt_at, last_outcome = excluded.last_outcome, "
+                "ewma_seconds = ? * excluded.ewma_seconds + (1 - ?) * ewma_seconds, scrapes = scrapes + 1",
+                (url, scraped_at, failed_at, now, outcome, seconds, self.alpha, self.alpha)
+            )
+
+    def get_many(self, urls: List[str]) -> Dict[str, Dict]:
+        states = {}
+        with self._lock:
+            for start in range(0, len(urls), 500):
+                chunk = urls[start:start + 500]
+                cursor = self.conn.execute(
+                    f"SELECT * FROM url_state WHERE url IN ({','.join('?' * len(chunk))})", chunk
+                )
+                states.update({row['url']: dict(row) for row in cursor})
+        return states
+
+    def mean_cost(self, since_days: float = 30) -> Optional[float]:
+        """Mean per-URL cost over URLs attempted in the last `since_days`."""
+        with self._lock:
+            row = self.conn.execute("SELECT AVG(ewma_seconds) FROM url_state WHERE last_attempt_at >= ?",
+                                    (time.time() - since_days * 86400,)).fetchone()
+        return row[0]
+
+    def close(self):
+        self.conn.close()
+
+
+@dataclass
+class ScheduledUrl:
+    url: str
+    priority: float
+    age_hours: Optional[float]
+    cost_seconds: float
+    value: float
+
+    @property
+    def density(self) -> float:
+        return self.value / self.cost_seconds
+
+
+@dataclass
+class Schedule:
+    """URLs to scrape now, best value per second first, and those left for later."""
+    selected: List[ScheduledUrl] = field(default_factory=list)
+    deferred: List[ScheduledUrl] = field(default_factory=list)
+    budget_seconds: Optional[float] = None
+
+    @property
+    def urls(self) -> List[str]:
+        return [item.url for item in self.selected]
+
+    @property
+    def estimated_seconds(self) -> float:
+        return sum(item.cost_seconds for item in self.selected)
+
+    @property
+    def value(self) -> float:
+        return sum(item.value for item in self.selected)
+
+
+class Scheduler:
+    """Orders URLs by priority-weighted staleness per estimated second, within a time budget."""
+
+    def __init__(self, state: Optional[ScrapeState] = None, half_life_hours: float = 168,
+                 min_refresh_hours: float = 0, default_cost_seconds: float = 30,
+                 delay_seconds: float = 3, requests_per_minute: float = 10):
+        self.state = state
+        self.half_life_hours = half_life_hours
+        self.min_refresh_hours = min_refresh_hours
+        self.default_cost_seconds = default_cost_seconds
+        # random_delay(delay, 2 * delay) between profiles averages 1.5 * delay
+        self.delay_seconds = 1.5 * delay_seconds
+        self.min_interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def from_config(cls, config: Dict, state: Optional[ScrapeState] = None) -> Optional['Scheduler']:
+        """Create the scheduler from the 'scheduler' config section, or None when disabled."""
+        scheduler_config = config.get('scheduler', {})
+        if not scheduler_config.get('enabled', False):
+            return None
+        return cls(
+            state if state is not None else ScrapeState.from_config(config),
+            half_life_hours=scheduler_config.get('half_life_hours', 168),
+            min_refresh_hours=scheduler_config.get('min_refresh_hours', 0),
+            default_cost_seconds=scheduler_config.get('default_cost_seconds', 30),
+            delay_seconds=config.get('scraping', {}).get('delay_between_requests', 3),
+            requests_per_minute=config.get('rate_limiting', {}).get('requests_per_minute', 10)
+        )
+
+    def staleness(self, age_hours: Optional[float]) -> float:
+        if age_hours is None:
+            return 1.0
+        if age_hours < self.min_refresh_hours:
+            return 0.0
+        return 1.0 - 0.5 ** (age_hours / self.half_life_hours)
+
+    def plan(self, entries: List[Tuple[str, float]], budget_seconds: Optional[float] = None) -> Schedule:
+        """Order `(url, priority)` entries; with a budget, fill it greedily by value per second.
+
+        Without a budget nothing is deferred: recently scraped (zero-value)
+        URLs are only moved to the end.
+        """
+        # Duplicate URLs keep their highest priority
+        priorities: Dict[str, float] = {}
+        for url, priority in entries:
+            priorities[url] = max(priority, priorities.get(url, priority))
+        states = self.state.get_many(list(priorities)) if self.state is not None else {}
+        fallback_cost = (self.state.mean_cost() if self.state is not None else None) or self.default_cost_seconds
+
+        now = time.time()
+        items = []
+        for url, priority in priorities.items():
+            state = states.get(url, {})
+            scraped_at = state.get('last_scraped_at')
+            age_hours = (now - scraped_at) / 3600 if scraped_at else None
+            cost = max(state.get('ewma_seconds', fallback_cost) + self.delay_seconds, self.min_interval, 0.1)
+            items.append(ScheduledUrl(url, priority, age_hours and round(age_hours, 2), round(cost, 2),
+                                      round(max(priority, 0.0) * self.staleness(age_hours), 4)))
+        # Stable sort: equal density keeps file order
+        items.sort(key=lambda item: item.density, reverse=True)
+
+        schedule = Schedule(budget_seconds=budget_seconds)
+        remaining = budget_seconds
+        for item in items:
+            if remaining is None or item.cost_seconds <= remaining:
+                schedule.selected.append(item)
+                if remaining is not None:
+                    remaining -= item.cost_seconds
+            else:
+                schedule.deferred.append(item)
+        if schedule.deferred:
+            log_event(self.logger, 'schedule_deferred', logging.WARNING, deferred=len(schedule.deferred),
+                      selected=len(schedule.selected), budget_seconds=budget_seconds,
+                      urls=[item.url for item in schedule.deferred[:10]])
+        return schedule
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Show how a URL list would be scheduled.')
+    parser.add_argument('--config', default='config.json')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    plan = subparsers.add_parser('plan', help='Order a URL file (url [priority] per line)')
+    plan.add_argument('urls_file')
+    plan.add_argument('--budget', help="Time budget, e.g. 90m, 2h (default: no budget)")
+    plan.add_argument('--json', action='store_true', help='Print the plan as JSON')
+    args = parser.parse_args(argv)
+
+    with open(args.config, 'r') as f:
+        config = json.load(f)
+    try:
+        budget_seconds = parse_duration(args.budget)
+    except ValueError as e:
+        parser.error(f"--budget: {e}")
+
+    config.setdefault('scheduler', {})['enabled'] = True
+    scheduler = Scheduler.from_config(config)
+    try:
+        schedule = scheduler.plan(read_url_entries(args.urls_file), budget_seconds)
+    finally:
+        scheduler.state.close()
+
+    if args.json:
+        print(json.dumps({'selected': [vars(item) for item in schedule.selected],
+                          'deferred': [vars(item) for item in schedule.deferred]}, indent=2))
+        return 0
+    for i, item in enumerate(schedule.selected, 1):
+        age = f"{item.age_hours:.0f}h" if item.age_hours is not None else 'never'
+        print(f"{i:>4}. prio {item.priority:<5g} age {age:>6}  ~{item.cost_seconds:>5.1f}s  {item.url}")
+    print(f"📋 {len(schedule.selected)} scheduled (~{schedule.estimated_seconds / 60:.1f} min), "
+          f"{len(schedule.deferred)} deferred")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+import functools
+import logging
+import sys
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    """One output column: its type, length cap and the extractor that produces it."""
+    name: str
+    type: type = str
+    max_length: Optional[int] = None
+    group: str = ''
+    order: int = 0
+
+
+class SchemaRegistry:
+    """Declared output schema that extractors register into and writers read the header from."""
+
+    def __init__(self):
+        self._fields: Dict[str, FieldSpec] = {}
+        self._groups: Dict[str, Tuple[str, ...]] = {}
+        self.validation_enabled = True
+        self.logger = logging.getLogger(__name__)
+
+    def register(self, group: str, fields: Iterable[Tuple]):
+        """Register (name, type[, max_length]) fields for an extractor group, in column order."""
+        names = list(self._groups.get(group, ()))
+        for spec in fields:
+            name, field_type = spec[0], spec[1]
+            max_length = spec[2] if len(spec) > 2 else None
+            if name in self._fields:
+                raise ValueError(f"Field {name} already registered by {self._fields[name].group}")
+            name = sys.intern(name)
+            self._fields[name] = FieldSpec(name, field_type, max_length, group, len(self._fields))
+            names.append(name)
+        self._groups[group] = tuple(names)
+
+    def produces(self, group: str) -> Callable:
+        """Decorator binding an `_extract_*` method to its field group and validating its output."""
+        if group not in self._groups:
+            raise KeyError(f"Unknown schema group: {group}")
+
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                data = func(*args, **kwargs)
+                if self.validation_enabled:
+                    problems = self.validate(group, data)
+                    if problems:
+                        self.logger.warning(f"{func.__name__} output does not match schema: {'; '.join(problems)}")
+                return data
+            wrapper.schema_group = group
+            return wrapper
+        return decorator
+
+    def fields(self) -> List[FieldSpec]:
+        return sorted(self._fields.values(), key=lambda spec: spec.order)
+
+    def field(self, name: str) -> Optional[FieldSpec]:
+        return self._fields.get(name)
+
+    def columns(self) -> Tuple[str, ...]:
+        """Every declared column in output order; writers emit this header up front."""
+        return tuple(spec.name for spec in self.fields())
+
+    def group_fields(self, group: str) -> Tuple[str, ...]:
+        return self._groups[group]
+
+    def validate(self, group: str, data: Dict) -> List[str]:
+        """Cheap structural check: unknown keys and wrong value types."""
+        allowed = self._groups[group]
+        problems = []
+        for key, value in data.items():
+            if key not in allowed:
+                problems.append(f"undeclared field {key}")
+                continue
+            expected = self._fields[key].type
+            if value is not None and value != '' and not isinstance(value, expected):
+                problems.append(f"{key} is {type(value).__name__}, expected {expected.__name__}")
+        return problems
+
+    def clean_value(self, name: str, value):
+        """Normalize a value for a flat output row (whitespace, length cap, dict repr)."""
+        if value is None:
+            return ''
+        if isinstance(value, str):
+            value = ' '.join(value.split())
+            spec = self._fields.get(name)
+            if spec and spec.max_length and len(value) > spec.max_length:
+                value = value[:spec.max_length] + '...'
+        elif isinstance(value, dict):
+            value = str(value)
+        return value
+
+    def to_row(self, profile, columns: Optional[Iterable[str]] = None) -> List:
+        """Cleaned values for `columns` (default: every column), '' where missing."""
+        return [self.clean_value(name, profile.get(name, '')) for name in (columns or self.columns())]
+
+
+def _numbered(prefix: str, count: int, parts: Iterable[str], max_length: int = 300) -> List[Tuple]:
+    return [(f"{prefix}_{i}_{part}", str, max_length) for i in range(1, count + 1) for part in parts]
+
+
+PROFILE_SCHEMA = SchemaRegistry()
+
+PROFILE_SCHEMA.register('basic_info', [
+    ('name', str, 200),
+    ('headline', str, 500),
+    ('location', str, 200),
+    ('about', str, 1000),
+    ('connections', str, 50),
+    ('profile_picture_url', str, 2048),
+])
+PROFILE_SCHEMA.register('contact_info', [
+    ('email', str, 254),
+    ('phone', str, 50),
+    ('website', str, 2048),
+])
+PROFILE_SCHEMA.register('experience', [
+    ('current_position', str, 300),
+    ('current_company', str, 300),
+    ('employment_duration', str, 100),
+    *_numbered('experience', 5, ['title', 'company', 'duration', 'location']),
+    ('total_experience_count', int),
+])
+PROFILE_SCHEMA.register('education', [
+    *_numbered('education', 3, ['school', 'degree', 'field', 'years']),
+    ('total_education_count', int),
+])
+PROFILE_SCHEMA.register('skills', [
+    ('skills_list', str, 2000),
+    ('skills_count', int),
+    *[(f"skill_{i}", str, 200) for i in range(1, 6)],
+])
+PROFILE_SCHEMA.register('certifications', [
+    ('certifications', str, 2000),
+    ('certifications_count', int),
+])
+PROFILE_SCHEMA.register('languages', [
+    ('languages', str, 1000),
+    ('languages_count', int),
+])
+PROFILE_SCHEMA.register('volunteer', [
+    ('volunteer_experience', str, 2000),
+    ('volunteer_count', int),
+])
+PROFILE_SCHEMA.register('publications_projects', [
+    ('publications', str, 2000),
+    ('publications_count', int),
+    ('projects', str, 2000),
+    ('projects_count', int),
+])
+PROFILE_SCHEMA.register('profile_metrics', [
+    ('followers', str, 100),
+    ('activity_posts', str, 100),
+    ('profile_completeness_indicators', dict),
+])
+PROFILE_SCHEMA.register('scrape', [
+    ('profile_url', str, 2048),
+    ('extraction_method', str, 50),
+    ('extraction_status', str, 50),
+    ('partial_extractors', str, 500),
+    ('scraped_at', str, 20),
+])
+PROFILE_SCHEMA.register('entities', [
+    ('current_company_id', str, 20),
+    *[(f"experience_{i}_company_id", str, 20) for i in range(1, 6)],
+    *[(f"education_{i}_school_id", str, 20) for i in range(1, 4)],
+])
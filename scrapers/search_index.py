@@ -0,0 +1,377 @@
+"""
+On-disk inverted index over scraped profiles.
+
+Text fields of every profile in data/output are tokenized into a SQLite
+positional index (term -> field -> profile -> positions). Adjacent word pairs
+are indexed as terms too, so a two-word phrase is one posting lookup and longer
+phrases only check positions on profiles holding all their pairs. `update` only reads
+output files it hasn't seen (or that changed); a profile scraped again replaces
+its older version. Queries combine keywords, quoted phrases, field filters and
+exclusions, all ANDed:
+
+    python -m scrapers.search_index update
+    python -m scrapers.search_index query 'python "machine learning" company:google -intern'
+    python -m scrapers.search_index query 'title:"staff engineer" skills:kubernetes'
+"""
+
+import argparse
+import logging
+import math
+import re
+import shlex
+import sqlite3
+import sys
+import time
+import unicodedata
+from array import array
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .enrichment import read_output
+
+DEFAULT_DB = 'data/search_index.db'
+OUTPUT_PATTERNS = ('*.csv', '*.csv.gz', '*.csv.zst', '*.jsonl', '*.jsonl.gz', '*.jsonl.zst')
+
+# Search field -> output columns indexed into it
+FIELDS = {
+    'name': ['name'],
+    'headline': ['headline'],
+    'about': ['about'],
+    'skills': ['skills_list'],
+    'title': ['current_position'] + [f"experience_{i}_title" for i in range(1, 6)],
+    'company': ['current_company'] + [f"experience_{i}_company" for i in range(1, 6)],
+    'certifications': ['certifications'],
+    'location': ['location'],
+}
+FIELD_IDS = {name: i for i, name in enumerate(FIELDS)}
+# Candidate sets up to this size are pushed into SQL as IN (...) lists, in chunks
+MAX_IN_DOCS = 5000
+IN_CHUNK = 500
+# Gap between concatenated columns of one field, so phrases never span two of them
+COLUMN_GAP = 16
+
+_TOKEN = re.compile(r'[a-z0-9]+[+#]*')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    doc_id INTEGER PRIMARY KEY,
+    profile_url TEXT UNIQUE NOT NULL,
+    name TEXT,
+    headline TEXT,
+    source TEXT,
+    indexed_at REAL
+);
+CREATE TABLE IF NOT EXISTS terms (
+    term_id INTEGER PRIMARY KEY,
+    term TEXT UNIQUE NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term_id INTEGER NOT NULL,
+    field_id INTEGER NOT NULL,
+    doc_id INTEGER NOT NULL,
+    tf INTEGER NOT NULL,
+    positions BLOB NOT NULL,
+    PRIMARY KEY (term_id, field_id, doc_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    rows INTEGER NOT NULL,
+    indexed_at REAL NOT NULL
+);
+"""
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercased, accent-folded word tokens; keeps 'c++' and 'c#'."""
+    if not text:
+        return []
+    text = unicodedata.normalize('NFKD', str(text))
+    text = ''.join(char for char in text if not unicodedata.combining(char)).lower()
+    return _TOKEN.findall(text)
+
+
+def _encode(positions: List[int]) -> bytes:
+    return array('I', positions).tobytes()
+
+
+def _decode(blob: bytes) -> array:
+    positions = array('I')
+    positions.frombytes(blob)
+    return positions
+
+
+def _pairs(tokens: List[str]) -> List[str]:
+    """Adjacent token pairs ("machine learning"); tokens never contain spaces."""
+    return [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+
+
+def parse_query(query: str) -> List[Tuple[Optional[str], List[str], bool]]:
+    """Split a query into (field or None, tokens, negated) clauses; quoted text is a phrase."""
+    clauses = []
+    for part in shlex.split(query):
+        negated = part.startswith('-') and len(part) > 1
+        if negated:
+            part = part[1:]
+        field = None
+        name, sep, rest = part.partition(':')
+        if sep and name.lower() in FIELDS:
+            field, part = name.lower(), rest
+        tokens = tokenize(part)
+        if tokens:
+            clauses.append((field, tokens, negated))
+    return clauses
+
+
+class SearchIndex:
+    """SQLite-backed positional inverted index over profile text fields."""
+
+    def __init__(self, path: str = DEFAULT_DB):
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.logger = logging.getLogger(__name__)
+        self._term_ids: Dict[str, int] = {}
+
+    # Indexing
+
+    def _term_id(self, term: str) -> int:
+        term_id = self._term_ids.get(term)
+        if term_id is None:
+            self.conn.execute("INSERT OR IGNORE INTO terms (term) VALUES (?)", (term,))
+            term_id = self.conn.execute("SELECT term_id FROM terms WHERE term = ?", (term,)).fetchone()[0]
+            self._term_ids[term] = term_id
+        return term_id
+
+    def add_profile(self, profile: Dict, source: str = ''):
+        """Index one profile, replacing any earlier version with the same profile_url."""
+        url = profile.get('profile_url')
+        if not url:
+            return
+        existing = self.conn.execute("SELECT doc_id FROM docs WHERE profile_url = ?", (url,)).fetchone()
+        if existing:
+            self.conn.execute("DELETE FROM postings WHERE doc_id = ?", (existing[0],))
+        cursor = self.conn.execute(
+            "INSERT OR REPLACE INTO docs (doc_id, profile_url, name, headline, source, indexed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (existing[0] if existing else None, url, profile.get('name') or '', profile.get('headline') or '',
+             source, time.time())
+        )
+        doc_id = existing[0] if existing else cursor.lastrowid
+
+        rows = []
+        for field, columns in FIELDS.items():
+            positions = defaultdict(list)
+            offset = 0
+            for column in columns:
+                tokens = tokenize(profile.get(column))
+                for position, token in enumerate(tokens, offset):
+                    positions[token].append(position)
+                for position, pair in enumerate(_pairs(tokens), offset):
+                    positions[pair].append(position)
+                offset += len(tokens) + COLUMN_GAP
+            field_id = FIELD_IDS[field]
+            rows.extend((self._term_id(term), field_id, doc_id, len(term_positions), _encode(term_positions))
+                        for term, term_positions in positions.items())
+        self.conn.executemany(
+            "INSERT INTO postings (term_id, field_id, doc_id, tf, positions) VALUES (?, ?, ?, ?, ?)", rows
+        )
+
+    def add_file(self, path: str) -> int:
+        """Index every profile in one CSV/JSONL output; returns the number of rows."""
+        df = read_output(path)
+        columns = [column for column in ['profile_url'] + [c for cs in FIELDS.values() for c in cs]
+                   if column in df.columns]
+        df = df[columns].astype('string').fillna('')
+        with self.conn:
+            for profile in df.to_dict('records'):
+                self.add_profile(profile, source=Path(path).name)
+            stat = Path(path).stat()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO files (path, mtime, size, rows, indexed_at) VALUES (?, ?, ?, ?, ?)",
+                (str(path), stat.st_mtime, stat.st_size, len(df), time.time())
+            )
+        return len(df)
+
+    def pending_files(self, output_dir: str = 'data/output') -> List[Path]:
+        """Output files not indexed yet (or changed since), oldest first so newer scrapes win."""
+        seen = {path: (mtime, size) for path, mtime, size in self.conn.execute("SELECT path, mtime, size FROM files")}
+        candidates = {path for pattern in OUTPUT_PATTERNS for path in Path(output_dir).rglob(pattern)}
+        pending = []
+        for path in candidates:
+            if '.enriched.' in path.name or '.entities.' in path.name:
+                continue
+            stat = path.stat()
+            if seen.get(str(path)) != (stat.st_mtime, stat.st_size):
+                pending.append(path)
+        return sorted(pending, key=lambda path: path.stat().st_mtime)
+
+    def update(self, output_dir: str = 'data/output') -> Tuple[int, int]:
+        """Index new or changed output files; returns (files, rows)."""
+        files = rows = 0
+        for path in self.pending_files(output_dir):
+            try:
+                rows += self.add_file(str(path))
+                files += 1
+            except Exception as e:
+                self.logger.warning(f"Skipping unreadable output {path}: {e}")
+        return files, rows
+
+    # Querying
+
+    def _lookup_term(self, term: str) -> Optional[int]:
+        row = self.conn.execute("SELECT term_id FROM terms WHERE term = ?", (term,)).fetchone()
+        return row[0] if row else None
+
+    def _select(self, columns: str, term_id: int, field: Optional[str], docs: Optional[set], tail: str = ''):
+        """Rows of one term's postings, restricted to `field` and (when small) to candidate `docs`."""
+        sql = f"SELECT {columns} FROM postings WHERE term_id = ?"
+        params = [term_id]
+        if field is not None:
+            sql += " AND field_id = ?"
+            params.append(FIELD_IDS[field])
+        if docs is None or len(docs) > MAX_IN_DOCS:
+            rows = self.conn.execute(sql + tail, params)
+            return rows if docs is None else (row for row in rows if row[0] in docs)
+        ordered = sorted(docs)
+        return (row for start in range(0, len(ordered), IN_CHUNK)
+                for row in self.conn.execute(
+                    f"{sql} AND doc_id IN ({','.join('?' * len(ordered[start:start + IN_CHUNK]))}){tail}",
+                    params + ordered[start:start + IN_CHUNK]))
+
+    def _count(self, term_id: int, field: Optional[str]) -> int:
+        sql = "SELECT COUNT(*) FROM postings WHERE term_id = ?"
+        if field is None:
+            return self.conn.execute(sql, (term_id,)).fetchone()[0]
+        return self.conn.execute(sql + " AND field_id = ?", (term_id, FIELD_IDS[field])).fetchone()[0]
+
+    def _match_clause(self, field: Optional[str], tokens: List[str], docs: Optional[set] = None) -> Dict[int, int]:
+        """doc_id -> number of matches of a term or phrase, among `docs` when given."""
+        term_ids = [self._lookup_term(term) for term in (_pairs(tokens) or tokens)]
+        if None in term_ids:
+            return {}
+        # Rarest term first, each later one only checked against the surviving docs
+        tf: Dict[int, int] = {}
+        for term_id in sorted(set(term_ids), key=lambda term_id: self._count(term_id, field)):
+            tf = {}
+            for doc_id, count in self._select('doc_id, SUM(tf)', term_id, field, docs, ' GROUP BY doc_id'):
+                tf[doc_id] = count
+            docs = set(tf)
+            if not docs:
+                return {}
+        if len(term_ids) == 1:
+            return tf
+
+        # Longer phrase: consecutive pair positions within one field, read only for surviving docs
+        positions: List[Dict[Tuple[int, int], set]] = []
+        for term_id in term_ids:
+            term_positions = {}
+            for doc_id, field_id, blob in self._select('doc_id, field_id, positions', term_id, field, docs):
+                term_positions[(doc_id, field_id)] = set(_decode(blob))
+            positions.append(term_positions)
+        matches: Dict[int, int] = defaultdict(int)
+        for (doc_id, field_id), starts in positions[0].items():
+            following = [term_positions.get((doc_id, field_id), ()) for term_positions in positions[1:]]
+            count = sum(1 for start in starts
+                        if all(start + offset in later for offset, later in enumerate(following, 1)))
+            if count:
+                matches[doc_id] += count
+        return dict(matches)
+
+    def search(self, query: str, limit: int = 20) -> List[Dict]:
+        """Profiles matching every clause of `query`, best first (tf-idf over matched clauses)."""
+        clauses = parse_query(query)
+        positive = [clause for clause in clauses if not clause[2]]
+        if not positive:
+            return []
+        total_docs = self.conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0] or 1
+
+        def selectivity(clause):
+            term_ids = [self._lookup_term(term) for term in (_pairs(clause[1]) or clause[1])]
+            return 0 if None in term_ids else min(self._count(term_id, clause[0]) for term_id in term_ids)
+
+        # Most selective clause first; later clauses only look at the docs still in play
+        scores: Optional[Dict[int, float]] = None
+        for field, tokens, _ in sorted(positive, key=selectivity):
+            matches = self._match_clause(field, tokens, None if scores is None else set(scores))
+            idf = math.log(1 + total_docs / (1 + selectivity((field, tokens, False))))
+            if scores is None:
+                scores = {doc_id: (1 + math.log(count)) * idf for doc_id, count in matches.items()}
+            else:
+                scores = {doc_id: score + (1 + math.log(matches[doc_id])) * idf
+                          for doc_id, score in scores.items() if doc_id in matches}
+            if not scores:
+                return []
+        for field, tokens, _ in (clause for clause in clauses if clause[2]):
+            for doc_id in self._match_clause(field, tokens, set(scores)):
+                scores.pop(doc_id, None)
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+        results = []
+        for doc_id, score in ranked:
+            url, name, headline, source = self.conn.execute(
+                "SELECT profile_url, name, headline, source FROM docs WHERE doc_id = ?", (doc_id,)
+            ).fetchone()
+            results.append({'profile_url': url, 'name': name, 'headline': headline, 'source': source,
+                            'score': round(score, 3)})
+        return results
+
+    def stats(self) -> Dict:
+        tables = {'profiles': 'docs', 'terms': 'terms', 'postings': 'postings', 'files': 'files'}
+        return {name: self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for name, table in tables.items()}
+
+    def close(self):
+        self.conn.close()
+
+
+def index_from_config(config: Dict) -> Optional[SearchIndex]:
+    """Open the index from the 'search' config section, or None when disabled."""
+    search_config = config.get('search', {})
+    if not search_config.get('enabled', False):
+        return None
+    return SearchIndex(search_config.get('path', DEFAULT_DB))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build and query the local profile search index.')
+    parser.add_argument('--db', default=DEFAULT_DB)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    update = subparsers.add_parser('update', help='Index new or changed output files')
+    update.add_argument('--output-dir', default='data/output')
+    query = subparsers.add_parser('query', help=f"Search; fields: {', '.join(FIELDS)}")
+    query.add_argument('query')
+    query.add_argument('--limit', type=int, default=20)
+    subparsers.add_parser('stats')
+    args = parser.parse_args(argv)
+
+    index = SearchIndex(args.db)
+    try:
+        if args.command == 'update':
+            started = time.monotonic()
+            files, rows = index.update(args.output_dir)
+            print(f"✅ Indexed {rows} rows from {files} new files in {time.monotonic() - started:.1f}s")
+            return 0
+        if args.command == 'stats':
+            print('   '.join(f"{name}: {value}" for name, value in index.stats().items()))
+            return 0
+
+        started = time.monotonic()
+        results = index.search(args.query, args.limit)
+        elapsed_ms = (time.monotonic() - started) * 1000
+        for i, result in enumerate(results, 1):
+            print(f"{i:>3}. {result['name'] or '(no name)'} — {result['headline'][:70]}")
+            print(f"     {result['profile_url']}  (score {result['score']})")
+        print(f"🔎 {len(results)} results in {elapsed_ms:.1f} ms")
+        return 0 if results else 1
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
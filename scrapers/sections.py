@@ -0,0 +1,159 @@
+import json
+import re
+from typing import Dict, List, Optional
+
+import soupsieve
+from bs4.element import Tag
+
+# Runs in the page and returns only the section fragments plus title and meta tags
+_CAPTURE_TEMPLATE = """
+var selectors = %s;
+var seen = [];
+var sections = [];
+Object.keys(selectors).forEach(function (name) {
+    selectors[name].forEach(function (selector) {
+        var nodes;
+        try { nodes = document.querySelectorAll(selector); } catch (e) { return; }
+        nodes.forEach(function (node) {
+            var root = node.closest('section') || node;
+            for (var i = 0; i < seen.length; i++) {
+                if (seen[i] === root || seen[i].contains(root)) { return; }
+            }
+            seen = seen.filter(function (other) { return !root.contains(other); });
+            seen.push(root);
+        });
+    });
+});
+seen.sort(function (a, b) {
+    return a.compareDocumentPosition(b) & Node.DOCUMENT_POSITION_FOLLOWING ? -1 : 1;
+});
+seen.forEach(function (node) { sections.push(node.outerHTML); });
+var metas = [];
+document.querySelectorAll('meta[property], meta[name]').forEach(function (meta) {
+    metas.push(meta.outerHTML);
+});
+return {title: document.title, metas: metas, sections: sections};
+"""
+
+
+def build_capture_script(selectors: Dict[str, List[str]]) -> str:
+    """Build the JS snippet that returns only the profile section fragments.
+
+    `selectors` maps section names to root selectors (the "sections" block of
+    selectors.json); each match is widened to its enclosing <section>.
+    """
+    return _CAPTURE_TEMPLATE % json.dumps(selectors)
+
+
+def assemble_sections_html(capture: Dict) -> str:
+    """Stitch captured fragments back into a small standalone HTML document.
+
+    The fragments go straight into <body>: positional selectors such as
+    'main section:first-of-type' must not match whichever fragment came first.
+    """
+    title = (capture.get('title') or '').replace('<', '&lt;')
+    head = f"<title>{title}</title>" + ''.join(capture.get('metas') or [])
+    body = ''.join(capture.get('sections') or [])
+    return f"<html><head>{head}</head><body>{body}</body></html>"
+
+
+_ID_SELECTOR = re.compile(r'^#([\w-]+)$')
+_FIELD_SELECTOR = re.compile(r'^\[data-field="([\w-]+)"\]$')
+_CLASS_SELECTOR = re.compile(r'^(?:\.[\w-]+)+$')
+
+
+class SectionMatcher:
+    """
+    Section root selectors compiled into per-tag lookup tables.
+
+    Simple id / data-field / class selectors are matched in a single walk over
+    the document; anything else falls back to a precompiled soupsieve pattern.
+    """
+
+    def __init__(self, selectors: Dict[str, List[str]]):
+        self.by_id, self.by_field, self.by_class, self.complex = {}, {}, {}, []
+        for name, section_selectors in selectors.items():
+            for priority, selector in enumerate(section_selectors):
+                id_match = _ID_SELECTOR.match(selector)
+                field_match = _FIELD_SELECTOR.match(selector)
+                if id_match:
+                    self.by_id.setdefault(id_match.group(1), []).append((name, priority))
+                elif field_match:
+                    self.by_field.setdefault(field_match.group(1), []).append((name, priority))
+                elif _CLASS_SELECTOR.match(selector):
+                    classes = selector[1:].split('.')
+                    self.by_class.setdefault(classes[0], []).append((name, priority, frozenset(classes[1:])))
+                else:
+                    self.complex.append((name, priority, soupsieve.compile(selector)))
+
+    def index(self, soup) -> 'SectionIndex':
+        """Locate every section root in one pass over `soup`."""
+        found = {}
+
+        def consider(name, priority, tag):
+            best = found.get(name)
+            if best is None or priority < best[0]:
+                found[name] = (priority, tag)
+
+        by_id, by_field, by_class = self.by_id, self.by_field, self.by_class
+        for tag in soup.find_all(True):
+            tag_id = tag.get('id')
+            if tag_id in by_id:
+                for name, priority in by_id[tag_id]:
+                    consider(name, priority, tag)
+            field = tag.get('data-field')
+            if field in by_field:
+                for name, priority in by_field[field]:
+                    consider(name, priority, tag)
+            tag_classes = tag.get('class')
+            if tag_classes:
+                for css_class in tag_classes:
+                    for name, priority, others in by_class.get(css_class, ()):
+                        if others.issubset(tag_classes):
+                            consider(name, priority, tag)
+
+        for name, priority, pattern in self.complex:
+            if name in found and found[name][0] < priority:
+                continue
+            tag = pattern.select_one(soup)
+            if tag is not None:
+                consider(name, priority, tag)
+
+        roots = {}
+        for name, (_, tag) in found.items():
+            roots[name] = tag if tag.name == 'section' else (tag.find_parent('section') or tag)
+        return SectionIndex(roots)
+
+
+class SectionIndex:
+    """
+    Roots of the profile sections present in a parsed page.
+
+    Extractors query only their section's subtree instead of the whole document,
+    and completeness flags come from which sections actually exist.
+    """
+
+    def __init__(self, roots: Dict[str, Tag]):
+        self._roots = roots
+
+    @classmethod
+    def build(cls, soup, selectors: Dict[str, List[str]]) -> 'SectionIndex':
+        """One-off index; prefer reusing a SectionMatcher across pages."""
+        return SectionMatcher(selectors).index(soup)
+
+    def root(self, name: str) -> Optional[Tag]:
+        return self._roots.get(name)
+
+    def has(self, name: str) -> bool:
+        return name in self._roots
+
+    def scope(self, *names: str, default=None):
+        """Subtree of the first present section in `names`, else `default`."""
+        for name in names:
+            root = self._roots.get(name)
+            if root is not None:
+                return root
+        return default
+
+    def present(self) -> List[str]:
+        return sorted(self._roots)
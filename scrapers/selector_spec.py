@@ -0,0 +1,201 @@
+"""
+Declarative selector spec (selectors.json) compiled into cached matchers.
+
+The spec holds the section roots, the selector chains for single fields and
+the item/field mappings for repeated entries. It is validated and compiled
+once; the compiled form is pickled under the spec's hash (plus the cache
+format and soupsieve version) so later startups skip compilation, and
+reload_if_changed() swaps in an edited spec without a restart.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+from pathlib import Path
+from typing import Dict, Tuple
+
+import soupsieve
+
+from .sections import SectionMatcher
+
+# Bump whenever CompiledSelectors (or what it pickles) changes shape
+CACHE_FORMAT = 2
+
+REQUIRED_SECTIONS = ('top_card', 'about', 'experience', 'education', 'skills')
+REQUIRED_CHAINS = (
+    'name', 'headline', 'location', 'about', 'connections', 'profile_picture', 'website',
+    'current_position', 'current_company', 'employment_duration',
+    'skills', 'certifications', 'languages', 'publications', 'projects',
+    'followers', 'activity_posts',
+)
+REQUIRED_LISTS = {
+    'experience': ('job_title', 'company', 'duration', 'job_location'),
+    'education': ('school', 'degree', 'field', 'years'),
+    'volunteer': ('title', 'organization'),
+}
+
+
+class SelectorSpecError(ValueError):
+    """Raised when a selector spec is malformed or a selector does not compile."""
+
+
+def validate_spec(spec: Dict):
+    """Check the spec's structure and that every selector compiles."""
+    if not isinstance(spec, dict):
+        raise SelectorSpecError("Selector spec must be a JSON object")
+    if not isinstance(spec.get('version'), int):
+        raise SelectorSpecError("Selector spec needs an integer 'version'")
+
+    def check(selector, where):
+        if not isinstance(selector, str) or not selector.strip():
+            raise SelectorSpecError(f"{where}: selector must be a non-empty string")
+        try:
+            soupsieve.compile(selector)
+        except Exception as e:
+            raise SelectorSpecError(f"{where}: invalid selector {selector!r}: {e}")
+
+    def check_chain(chain, where):
+        if not isinstance(chain, list) or not chain:
+            raise SelectorSpecError(f"{where}: expected a non-empty list of selectors")
+        for selector in chain:
+            check(selector, where)
+
+    sections = spec.get('sections', {})
+    chains = spec.get('chains', {})
+    lists = spec.get('lists', {})
+    for name in REQUIRED_SECTIONS:
+        if name not in sections:
+            raise SelectorSpecError(f"Missing section: {name}")
+    for name, chain in sections.items():
+        check_chain(chain, f"sections.{name}")
+    for name in REQUIRED_CHAINS:
+        if name not in chains:
+            raise SelectorSpecError(f"Missing chain: {name}")
+    for name, chain in chains.items():
+        check_chain(chain, f"chains.{name}")
+    for name, fields in REQUIRED_LISTS.items():
+        mapping = lists.get(name)
+        if not isinstance(mapping, dict):
+            raise SelectorSpecError(f"Missing list: {name}")
+        check(mapping.get('items'), f"lists.{name}.items")
+        for field in fields:
+            check(mapping.get('fields', {}).get(field), f"lists.{name}.fields.{field}")
+
+
+def cache_key(spec_hash: str) -> str:
+    """Pickle cache key: a changed spec, cache format or soupsieve release gets a new file."""
+    key = f"{CACHE_FORMAT}:{soupsieve.__version__}:{spec_hash}"
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]
+
+
+class CompiledSelectors:
+    """Matcher structures built from a validated spec (picklable)."""
+
+    def __init__(self, spec: Dict, spec_hash: str):
+        self.version = spec['version']
+        self.spec_hash = spec_hash
+        self.cache_format = CACHE_FORMAT
+        self.sections = {name: list(chain) for name, chain in spec['sections'].items()}
+        self.section_matcher = SectionMatcher(self.sections)
+        self.chains = {
+            name: tuple(soupsieve.compile(selector) for selector in chain)
+            for name, chain in spec['chains'].items()
+        }
+        self.lists = {
+            name: (
+                soupsieve.compile(mapping['items']),
+                {field: soupsieve.compile(selector) for field, selector in mapping['fields'].items()},
+            )
+            for name, mapping in spec['lists'].items()
+        }
+
+
+class SelectorSpec:
+    """Loads, caches and hot-reloads the compiled selector spec."""
+
+    def __init__(self, path: str = 'selectors.json', cache_dir: str = 'data/cache'):
+        self.path = Path(path)
+        self.cache_dir = Path(cache_dir)
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._mtime = None
+        self.compiled: CompiledSelectors = self._load()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'SelectorSpec':
+        selector_config = config.get('selectors', {})
+        return cls(selector_config.get('path', 'selectors.json'), selector_config.get('cache_dir', 'data/cache'))
+
+    def _load(self) -> CompiledSelectors:
+        raw = self.path.read_bytes()
+        self._mtime = os.stat(self.path).st_mtime_ns
+        spec_hash = hashlib.sha256(raw).hexdigest()
+        cache_file = self.cache_dir / f"selectors-{cache_key(spec_hash)}.pickle"
+
+        try:
+            with open(cache_file, 'rb') as f:
+                compiled = pickle.load(f)
+            if (isinstance(compiled, CompiledSelectors) and compiled.spec_hash == spec_hash
+                    and getattr(compiled, 'cache_format', None) == CACHE_FORMAT):
+                self.logger.debug(f"Loaded compiled selectors v{compiled.version} from {cache_file}")
+                return compiled
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable selector cache {cache_file}: {e}")
+
+        try:
+            spec = json.loads(raw.decode('utf-8'))
+        except ValueError as e:
+            raise SelectorSpecError(f"{self.path} is not valid JSON: {e}")
+        validate_spec(spec)
+        compiled = CompiledSelectors(spec, spec_hash)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix('.tmp')
+            with open(tmp_file, 'wb') as f:
+                pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            self.logger.warning(f"Could not cache compiled selectors: {e}")
+        self.logger.info(f"Compiled selector spec v{compiled.version} ({spec_hash[:12]})")
+        return compiled
+
+    def reload_if_changed(self) -> bool:
+        """Recompile if the spec file changed on disk; a bad edit keeps the current spec."""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return False
+        if mtime == self._mtime:
+            return False
+        with self._lock:
+            if mtime == self._mtime:
+                return False
+            previous = self.compiled
+            try:
+                self.compiled = self._load()
+            except (SelectorSpecError, OSError) as e:
+                self._mtime = mtime
+                self.logger.error(f"Keeping selector spec v{previous.version}, reload failed: {e}")
+                return False
+        self.logger.info(f"Reloaded selector spec v{previous.version} -> v{self.compiled.version}")
+        return True
+
+    @property
+    def version(self) -> int:
+        return self.compiled.version
+
+    @property
+    def sections(self) -> Dict:
+        return self.compiled.sections
+
+    def chain(self, name: str) -> Tuple:
+        return self.compiled.chains[name]
+
+    def item_list(self, name: str):
+        """(items pattern, {field: pattern}) for a repeated-entry list."""
+        return self.compiled.lists[name]
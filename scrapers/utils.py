@@ -1,24 +1,81 @@
+import atexit
 import logging
+import logging.handlers
 import json
 import os
+import queue
 import random
+import signal
+import threading
 import time
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 from dotenv import load_dotenv
 
-def setup_logging(level=logging.INFO):
-    """Setup logging configuration."""
-    logging.basicConfig(
-        level=level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('scraper.log'),
-            logging.StreamHandler()
-        ]
-    )
+# LogRecord attributes that are not structured event fields
+_STANDARD_LOG_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line, including `extra` event fields."""
+    
+    def format(self, record):
+        event = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_LOG_ATTRS and not key.startswith('_'):
+                event[key] = value
+        if record.exc_info:
+            event['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(event, default=str, ensure_ascii=False)
+
+_log_listener = None
+
+def setup_logging(level=logging.INFO, log_file='scraper.log', max_bytes=10 * 1024 * 1024, backup_count=5):
+    """Setup non-blocking logging: callers only enqueue, a background thread writes.
+    
+    The log file gets structured JSON lines and rotates by size; the console
+    keeps the human-readable format.
+    """
+    global _log_listener
+    if _log_listener is None:
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'
+        )
+        file_handler.setFormatter(JsonFormatter())
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+        
+        log_queue = queue.SimpleQueue()
+        _log_listener = logging.handlers.QueueListener(
+            log_queue, file_handler, console_handler, respect_handler_level=True
+        )
+        _log_listener.start()
+        atexit.register(_log_listener.stop)
+        
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(logging.handlers.QueueHandler(log_queue))
+    logging.getLogger().setLevel(level)
     return logging.getLogger(__name__)
 
+def log_event(logger, event, level=logging.INFO, **fields):
+    """Log a structured event; fields become JSON keys in the log file.
+    
+    Fields named like a LogRecord attribute ('thread', 'name', 'msg', ...) are
+    stored as 'field_<name>', since logging refuses to overwrite those.
+    """
+    summary = ' '.join(f"{key}={value}" for key, value in fields.items() if value not in (None, ''))
+    extra = {(f"field_{key}" if key in _STANDARD_LOG_ATTRS else key): value for key, value in fields.items()}
+    extra['event'] = event
+    logger.log(level, f"{event} {summary}".strip(), extra=extra)
+
 def load_config(config_file='config.json'):
     """Load configuration from JSON file."""
     try:
@@ -60,6 +117,40 @@ def random_delay(min_delay=1, max_delay=5):
     delay = random.uniform(min_delay, max_delay)
     time.sleep(delay)
 
+class TimeBudgetExceeded(BaseException):
+    """Raised inside a block that ran past its time budget.
+    
+    A BaseException, so the `except Exception` fallbacks inside extractors
+    don't swallow it and carry on past the budget.
+    """
+
+def budgets_interrupt():
+    """Whether time_budget can interrupt a block here (SIGALRM: Unix, main thread only)."""
+    return hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread()
+
+@contextmanager
+def time_budget(seconds):
+    """Interrupt the enclosed block with TimeBudgetExceeded after `seconds`.
+    
+    Uses SIGALRM, so it only interrupts on Unix in the main thread; elsewhere
+    (see budgets_interrupt) the block runs unbounded and callers should
+    compare elapsed time instead.
+    """
+    if not seconds or seconds <= 0 or not budgets_interrupt():
+        yield
+        return
+    
+    def on_timeout(signum, frame):
+        raise TimeBudgetExceeded(f"Exceeded time budget of {seconds:.2f}s")
+    
+    previous_handler = signal.signal(signal.SIGALRM, on_timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
 def sanitize_filename(filename):
     """Sanitize filename for safe file creation."""
     invalid_chars = '<>:"/\\|?*'
@@ -73,6 +164,13 @@ def extract_linkedin_username(url):
         return url.split('/in/')[-1].split('/')[0]
     return None
 
+def rewrite_profile_url(url, base_url):
+    """Point a LinkedIn profile URL at another host, e.g. the local fixture server."""
+    username = extract_linkedin_username(url)
+    if not username:
+        return url
+    return f"{base_url.rstrip('/')}/in/{username}/"
+
 def validate_linkedin_url(url):
     """Validate if URL is a proper LinkedIn profile URL."""
     linkedin_patterns = [
@@ -120,6 +218,60 @@ class RateLimiter:
         
         self.requests.append(now)
 
+class RunSummary:
+    """Per-run counters: outcomes, total and per-phase durations."""
+    
+    def __init__(self, run_id=None):
+        self.run_id = run_id or datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.started = time.time()
+        self.outcomes = {}
+        self.phase_totals = {}
+        self.phase_counts = {}
+        self.profiles = 0
+        self.retries = 0
+        self.failed_urls = []
+        # Per-field fill rates from the quality monitor, when it ran
+        self.fill_rates = {}
+    
+    def record(self, url, outcome, duration, attempts=1, **phases):
+        """Count one profile (after any retries); `phases` are per-phase durations in seconds."""
+        self.profiles += 1
+        self.retries += max(0, attempts - 1)
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        for phase, seconds in dict(phases, total=duration).items():
+            if seconds is None:
+                continue
+            self.phase_totals[phase] = self.phase_totals.get(phase, 0.0) + seconds
+            self.phase_counts[phase] = self.phase_counts.get(phase, 0) + 1
+        if outcome in ('error', 'timeout', 'driver_crash'):
+            self.failed_urls.append(url)
+    
+    def as_dict(self):
+        elapsed = time.time() - self.started
+        summary = {
+            'run_id': self.run_id,
+            'elapsed_seconds': round(elapsed, 2),
+            'profiles': self.profiles,
+            'profiles_per_hour': round(self.profiles * 3600 / elapsed, 1) if elapsed > 0 else 0.0,
+            'retries': self.retries,
+            'outcomes': dict(self.outcomes),
+            'rates': {
+                outcome: round(count / self.profiles, 4) for outcome, count in self.outcomes.items()
+            } if self.profiles else {},
+            'failed_urls': list(self.failed_urls),
+        }
+        if self.fill_rates:
+            summary['fill_rates'] = dict(self.fill_rates)
+        for phase, total in self.phase_totals.items():
+            summary[f"mean_{phase}_seconds"] = round(total / self.phase_counts[phase], 3)
+        return summary
+    
+    def emit(self, logger):
+        """Log the summary as a single 'run_summary' event."""
+        summary = self.as_dict()
+        log_event(logger, 'run_summary', **summary)
+        return summary
+
 def create_sample_urls_file():
     """Create a sample profile URLs file with random LinkedIn profiles."""
     sample_urls = [
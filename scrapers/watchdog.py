@@ -0,0 +1,262 @@
+"""
+Browser health checks and recycling for long runs.
+
+Between profiles the watchdog checks that the driver still answers a trivial
+script within a few seconds and measures the resident memory of the
+chromedriver / Chrome process tree. A dead or hung browser, one past the
+memory limit, or one past its navigation budget is shut down (leftover
+processes killed) and restarted on the same persisted profile directory, so
+the LinkedIn session survives the restart. A profile lost to a crash is
+requeued once at the back of the batch.
+
+psutil is used for the process tree and RSS when installed; otherwise /proc
+is read directly (Linux). Without either, memory-based recycling is off.
+"""
+
+import logging
+import os
+import signal
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+    psutil = None
+
+# Final outcomes that point at the browser rather than the profile
+REQUEUE_OUTCOMES = frozenset({'driver_crash', 'timeout'})
+# Chrome's profile lock files; stale after a crash
+SINGLETON_FILES = ('SingletonLock', 'SingletonSocket', 'SingletonCookie')
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+@dataclass(frozen=True)
+class DriverHealth:
+    """Result of one watchdog check."""
+    healthy: bool
+    reason: str
+    rss_mb: Optional[float] = None
+
+
+def _proc_children() -> Dict[int, List[int]]:
+    """Parent pid -> child pids, from /proc/<pid>/stat."""
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", 'rb') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name may contain spaces and parentheses; state and ppid follow the last ')'
+        ppid = int(stat[stat.rindex(b')') + 2:].split()[1])
+        children.setdefault(ppid, []).append(int(entry))
+    return children
+
+
+def process_tree(root_pid: int) -> List[int]:
+    """`root_pid` and all its live descendants."""
+    if PSUTIL_AVAILABLE:
+        try:
+            root = psutil.Process(root_pid)
+            return [root_pid] + [child.pid for child in root.children(recursive=True)]
+        except psutil.Error:
+            return []
+    if not os.path.isdir('/proc'):
+        return [root_pid]
+    if not os.path.exists(f"/proc/{root_pid}"):
+        return []
+    children = _proc_children()
+    pids, stack = [], [root_pid]
+    while stack:
+        pid = stack.pop()
+        pids.append(pid)
+        stack.extend(children.get(pid, ()))
+    return pids
+
+
+def driver_pids(driver) -> List[int]:
+    """chromedriver and browser processes behind a Selenium / undetected_chromedriver session."""
+    roots = []
+    service_process = getattr(getattr(driver, 'service', None), 'process', None)
+    if service_process is not None:
+        roots.append(service_process.pid)
+    # undetected_chromedriver starts the browser itself rather than through chromedriver
+    browser_pid = getattr(driver, 'browser_pid', None)
+    if browser_pid:
+        roots.append(browser_pid)
+    pids = []
+    for root in roots:
+        pids.extend(pid for pid in process_tree(root) if pid not in pids)
+    return pids
+
+
+def rss_bytes(pids: List[int]) -> Optional[int]:
+    """Total resident memory of `pids`, or None when it can't be measured here."""
+    total = 0
+    if PSUTIL_AVAILABLE:
+        for pid in pids:
+            try:
+                total += psutil.Process(pid).memory_info().rss
+            except psutil.Error:
+                pass
+        return total
+    if not os.path.isdir('/proc'):
+        return None
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/statm", 'r') as f:
+                total += int(f.read().split()[1]) * _PAGE_SIZE
+        except (OSError, ValueError, IndexError):
+            pass
+    return total
+
+
+def _alive(pid: int) -> bool:
+    if PSUTIL_AVAILABLE:
+        try:
+            return psutil.Process(pid).status() != psutil.STATUS_ZOMBIE
+        except psutil.Error:
+            return False
+    if os.path.isdir('/proc'):
+        # Exited children we never reaped (e.g. a browser we launched) linger as zombies
+        try:
+            with open(f"/proc/{pid}/stat", 'rb') as f:
+                stat = f.read()
+        except OSError:
+            return False
+        return stat[stat.rindex(b')') + 2:stat.rindex(b')') + 3] != b'Z'
+    try:
+        os.kill(pid, 0)
+    except OSError:
+        return False
+    return True
+
+
+def terminate(pids: List[int], timeout: float = 5.0) -> List[int]:
+    """SIGTERM `pids`, SIGKILL whatever is left after `timeout`; returns pids still alive."""
+    for sig in (signal.SIGTERM, getattr(signal, 'SIGKILL', signal.SIGTERM)):
+        for pid in pids:
+            try:
+                os.kill(pid, sig)
+            except OSError:
+                pass
+        deadline = time.monotonic() + timeout
+        while pids and time.monotonic() < deadline:
+            pids = [pid for pid in pids if _alive(pid)]
+            if pids:
+                time.sleep(0.1)
+        if not pids:
+            break
+    return pids
+
+
+def call_with_timeout(func, timeout: float):
+    """Run `func` on a helper thread; raises TimeoutError if it doesn't return in time.
+
+    Driver calls against a hung renderer block until the HTTP timeout, and
+    SIGALRM budgets only work on the main thread, so the probe can't use them.
+    """
+    outcome = {}
+
+    def target():
+        try:
+            outcome['value'] = func()
+        except BaseException as e:
+            outcome['error'] = e
+
+    thread = threading.Thread(target=target, name='driver-probe', daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise TimeoutError(f"no answer within {timeout:.0f}s")
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome.get('value')
+
+
+def release_driver(driver, profile_dir: Optional[str] = None, timeout: float = 10.0):
+    """Quit a possibly dead or hung driver and make sure none of its processes survive.
+
+    Once every process is gone, Chrome's lock files are removed from
+    `profile_dir` so the next browser can open the same profile.
+    """
+    logger = logging.getLogger(__name__)
+    pids = driver_pids(driver)
+    try:
+        call_with_timeout(driver.quit, timeout)
+    except Exception as e:
+        logger.warning(f"Driver did not quit cleanly: {e}")
+    survivors = terminate([pid for pid in pids if _alive(pid)])
+    if survivors:
+        logger.error(f"Browser processes still running after kill: {survivors}")
+        return
+    if profile_dir:
+        for name in SINGLETON_FILES:
+            try:
+                os.unlink(Path(profile_dir) / name)
+            except OSError:
+                pass
+
+
+class DriverWatchdog:
+    """Decides between profiles whether the browser should be restarted."""
+
+    def __init__(self, max_rss_mb: float = 1500, recycle_after: int = 0, probe_timeout: float = 10.0):
+        self.max_rss_mb = max_rss_mb
+        self.recycle_after = recycle_after
+        self.probe_timeout = probe_timeout
+        self.navigations = 0
+        self.peak_rss_mb = 0.0
+        self.restarts: Dict[str, int] = {}
+
+    @classmethod
+    def from_config(cls, config: Dict) -> Optional['DriverWatchdog']:
+        """Create the watchdog from the 'watchdog' config section, or None when disabled."""
+        watchdog_config = config.get('watchdog', {})
+        if not watchdog_config.get('enabled', False):
+            return None
+        return cls(
+            max_rss_mb=watchdog_config.get('max_rss_mb', 1500),
+            recycle_after=watchdog_config.get('recycle_after_profiles', 0),
+            probe_timeout=watchdog_config.get('probe_timeout_seconds', 10.0)
+        )
+
+    def check(self, driver) -> DriverHealth:
+        """Probe the driver, then compare memory and navigation count with the limits."""
+        if driver is None:
+            return DriverHealth(False, 'no_driver')
+        try:
+            call_with_timeout(lambda: driver.execute_script('return document.readyState'), self.probe_timeout)
+        except TimeoutError:
+            return DriverHealth(False, 'hung')
+        except Exception:
+            return DriverHealth(False, 'crashed')
+
+        rss = rss_bytes(driver_pids(driver))
+        rss_mb = round(rss / (1024 * 1024), 1) if rss is not None else None
+        if rss_mb is not None:
+            self.peak_rss_mb = max(self.peak_rss_mb, rss_mb)
+            if self.max_rss_mb and rss_mb > self.max_rss_mb:
+                return DriverHealth(False, 'memory', rss_mb)
+        if self.recycle_after and self.navigations >= self.recycle_after:
+            return DriverHealth(False, 'recycle', rss_mb)
+        return DriverHealth(True, 'ok', rss_mb)
+
+    def navigated(self):
+        self.navigations += 1
+
+    def restarted(self, reason: str):
+        self.navigations = 0
+        self.restarts[reason] = self.restarts.get(reason, 0) + 1
+
+    def as_dict(self) -> Dict:
+        return {'restarts': dict(self.restarts), 'peak_rss_mb': self.peak_rss_mb}
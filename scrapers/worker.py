@@ -0,0 +1,248 @@
+"""
+Background scrape worker for the web service.
+
+A single thread owns the LinkedInScraper (and so the one browser session):
+jobs are queued in submission order and each one is drained through
+scrape_profiles(), with finished profiles appended to the job as they arrive
+so HTTP handlers can report progress and stream results.
+"""
+
+import json
+import logging
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .linkedin_scraper import LinkedInScraper
+from .utils import budgets_interrupt, log_event
+from .writers import JsonlStreamWriter
+
+JOB_STATUSES = ('queued', 'running', 'done', 'failed', 'cancelled')
+
+
+class ScrapeJob:
+    """A batch of profile URLs and the results streamed back from the worker."""
+
+    def __init__(self, urls: List[str]):
+        self.id = uuid.uuid4().hex[:12]
+        self.urls = list(urls)
+        self.status = 'queued'
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.attempted = 0
+        self.results: List[Dict] = []
+        self.output_path = None
+        self._changed = threading.Condition()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ('done', 'failed', 'cancelled')
+
+    def _update(self, **fields):
+        with self._changed:
+            for name, value in fields.items():
+                setattr(self, name, value)
+            self._changed.notify_all()
+
+    def add_result(self, profile: Dict):
+        with self._changed:
+            self.results.append(profile)
+            self._changed.notify_all()
+
+    def wait_for_results(self, start: int, timeout: float) -> Tuple[List[Dict], bool]:
+        """Results from index `start` on, blocking up to `timeout` while none are new.
+
+        Returns (new results, finished); a finished job with nothing new ends a stream.
+        """
+        with self._changed:
+            if len(self.results) <= start and not self.finished:
+                self._changed.wait(timeout)
+            return self.results[start:], self.finished
+
+    def as_dict(self, include_results: bool = False) -> Dict:
+        data = {
+            'id': self.id,
+            'status': self.status,
+            'error': self.error,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'progress': {
+                'total': len(self.urls),
+                'attempted': self.attempted,
+                'completed': len(self.results),
+            },
+            'output_path': self.output_path,
+        }
+        if include_results:
+            data['results'] = list(self.results)
+        return data
+
+
+class ScrapeWorker:
+    """Runs queued ScrapeJobs one at a time on a single long-lived scraper."""
+
+    def __init__(self, config: Dict, max_jobs_kept: int = 100, output_dir: Optional[str] = 'data/output/jobs'):
+        self.config = config
+        self.max_jobs_kept = max_jobs_kept
+        self.output_dir = output_dir
+        self.logger = logging.getLogger(__name__)
+        self.scraper: Optional[LinkedInScraper] = None
+        self._jobs: Dict[str, ScrapeJob] = {}
+        self._jobs_lock = threading.Lock()
+        self._queue: 'queue.Queue[Optional[ScrapeJob]]' = queue.Queue()
+        self._thread = None
+        self._running = False
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'ScrapeWorker':
+        web_config = config.get('web', {})
+        return cls(
+            config,
+            max_jobs_kept=web_config.get('max_jobs_kept', 100),
+            output_dir=web_config.get('output_dir', 'data/output/jobs')
+        )
+
+    def start(self) -> 'ScrapeWorker':
+        if self._thread is None:
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name='scrape-worker', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        """Finish the current job, then release the browser."""
+        self._running = False
+        self._queue.put(None)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, urls: List[str]) -> ScrapeJob:
+        job = ScrapeJob(urls)
+        with self._jobs_lock:
+            self._jobs[job.id] = job
+            self._forget_old_jobs()
+        self._queue.put(job)
+        log_event(self.logger, 'job_queued', job_id=job.id, urls=len(job.urls))
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job that has not started yet."""
+        job = self.get(job_id)
+        if job is None or job.status != 'queued':
+            return False
+        job._update(status='cancelled', finished_at=time.time())
+        return True
+
+    def get(self, job_id: str) -> Optional[ScrapeJob]:
+        with self._jobs_lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[ScrapeJob]:
+        with self._jobs_lock:
+            return sorted(self._jobs.values(), key=lambda job: job.created_at, reverse=True)
+
+    def queue_depth(self) -> int:
+        return sum(1 for job in self.jobs() if job.status == 'queued')
+
+    def _forget_old_jobs(self):
+        finished = [job for job in self._jobs.values() if job.finished]
+        finished.sort(key=lambda job: job.finished_at or 0)
+        for job in finished[:max(0, len(self._jobs) - self.max_jobs_kept)]:
+            del self._jobs[job.id]
+
+    def _run(self):
+        scraping_config = self.config.get('scraping', {})
+        if not budgets_interrupt() and (scraping_config.get('extractor_budget_seconds', 2.0)
+                                         or scraping_config.get('profile_budget_seconds', 10.0)):
+            # Hung extractors can't be interrupted here; they are only abandoned once they return
+            log_event(self.logger, 'time_budgets_not_interrupting', logging.WARNING,
+                      worker_thread=threading.current_thread().name,
+                      detail='extraction budgets are enforced between steps only')
+        try:
+            while self._running:
+                job = self._queue.get()
+                if job is None:
+                    break
+                if job.status != 'queued':
+                    continue
+                self._run_job(job)
+        finally:
+            if self.scraper is not None:
+                self.scraper.cleanup()
+                self.scraper = None
+
+    def _run_job(self, job: ScrapeJob):
+        job._update(status='running', started_at=time.time())
+        log_event(self.logger, 'job_start', job_id=job.id, urls=len(job.urls))
+        writer = None
+        try:
+            if self.scraper is None:
+                # Created on first use, then reused so later jobs skip driver startup and login
+                self.scraper = LinkedInScraper(self.config)
+            if self.output_dir:
+                output_config = self.config.get('output', {})
+                stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+                writer = JsonlStreamWriter(
+                    f"{self.output_dir}/job_{stamp}_{job.id}.jsonl",
+                    compression=output_config.get('compression', 'none'),
+                    batch_size=1
+                )
+            attempted_before = self.scraper.run_summary.profiles
+
+            def on_profile(profile):
+                if writer is not None:
+                    writer.write(profile)
+                    job.output_path = str(writer.path)
+                job.attempted = self.scraper.run_summary.profiles - attempted_before
+                job.add_result(profile)
+
+            self.scraper.scrape_profiles(job.urls, on_profile=on_profile)
+            job._update(status='done', attempted=self.scraper.run_summary.profiles - attempted_before,
+                        finished_at=time.time())
+        except Exception as e:
+            self.logger.error(f"Job {job.id} failed: {str(e)}")
+            job._update(status='failed', error=str(e), finished_at=time.time())
+        finally:
+            if writer is not None:
+                writer.close()
+            log_event(self.logger, 'job_done', job_id=job.id, status=job.status,
+                      completed=len(job.results), total=len(job.urls))
+
+
+def stream_job_events(job: ScrapeJob, start: int = 0, heartbeat: float = 15.0) -> Iterator[str]:
+    """Server-sent events for a job: one 'profile' event per result, then 'done'.
+
+    Event ids are result indexes, so a client reconnecting with Last-Event-ID
+    resumes where it left off.
+    """
+    position = start
+    while True:
+        results, finished = job.wait_for_results(position, heartbeat)
+        for offset, profile in enumerate(results):
+            yield format_sse(profile, event='profile', event_id=position + offset)
+        position += len(results)
+        if finished and not results:
+            yield format_sse(job.as_dict(), event='done')
+            return
+        if not results:
+            # Comment line keeps proxies from closing an idle connection
+            yield ': keep-alive\n\n'
+
+
+def format_sse(data, event: Optional[str] = None, event_id: Optional[int] = None) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event:
+        lines.append(f"event: {event}")
+    payload = data if isinstance(data, str) else json.dumps(data, ensure_ascii=False, default=str)
+    lines.extend(f"data: {line}" for line in payload.splitlines() or [''])
+    return '\n'.join(lines) + '\n\n'
+
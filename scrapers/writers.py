@@ -0,0 +1,276 @@
+import csv
+import gzip
+import hashlib
+import io
+import json
+import logging
+from datetime import datetime
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+    zstandard = None
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+from .schema import PROFILE_SCHEMA, SchemaRegistry
+
+COMPRESSION_SUFFIXES = {'none': '', 'gzip': '.gz', 'zstd': '.zst'}
+
+
+class _CountingFile(io.RawIOBase):
+    """Write-only file wrapper that counts and hashes the bytes that reach disk."""
+
+    def __init__(self, raw):
+        self._raw = raw
+        self.bytes_written = 0
+        self.sha256 = hashlib.sha256()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._raw.write(data)
+        self.bytes_written += len(data)
+        self.sha256.update(data)
+        return len(data)
+
+    def flush(self):
+        self._raw.flush()
+
+    def close(self):
+        if not self.closed:
+            super().close()
+            self._raw.close()
+
+
+def resolve_compression(compression: Optional[str]) -> str:
+    """Normalize the configured compression, falling back to gzip when zstandard is missing."""
+    compression = (compression or 'none').lower()
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"Unsupported output compression: {compression}")
+    if compression == 'zstd' and not ZSTD_AVAILABLE:
+        logging.getLogger(__name__).warning("zstandard not installed, using gzip compression instead")
+        return 'gzip'
+    return compression
+
+
+def open_output_stream(filename: str, compression: str = 'none', text: bool = True):
+    """
+    Open `filename` (plus compression suffix) for streaming output.
+
+    Returns (stream, counter, path): data is compressed on the fly and `counter`
+    reports the on-disk byte count and checksum once the stream is closed.
+    The stream is text unless `text` is False.
+    """
+    compression = resolve_compression(compression)
+    path = Path(filename + COMPRESSION_SUFFIXES[compression])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    counter = _CountingFile(open(path, 'wb'))
+    if compression == 'gzip':
+        binary = gzip.GzipFile(filename=path.stem, mode='wb', fileobj=counter)
+    elif compression == 'zstd':
+        binary = zstandard.ZstdCompressor(level=10).stream_writer(counter)
+    else:
+        binary = counter
+    if not text:
+        return binary, counter, path
+    return io.TextIOWrapper(binary, encoding='utf-8', newline=''), counter, path
+
+
+def _json_default(value):
+    """Serialize ProfileRecords and other mappings as plain objects."""
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps_line(record) -> bytes:
+    """Serialize one record as a JSON line, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(record, default=_json_default) + b'\n'
+    return (json.dumps(record, ensure_ascii=False, default=_json_default) + '\n').encode('utf-8')
+
+
+def file_digest(path) -> Dict:
+    """Byte size and sha256 of an existing file."""
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha256.update(chunk)
+    return {'bytes': Path(path).stat().st_size, 'sha256': sha256.hexdigest()}
+
+
+class CsvStreamWriter:
+    """Single-pass CSV writer: header from the schema up front, one row per profile."""
+
+    format = 'csv'
+
+    def __init__(self, filename: str, schema: SchemaRegistry = PROFILE_SCHEMA, compression: str = 'none'):
+        self.schema = schema
+        self.columns = schema.columns()
+        self.compression = resolve_compression(compression)
+        self.rows_written = 0
+        self.logger = logging.getLogger(__name__)
+        self._unknown_fields = set()
+
+        self._file, self._counter, self.path = open_output_stream(filename, self.compression)
+        self.filename = str(self.path)
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.columns)
+
+    def write(self, profile: Dict) -> list:
+        """Append one profile and return the cleaned row that was written."""
+        unknown = set(profile.keys()).difference(self.columns).difference(self._unknown_fields)
+        if unknown:
+            self._unknown_fields.update(unknown)
+            self.logger.warning(f"Dropping fields not declared in the output schema: {sorted(unknown)}")
+        row = self.schema.to_row(profile, self.columns)
+        self._writer.writerow(row)
+        self.rows_written += 1
+        return row
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+        # GzipFile leaves the file object it wraps open
+        self._counter.close()
+
+    def summaries(self) -> List[Dict]:
+        """Manifest entries for the finished file."""
+        return [{
+            'path': self.path.name,
+            'format': self.format,
+            'compression': self.compression,
+            'rows': self.rows_written,
+            'bytes': self._counter.bytes_written,
+            'sha256': self._counter.sha256.hexdigest(),
+        }]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class JsonlStreamWriter:
+    """
+    Append-only JSON Lines writer that keeps each profile's nested structure.
+
+    Lines are serialized as they arrive, flushed to disk every `batch_size`
+    records so the file can be tailed during a run, and rotated into a new
+    part once the current one reaches `max_bytes` on disk.
+    """
+
+    format = 'jsonl'
+
+    def __init__(self, filename: str, compression: str = 'none', batch_size: int = 20,
+                 max_bytes: int = 100 * 1024 * 1024):
+        self.base = filename[:-len('.jsonl')] if filename.endswith('.jsonl') else filename
+        self.compression = resolve_compression(compression)
+        self.batch_size = max(1, batch_size)
+        self.max_bytes = max_bytes
+        self.rows_written = 0
+        self._part = 0
+        self._part_rows = 0
+        self._pending: List[bytes] = []
+        self._finished: List[Dict] = []
+        self._stream = None
+        self.path = None
+
+    def _open_part(self):
+        self._part += 1
+        self._part_rows = 0
+        filename = f"{self.base}-part{self._part:04d}.jsonl"
+        self._stream, self._counter, self.path = open_output_stream(filename, self.compression, text=False)
+
+    def _close_part(self):
+        self._stream.close()
+        self._counter.close()
+        self._stream = None
+        self._finished.append({
+            'path': self.path.name,
+            'format': self.format,
+            'compression': self.compression,
+            'rows': self._part_rows,
+            'bytes': self._counter.bytes_written,
+            'sha256': self._counter.sha256.hexdigest(),
+        })
+
+    def write(self, profile: Dict):
+        """Queue one profile; the batch is flushed once it reaches batch_size."""
+        self._pending.append(dumps_line(profile))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write pending lines, flush them to disk and rotate if the part is full."""
+        if not self._pending:
+            return
+        if self._stream is None:
+            self._open_part()
+        self._stream.write(b''.join(self._pending))
+        self._part_rows += len(self._pending)
+        self.rows_written += len(self._pending)
+        self._pending = []
+        self._stream.flush()
+        if self.max_bytes and self._counter.bytes_written >= self.max_bytes:
+            self._close_part()
+
+    def close(self):
+        self.flush()
+        if self._stream is not None:
+            self._close_part()
+
+    def summaries(self) -> List[Dict]:
+        """Manifest entries for every finished part."""
+        return list(self._finished)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class RunManifest:
+    """Small JSON manifest listing every output file of a run with counts and checksums."""
+
+    def __init__(self, filename: str, run_id: str):
+        self.filename = filename
+        self.run_id = run_id
+        self.files: List[Dict] = []
+
+    def add(self, writer):
+        """Record the files of a closed streaming writer."""
+        self.files.extend(writer.summaries())
+
+    def add_file(self, path, file_format: str, rows: int):
+        """Record a file written outside the streaming writers (e.g. the Excel copy)."""
+        self.files.append(dict({'path': Path(path).name, 'format': file_format, 'compression': 'none', 'rows': rows},
+                               **file_digest(path)))
+
+    def total_bytes(self) -> int:
+        return sum(entry.get('bytes', 0) for entry in self.files)
+
+    def write(self) -> str:
+        Path(self.filename).parent.mkdir(parents=True, exist_ok=True)
+        manifest = {
+            'run_id': self.run_id,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'files': self.files,
+        }
+        with open(self.filename, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        return self.filename
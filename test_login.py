@@ -54,7 +54,7 @@ def test_login():
         if login_success:
             print("\n🎉 Login successful!")
             print("🏠 Navigating to LinkedIn home...")
-            scraper.driver.get("https://www.linkedin.com/feed/")
+            scraper.driver.get(f"{scraper.base_url}/feed/")
             print("✅ Ready to start scraping!")
             
             input("\n⏸️ Press Enter to close browser and exit...")
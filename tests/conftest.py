@@ -0,0 +1,162 @@
+"""
+Shared fixtures: a local fixture server and a scraper that loads its pages
+over plain HTTP instead of driving a browser.
+"""
+
+import json
+import re
+import sys
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from selenium.common.exceptions import TimeoutException
+
+from scrapers import linkedin_scraper
+from scrapers.fixture_server import FixtureServer
+from scrapers.linkedin_scraper import LinkedInScraper
+
+# Profiles whose page load times out in FixtureDriver
+TIMEOUT_PREFIX = 'timeout-'
+_CAPTURE_SELECTORS = re.compile(r'^var selectors = (.*);$', re.M)
+_STATE_MARKERS = re.compile(r'^var markers = (.*);\nvar phrases = (.*);$', re.M)
+
+
+def capture_sections(html: str, selectors) -> dict:
+    """What the section capture script returns for `html`, computed with soupsieve instead of a browser."""
+    soup = BeautifulSoup(html, 'html.parser')
+    order = {id(tag): position for position, tag in enumerate(soup.find_all(True))}
+    seen = []
+    for section_selectors in selectors.values():
+        for selector in section_selectors:
+            for node in soup.select(selector):
+                if node.find_parent('template') is not None:
+                    continue
+                root = node if node.name == 'section' else (node.find_parent('section') or node)
+                if any(other is root or other in root.parents for other in seen):
+                    continue
+                seen = [other for other in seen if root not in other.parents]
+                seen.append(root)
+    seen.sort(key=lambda tag: order[id(tag)])
+    return {
+        'title': soup.title.get_text() if soup.title else '',
+        'metas': [str(meta) for meta in soup.select('meta[property], meta[name]')],
+        'sections': [str(tag) for tag in seen],
+    }
+
+
+def page_state(html: str, url: str, markers, phrases) -> dict:
+    """What the page-state script returns for `html`, computed with soupsieve instead of a browser."""
+    soup = BeautifulSoup(html, 'html.parser')
+    heading = soup.find('h1')
+    text = soup.body.get_text(' ').lower() if soup.body else ''
+    return {
+        'url': url,
+        'title': soup.title.get_text() if soup.title else '',
+        'heading': heading.get_text()[:200] if heading else '',
+        'markers': {name: any(soup.select_one(selector) for selector in selectors)
+                    for name, selectors in markers.items()},
+        'sign_in': any(phrase in text for phrase in phrases),
+    }
+
+
+class FixtureDriver:
+    """Just enough of a WebDriver to load fixture-server pages without a browser.
+
+    The section capture and page-state scripts are answered from the page
+    source; every other script returns None.
+    """
+
+    def __init__(self):
+        self.current_url = ''
+        self.title = ''
+        self.page_source = ''
+        self.capabilities = {}
+
+    def get(self, url: str):
+        if f"/in/{TIMEOUT_PREFIX}" in url:
+            raise TimeoutException('timeout: Timed out receiving message from renderer')
+        try:
+            response = urllib.request.urlopen(url, timeout=10)
+        except urllib.error.HTTPError as e:
+            # 404 pages (unavailable profiles) still have a body to classify
+            response = e
+        with response:
+            self.page_source = response.read().decode('utf-8')
+            self.current_url = response.geturl()
+        match = re.search(r'<title>(.*?)</title>', self.page_source, re.S)
+        self.title = match.group(1).strip() if match else ''
+
+    def execute_script(self, script, *args):
+        match = _CAPTURE_SELECTORS.search(script)
+        if match:
+            return capture_sections(self.page_source, json.loads(match.group(1)))
+        match = _STATE_MARKERS.search(script)
+        if match:
+            return page_state(self.page_source, self.current_url, json.loads(match.group(1)),
+                              json.loads(match.group(2)))
+        return None
+
+    def quit(self):
+        pass
+
+
+@pytest.fixture(scope='session')
+def fixture_server(tmp_path_factory):
+    server = FixtureServer(port=0, require_login=False, lazy_sections=False,
+                           fixtures_dir=str(tmp_path_factory.mktemp('fixtures'))).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def profile_url(fixture_server):
+    return lambda username: f"{fixture_server.base_url}/in/{username}/"
+
+
+@pytest.fixture
+def config(tmp_path):
+    """config.json with every store under tmp_path and the optional extras off."""
+    with open(ROOT / 'config.json', 'r') as f:
+        config = json.load(f)
+    config['scraping'].update(delay_between_requests=0, retry_backoff_seconds=0, retry_backoff_max_seconds=0,
+                              page_state_settle_seconds=0)
+    config['linkedin']['auto_login'] = False
+    config['selectors'] = {'path': str(ROOT / 'selectors.json'), 'cache_dir': str(tmp_path / 'cache')}
+    for section in ('cache', 'entities', 'search', 'quality', 'history', 'watchdog'):
+        config[section]['enabled'] = False
+    config['output']['dataset']['enabled'] = False
+    config['scheduler']['state_path'] = str(tmp_path / 'scrape_state.db')
+    config['job_queue'].update(path=str(tmp_path / 'job_queue.db'), output_dir=None)
+    return config
+
+
+@pytest.fixture
+def make_scraper(config, fixture_server, monkeypatch):
+    """Build LinkedInScrapers on a FixtureDriver, with scroll and politeness sleeps skipped."""
+    monkeypatch.setattr(linkedin_scraper, 'random_delay', lambda *args: None)
+    monkeypatch.setattr(linkedin_scraper.time, 'sleep', lambda seconds: None)
+    scrapers = []
+
+    def make():
+        scraper = LinkedInScraper(config)
+        scraper.driver = FixtureDriver()
+        scrapers.append(scraper)
+        return scraper
+
+    yield make
+    for scraper in scrapers:
+        if scraper.scrape_state is not None:
+            scraper.scrape_state.close()
+
+
+@pytest.fixture
+def scraper(make_scraper):
+    return make_scraper()
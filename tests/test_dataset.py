@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+from scrapers.dataset import Dataset, DatasetWriter, import_exports, profile_key, rebuild_manifest
+from scrapers.writers import CsvStreamWriter
+
+USERS = ['ada', 'grace', 'linus', 'alan', 'barbara', 'edsger']
+
+
+@pytest.mark.parametrize('value, key', [
+    ('https://www.linkedin.com/in/Ada-Lovelace/?trk=x', 'ada-lovelace'),
+    ('http://127.0.0.1:8765/in/j%C3%BCrgen/', 'jürgen'),
+    ('Grace', 'grace'),
+    (None, ''),
+])
+def test_profile_key(value, key):
+    assert profile_key(value) == key
+
+
+def write_run(root, run_id, day, headline, users=USERS, buckets=4):
+    writer = DatasetWriter(str(root), run_id, buckets, compression='gzip', run_date=f"2024-01-{day:02d}")
+    for i, user in enumerate(users):
+        writer.write({'profile_url': f"https://x/in/{user}/", 'name': user.title(), 'headline': headline,
+                      'scraped_at': f"2024-01-{day:02d}T10:00:{i:02d}Z"})
+    writer.close()
+    return writer
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    write_run(tmp_path, '20240101_100000', 1, 'old')
+    write_run(tmp_path, '20240102_100000', 2, 'new', users=USERS[:3])
+    return Dataset(str(tmp_path))
+
+
+def test_manifest_indexes_each_part_file(dataset):
+    stats = dataset.stats()
+    assert stats['rows'] == 9 and stats['profiles'] == 6 and stats['buckets'] == 4
+    for entry in dataset.entries:
+        assert entry['path'].startswith(f"run_date={entry['run_date']}/bucket={entry['bucket']:02d}/part-")
+        assert entry['rows'] == len(entry['usernames'])
+
+
+def test_lookup_reads_only_files_holding_the_profile(dataset, monkeypatch):
+    read = []
+    original = dataset.read
+    monkeypatch.setattr(dataset, 'read', lambda entries, usernames=None: (
+        read.extend(entry['path'] for entry in entries), original(entries, usernames))[1])
+
+    assert dataset.latest('https://www.linkedin.com/in/Ada/')['headline'] == 'new'
+    assert len(read) == 1 and read[0].startswith('run_date=2024-01-02/')
+    assert dataset.history('ada')['headline'].tolist() == ['old', 'new']
+    assert dataset.latest('nobody') is None
+    assert all('ada' in entry['usernames'] for entry in dataset.files(['ada']))
+
+
+def test_latest_snapshot_takes_each_profiles_newest_record(dataset):
+    snapshot = dataset.latest_snapshot()
+    assert snapshot['username'].tolist() == sorted(USERS)
+    headlines = dict(zip(snapshot['username'], snapshot['headline']))
+    assert headlines == {user: 'new' if user in USERS[:3] else 'old' for user in USERS}
+    assert dataset.latest_snapshot(['alan', 'ada'])['headline'].tolist() == ['new', 'old']
+
+
+def test_time_filters_skip_whole_files(dataset):
+    assert {entry['run_date'] for entry in dataset.files(since='2024-01-02')} == {'2024-01-02'}
+    assert {entry['run_date'] for entry in dataset.files(until='2024-01-01T23:59:59Z')} == {'2024-01-01'}
+
+
+def test_bucket_count_is_fixed_at_creation(tmp_path):
+    write_run(tmp_path, '20240101_100000', 1, 'old', buckets=4)
+    assert write_run(tmp_path, '20240102_100000', 2, 'new', buckets=8).buckets == 4
+
+
+def test_rebuild_recreates_the_manifest(dataset, tmp_path):
+    original = json.loads((tmp_path / 'manifest.json').read_text())
+    (tmp_path / 'manifest.json').unlink()
+    assert rebuild_manifest(str(tmp_path), buckets=4) == original
+
+
+def test_import_backfills_flat_exports(scraper, profile_url, tmp_path):
+    export = tmp_path / 'output' / 'linkedin_data_20240105_093000.csv'
+    with CsvStreamWriter(str(export)) as writer:
+        for username in ('ada-lovelace', 'grace-hopper'):
+            profile = scraper.scrape_profile(profile_url(username))
+            profile.pop('scraped_at')
+            writer.write(profile)
+    root = tmp_path / 'dataset'
+    assert import_exports([str(export)], str(root), buckets=2) == 2
+    latest = Dataset(str(root)).latest(profile_url('grace-hopper'))
+    assert latest['username'] == 'grace-hopper'
+    # Rows without scraped_at take the export's run time
+    assert latest['scraped_at'].startswith('2024-01-05T')
+    assert {entry['run_id'] for entry in Dataset(str(root)).entries} == {'20240105_093000'}
@@ -0,0 +1,66 @@
+import pandas as pd
+import pytest
+
+from scrapers.enrichment import enrich, enrich_file, enriched_columns, parse_count, tenure_months, year_range
+from scrapers.writers import CsvStreamWriter, JsonlStreamWriter
+
+
+def strings(*values):
+    return pd.Series(values, dtype='string')
+
+
+def test_tenure_months():
+    months = tenure_months(strings('2019 - Present · 2 yrs 3 mos', '1 yr', '11 mos', 'less than a year',
+                                   '2015 - 2018', None))
+    assert months.tolist() == [27, 12, 11, 0, pd.NA, pd.NA]
+
+
+def test_year_range_treats_present_as_this_year():
+    years = year_range(strings('2015 – 2019', 'Jan 2019 - Present', '2005 - 2007 · 2 yrs', 'n/a'), 2024)
+    assert years['start_year'].tolist() == [2015, 2019, 2005, pd.NA]
+    assert years['end_year'].tolist() == [2019, 2024, 2007, pd.NA]
+    assert years['is_current'].tolist() == [False, True, False, False]
+
+
+def test_parse_count():
+    counts = parse_count(strings('500+', '1,234', '12K followers', '1.2M', 'none'))
+    assert counts['count'].tolist() == [500, 1234, 12000, 1200000, pd.NA]
+    assert counts['capped'].tolist() == [True, False, False, False, pd.NA]
+
+
+def test_enrich_adds_per_entry_and_profile_totals():
+    df = pd.DataFrame({
+        'experience_1_duration': ['2019 - Present · 2 yrs 3 mos', None],
+        'experience_2_duration': ['2015 - 2019 · 4 yrs', '2010 - 2012 · 2 yrs'],
+        'education_1_years': ['2011 – 2015', None],
+        'connections': ['500+', '42'],
+        'followers': ['1.5K followers', None],
+    }, dtype='string')
+    enriched = enrich(df, current_year=2021)
+    assert enriched['experience_1_end_year'].tolist() == [2021, pd.NA]
+    assert enriched['total_experience_months'].tolist() == [75, 24]
+    assert enriched['career_start_year'].tolist() == [2015, 2010]
+    assert enriched['education_1_start_year'].tolist() == [2011, pd.NA]
+    assert enriched['connections_bucket'].astype(str).tolist() == ['500+', '0-49']
+    assert enriched['followers_count'].tolist() == [1500, pd.NA]
+    # The raw columns are kept and the input is not modified
+    assert list(enriched.columns[:5]) == list(df.columns) and 'connections_count' not in df
+
+
+def test_enriched_columns_cover_the_schema():
+    columns = enriched_columns()
+    assert {'experience_1_tenure_months', 'education_1_end_year', 'connections_count',
+            'followers_count', 'total_experience_months'} <= set(columns)
+
+
+@pytest.mark.parametrize('writer, compression', [(CsvStreamWriter, 'gzip'), (JsonlStreamWriter, 'none')])
+def test_enrich_file_reads_scraped_exports(scraper, profile_url, tmp_path, writer, compression):
+    profiles = [scraper.scrape_profile(profile_url(username)) for username in ('ada-lovelace', 'grace-hopper')]
+    with writer(str(tmp_path / f"run.{writer.format}"), compression=compression) as out:
+        for profile in profiles:
+            out.write(profile)
+
+    enriched = pd.read_csv(enrich_file(str(out.path)))
+    assert enriched['name'].tolist() == [profile['name'] for profile in profiles]
+    assert enriched['total_experience_months'].notna().all()
+    assert (enriched['career_start_year'] >= 2005).all()
@@ -0,0 +1,81 @@
+import pandas as pd
+import pytest
+
+from scrapers.entities import EntityIndex, EntityResolver, normalize_name
+
+
+@pytest.mark.parametrize('name, key', [
+    ('Microsoft Corporation', 'microsoft'),
+    ('Microsoft · Full-time', 'microsoft'),
+    ('The Boeing Company', 'boeing'),
+    ('Procter & Gamble Co.', 'procter and gamble'),
+    ('Univ. of São Paulo', 'university of sao paulo'),
+    ('Acme (Europe) Ltd', 'acme'),
+    ('Inc', 'inc'),
+    (None, ''),
+])
+def test_normalize_name(name, key):
+    assert normalize_name(name) == key
+
+
+def test_variants_resolve_to_one_entity():
+    index = EntityIndex('company')
+    microsoft = index.add('Microsoft')
+    for variant in ('Microsoft Corp.', 'MICROSOFT · Full-time', 'Microsoft, Inc'):
+        assert index.add(variant) == microsoft
+    assert index.name(microsoft) == 'Microsoft' and len(index) == 1
+    assert microsoft.startswith('co_')
+
+
+def test_candidates_still_have_to_clear_the_threshold():
+    index = EntityIndex('company')
+    google = index.add('Google')
+    index.add('Goldman Sachs')
+    # The trie offers 'google' for 'google cloud', but one shared token is not enough
+    assert index.resolve('Google Cloud') is None
+    assert index.resolve('Micron') is None
+    loose = EntityIndex('company', threshold=0.3)
+    loose.add('Google')
+    loose.add('Goldman Sachs')
+    assert loose.resolve('Google Cloud') == google
+
+
+def test_lookups_do_not_learn(tmp_path):
+    resolver = EntityResolver(str(tmp_path / 'entities.json'), learn=False)
+    assert resolver.resolve('company', 'Stripe') is None
+    resolver.save()
+    assert not (tmp_path / 'entities.json').exists()
+
+
+def test_ids_are_stable_across_runs(tmp_path):
+    path = str(tmp_path / 'entities.json')
+    first = EntityResolver(path)
+    stripe = first.resolve('company', 'Stripe, Inc.')
+    mit = first.resolve('school', 'Massachusetts Institute of Technology')
+    first.save()
+    second = EntityResolver(path, learn=False)
+    assert second.resolve('company', 'Stripe') == stripe
+    assert second.resolve('school', 'Massachusetts Inst. of Technology') == mit
+    assert mit.startswith('ed_')
+
+
+def test_annotate_frame_resolves_each_distinct_name_once(tmp_path):
+    resolver = EntityResolver(None)
+    df = pd.DataFrame({'current_company': ['Stripe', 'Stripe Inc', None],
+                       'education_1_school': ['MIT', None, 'MIT']}, dtype='string')
+    annotated = resolver.annotate_frame(df)
+    ids = annotated['current_company_id']
+    assert ids[0] == ids[1] and pd.isna(ids[2])
+    assert annotated['education_1_school_id'][0] == annotated['education_1_school_id'][2]
+
+
+def test_scraped_profiles_carry_canonical_ids(config, make_scraper, profile_url, tmp_path):
+    config['entities'].update(enabled=True, path=str(tmp_path / 'entities.json'))
+    scraper = make_scraper()
+    profile = scraper.scrape_profile(profile_url('ada-lovelace'))
+    assert profile['current_company'] and profile['current_company_id']
+    assert profile['current_company_id'] == scraper.entity_resolver.resolve('company', profile['current_company'])
+    assert profile['experience_1_company_id'].startswith('co_')
+    scraper.cleanup()
+    assert EntityResolver(str(tmp_path / 'entities.json'), learn=False).resolve(
+        'company', profile['current_company']) == profile['current_company_id']
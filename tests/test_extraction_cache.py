@@ -0,0 +1,68 @@
+import pytest
+
+from scrapers.extraction_cache import ExtractionCache, content_hash
+from scrapers.fixture_server import render_profile
+
+PAGE = render_profile('ada-lovelace', lazy_sections=False)
+
+
+@pytest.mark.parametrize('before, after', [
+    ('<meta name="csrf-token" content="abc">', '<meta name="csrf-token" content="xyz">'),
+    ('<div id="ember123">', '<div id="ember456">'),
+    ('<a href="/in/x/?trk=feed_1">', '<a href="/in/x/?trk=profile_9">'),
+    ('<div data-time="1700000000000">', '<div data-time="1710000000000">'),
+    ('<span class="time">3d</span>', '<span class="time">5d</span>'),
+    ('<span>1w ago</span>', '<span>2w ago</span>'),
+    ('<span>5 hours ago</span>', '<span>7 hours ago</span>'),
+    ('<span class="notification-badge__count">4</span>', '<span class="notification-badge__count">9</span>'),
+])
+def test_volatile_tokens_do_not_change_the_hash(before, after):
+    assert content_hash(PAGE + before) == content_hash(PAGE + after)
+
+
+@pytest.mark.parametrize('before, after', [
+    ('<span>2010 – 2014</span>', '<span>2011 – 2015</span>'),
+    ('<span>2015 - 2018 · 3 yrs 2 mos</span>', '<span>2015 - 2019 · 4 yrs 2 mos</span>'),
+    ('<span>Jan 2020 - Present</span>', '<span>Mar 2020 - Present</span>'),
+    ('<span>+1 4155550100</span>', '<span>+1 4155550199</span>'),
+    ('<span>12:30</span>', '<span>14:45</span>'),
+    ('<span>3 yrs</span>', '<span>5 yrs</span>'),
+])
+def test_profile_content_changes_the_hash(before, after):
+    assert content_hash(PAGE + before) != content_hash(PAGE + after)
+
+
+def test_lru_eviction_and_copies(tmp_path):
+    cache = ExtractionCache(str(tmp_path / 'cache.json'), max_entries=2, save_every=0)
+    cache.put('a', {'skills': ['Go']})
+    cache.put('b', {'name': 'B'})
+    cache.get('a')['skills'].append('mutated')
+    cache.put('c', {'name': 'C'})
+    assert cache.get('b') is None
+    assert cache.get('a') == {'skills': ['Go']}
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_entries_persist_across_instances(tmp_path):
+    path = tmp_path / 'cache.json'
+    cache = ExtractionCache(str(path), save_every=2)
+    cache.put('a', {'name': 'A'})
+    assert not path.exists()
+    cache.put('b', {'name': 'B'})
+    assert ExtractionCache(str(path)).get('b') == {'name': 'B'}
+
+
+def test_corrupt_cache_file_is_ignored(tmp_path):
+    path = tmp_path / 'cache.json'
+    path.write_text('{not json', encoding='utf-8')
+    assert len(ExtractionCache(str(path))) == 0
+
+
+def test_repeat_scrape_is_served_from_the_cache(config, make_scraper, profile_url, tmp_path):
+    config['cache'].update(enabled=True, path=str(tmp_path / 'extraction_cache.json'))
+    scraper = make_scraper()
+    first = scraper.scrape_profile(profile_url('ada-lovelace'))
+    second = scraper.scrape_profile(profile_url('ada-lovelace'))
+    other = scraper.scrape_profile(profile_url('grace-hopper'))
+    assert scraper.extraction_cache.hits == 1
+    assert second['name'] == first['name'] != other['name']
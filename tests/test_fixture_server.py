@@ -0,0 +1,82 @@
+import http.cookiejar
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import pytest
+
+from scrapers.fixture_server import FixtureServer, render_profile, synthetic_profile
+
+
+@pytest.fixture
+def login_server(tmp_path):
+    server = FixtureServer(port=0, require_login=True, fixtures_dir=str(tmp_path)).start()
+    yield server
+    server.stop()
+
+
+def fetch(opener, url, data=None):
+    try:
+        response = opener.open(url, data=data, timeout=10)
+    except urllib.error.HTTPError as e:
+        response = e
+    with response:
+        return response.status, response.geturl(), response.read().decode('utf-8')
+
+
+def test_profiles_need_a_session(login_server):
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+    status, url, body = fetch(opener, f"{login_server.base_url}/in/ada-lovelace/")
+    assert '/authwall' in url and 'Join LinkedIn' in body
+
+    form = urllib.parse.urlencode({'session_key': 'a@example.com', 'session_password': 'x'}).encode()
+    status, url, body = fetch(opener, f"{login_server.base_url}/checkpoint/lg/login-submit", form)
+    assert url.endswith('/feed/') and 'Welcome back' in body
+
+    status, url, body = fetch(opener, f"{login_server.base_url}/in/ada-lovelace/")
+    assert status == 200 and synthetic_profile('ada-lovelace')['name'] in body
+
+
+def test_login_without_credentials_goes_back_to_login(login_server):
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+    form = urllib.parse.urlencode({'session_key': 'a@example.com'}).encode()
+    status, url, body = fetch(opener, f"{login_server.base_url}/checkpoint/lg/login-submit", form)
+    assert url.endswith('/login') and 'session_password' in body
+
+
+def test_special_usernames(fixture_server):
+    opener = urllib.request.build_opener()
+    status, url, body = fetch(opener, f"{fixture_server.base_url}/in/unavailable-bob/")
+    assert status == 404 and 'not available' in body
+    status, url, body = fetch(opener, f"{fixture_server.base_url}/in/authwall-bob/")
+    assert '/authwall?sessionRedirect=' in url
+
+
+def test_recorded_page_wins_over_synthetic(login_server, tmp_path):
+    (tmp_path / 'recorded.html').write_text('<html><title>Recorded</title></html>', encoding='utf-8')
+    assert login_server.profile_page('recorded') == '<html><title>Recorded</title></html>'
+    assert login_server.profile_page('someone-else') != login_server.profile_page('recorded')
+
+
+def test_synthetic_profiles_are_deterministic():
+    assert synthetic_profile('ada') == synthetic_profile('ada')
+    assert render_profile('ada') == render_profile('ada')
+    assert synthetic_profile('ada') != synthetic_profile('grace')
+
+
+def test_lazy_sections_wait_in_a_template():
+    lazy, eager = render_profile('ada', lazy_sections=True), render_profile('ada', lazy_sections=False)
+    assert '<template id="lazy-sections">' in lazy and 'data-field="skill"' in lazy
+    assert '<template' not in eager and 'data-field="skill"' in eager
+
+
+def test_from_config_ignores_enabled_flag():
+    server = FixtureServer.from_config({'fixture_server': {'enabled': True, 'port': 0, 'latency': 0.5}})
+    assert server.latency == 0.5 and server.port == 0
+
+
+def test_scrape_profiles_end_to_end(scraper, profile_url):
+    usernames = ['ada-lovelace', 'grace-hopper', 'alan-turing']
+    records = scraper.scrape_profiles([profile_url(username) for username in usernames])
+    assert [record.get('name') for record in records] == [synthetic_profile(name)['name'] for name in usernames]
+    assert scraper.run_summary.outcomes == {'success': 3}
@@ -0,0 +1,77 @@
+import itertools
+import sqlite3
+
+import pytest
+
+from main import record_run_history
+from scrapers import history as history_module
+from scrapers.history import RunHistory, history_from_config, main, metrics_from_summary
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Give every recorded run a distinct, increasing timestamp."""
+    ticks = itertools.count(1_700_000_000)
+    monkeypatch.setattr(history_module.time, 'time', lambda: next(ticks))
+
+
+def summary(run_id, profiles=10, per_hour=600.0, load=1.0, parse=0.2, outcomes=None, fill_rates=None):
+    return {'run_id': run_id, 'profiles': profiles, 'elapsed_seconds': 60.0, 'profiles_per_hour': per_hour,
+            'mean_load_seconds': load, 'mean_parse_seconds': parse,
+            'outcomes': outcomes or {'success': profiles}, 'fill_rates': fill_rates or {}}
+
+
+def test_metrics_flatten_outcome_rates():
+    row = metrics_from_summary(summary('r1', outcomes={'success': 6, 'partial': 1, 'authwall': 2, 'no_data': 1}))
+    assert row['success_rate'] == 0.7 and row['authwall_rate'] == 0.2 and row['limited_rate'] == 0.1
+    assert metrics_from_summary({'run_id': 'empty'})['success_rate'] is None
+
+
+def test_steady_runs_have_no_regressions(tmp_path, clock):
+    store = RunHistory(str(tmp_path / 'history.db'))
+    for i in range(4):
+        store.record_run(summary(f"r{i}", per_hour=600 + i))
+    assert store.check_regressions() == []
+    assert [run['run_id'] for run in store.recent(2)] == ['r3', 'r2']
+
+
+def test_slower_run_and_more_authwalls_are_flagged(tmp_path, clock):
+    store = RunHistory(str(tmp_path / 'history.db'))
+    for i in range(3):
+        store.record_run(summary(f"r{i}"))
+    store.record_run(summary('slow', per_hour=300.0, load=2.0, outcomes={'success': 7, 'authwall': 3}))
+    regressions = {r['metric']: r for r in store.check_regressions()}
+    assert set(regressions) == {'profiles_per_hour', 'mean_load_seconds', 'success_rate', 'authwall_rate'}
+    assert regressions['profiles_per_hour']['change'] == -0.5
+    assert regressions['authwall_rate']['baseline'] == 0.0 and regressions['authwall_rate']['current'] == 0.3
+    # Small runs can be excluded from the comparison entirely
+    assert store.check_regressions(min_profiles=11) == []
+
+
+def test_fill_rate_baseline_is_a_median(tmp_path, clock):
+    store = RunHistory(str(tmp_path / 'history.db'))
+    for i, rate in enumerate([0.9, 0.1, 0.8]):
+        store.record_run(summary(f"r{i}", fill_rates={'name': rate}))
+    store.record_run(summary('no-rates'))
+    assert store.fill_rate_baseline() == {'name': 0.8}
+
+
+def test_check_command_exits_non_zero_on_regression(tmp_path, clock, capsys):
+    path = str(tmp_path / 'history.db')
+    store = RunHistory(path)
+    store.record_run(summary('r1'))
+    store.record_run(summary('r2', per_hour=100.0))
+    store.close()
+    assert main(['check', '--db', path]) == 1
+    assert 'profiles_per_hour' in capsys.readouterr().out
+    assert main(['report', '--db', path]) == 0
+
+
+def test_scrape_run_is_recorded(config, scraper, profile_url, tmp_path):
+    path = tmp_path / 'history.db'
+    assert history_from_config(config) is None
+    config['history'] = {'enabled': True, 'path': str(path)}
+    scraper.scrape_profiles([profile_url('ada-lovelace'), profile_url('authwall-eve')])
+    record_run_history(config, scraper.run_summary, bytes_written=123)
+    [row] = sqlite3.connect(path).execute('SELECT profiles, success_rate, authwall_rate, bytes_written FROM runs')
+    assert row == (2, 0.5, 0.5, 123)
@@ -0,0 +1,85 @@
+import time
+
+import pytest
+
+from scrapers.job_queue import JobQueue, QueueWorker
+
+
+@pytest.fixture
+def job_queue(tmp_path):
+    queue = JobQueue(str(tmp_path / 'job_queue.db'), max_attempts=2)
+    yield queue
+    queue.close()
+
+
+def statuses(job_queue, job_id):
+    return {name: count for name, count in job_queue.job_status(job_id)['items'].items() if count}
+
+
+def test_leased_items_are_held_until_the_lease_lapses(job_queue):
+    job_id = job_queue.submit(['https://example.com/in/a/'])
+    assert len(job_queue.lease('worker-1', 10, lease_seconds=0.2)) == 1
+    assert job_queue.lease('worker-2', 10, lease_seconds=60) == []
+    time.sleep(0.3)
+    items = job_queue.lease('worker-2', 10, lease_seconds=60)
+    assert [item.attempts for item in items] == [2]
+    # The first worker lost its lease: its ack no longer counts
+    job_queue.ack(items, 'worker-1')
+    assert statuses(job_queue, job_id) == {'leased': 1}
+
+
+def test_extend_keeps_the_lease(job_queue):
+    job_queue.submit(['https://example.com/in/a/'])
+    items = job_queue.lease('worker-1', 10, lease_seconds=0.2)
+    job_queue.extend(items, 'worker-1', lease_seconds=60)
+    time.sleep(0.3)
+    assert job_queue.lease('worker-2', 10, lease_seconds=60) == []
+
+
+def test_nack_requeues_until_max_attempts(job_queue):
+    job_id = job_queue.submit(['https://example.com/in/a/'])
+    job_queue.nack(job_queue.lease('w', 10, 60), 'w', error='timeout')
+    assert statuses(job_queue, job_id) == {'queued': 1}
+    job_queue.nack(job_queue.lease('w', 10, 60), 'w', error='timeout')
+    assert statuses(job_queue, job_id) == {'failed': 1}
+
+
+def test_nack_without_retry_fails_at_once(job_queue):
+    job_id = job_queue.submit(['https://example.com/in/a/'])
+    job_queue.nack(job_queue.lease('w', 10, 60), 'w', error='unavailable', retry=False)
+    assert statuses(job_queue, job_id) == {'failed': 1}
+
+
+def test_worker_settles_each_item_by_outcome(config, job_queue, scraper, profile_url, monkeypatch):
+    jobs = {username: job_queue.submit([profile_url(username)])
+            for username in ('ada-lovelace', 'unavailable-grace', 'timeout-linus')}
+    worker = QueueWorker.from_config(config, job_queue, scraper=scraper)
+    extended = []
+    extend = job_queue.extend
+    monkeypatch.setattr(job_queue, 'extend', lambda items, owner, lease_seconds: (
+        extended.append(len(list(items))), extend(items, owner, lease_seconds)))
+
+    worker.process(job_queue.lease(worker.owner, 10, worker.lease_seconds))
+
+    assert statuses(job_queue, jobs['ada-lovelace']) == {'done': 1}
+    assert statuses(job_queue, jobs['unavailable-grace']) == {'failed': 1}
+    assert statuses(job_queue, jobs['timeout-linus']) == {'queued': 1}
+    # Leases are pushed out after failed attempts as well as scraped profiles
+    assert len(extended) == 3
+
+
+def test_release_only_sees_this_batchs_attempts(config, job_queue, scraper, profile_url, monkeypatch):
+    url = profile_url('unavailable-grace')
+    first = job_queue.submit([url, profile_url('ada-lovelace')])
+    worker = QueueWorker.from_config(config, job_queue, scraper=scraper)
+    worker.process(job_queue.lease(worker.owner, 10, worker.lease_seconds))
+    assert statuses(job_queue, first) == {'done': 1, 'failed': 1}
+    assert len(scraper.attempt_log) == 2
+
+    # The same URL again, but this batch stops before reaching it
+    second = job_queue.submit([url])
+    monkeypatch.setattr(scraper, 'scrape_profiles', lambda urls, **kwargs: [])
+    worker.process(job_queue.lease(worker.owner, 10, worker.lease_seconds))
+    assert len(scraper.attempt_log) == 0 and scraper.run_summary.profiles == 0
+    # Not attempted, so back in the queue rather than failed on the earlier 'unavailable'
+    assert statuses(job_queue, second) == {'queued': 1}
@@ -0,0 +1,59 @@
+import gzip
+import json
+
+import pytest
+
+from scrapers import writers
+from scrapers.records import ProfileRecord
+from scrapers.writers import JsonlStreamWriter, dumps_line
+
+
+def read_lines(path):
+    opener = gzip.open if path.suffix == '.gz' else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_lines_are_flushed_in_batches(tmp_path):
+    writer = JsonlStreamWriter(str(tmp_path / 'run.jsonl'), batch_size=3)
+    writer.write({'name': 'Ada'})
+    writer.write({'name': 'Grace'})
+    assert writer.path is None and writer.rows_written == 0
+    writer.write({'name': 'Linus'})
+    assert writer.rows_written == 3
+    assert [line['name'] for line in read_lines(writer.path)] == ['Ada', 'Grace', 'Linus']
+    writer.write({'name': 'Alan'})
+    writer.close()
+    assert writer.rows_written == 4
+    assert writer.path.name == 'run-part0001.jsonl'
+
+
+def test_parts_rotate_at_max_bytes(tmp_path):
+    with JsonlStreamWriter(str(tmp_path / 'run.jsonl'), compression='gzip', batch_size=1, max_bytes=1) as writer:
+        for name in ('Ada', 'Grace', 'Linus'):
+            writer.write({'name': name})
+    summaries = writer.summaries()
+    assert [entry['path'] for entry in summaries] == [f"run-part000{i}.jsonl.gz" for i in (1, 2, 3)]
+    assert [entry['rows'] for entry in summaries] == [1, 1, 1]
+    assert read_lines(tmp_path / 'run-part0002.jsonl.gz') == [{'name': 'Grace'}]
+
+
+def test_nested_structure_and_records_survive(tmp_path):
+    profile = {'name': 'Ada', 'experience': [{'title': 'Analyst', 'years': 2}],
+               'profile_completeness_indicators': {'has_about': True}}
+    with JsonlStreamWriter(str(tmp_path / 'run.jsonl')) as writer:
+        writer.write(profile)
+        writer.write(ProfileRecord.from_dict({'name': 'Grace', 'skills_count': 3}))
+    first, second = read_lines(writer.path)
+    assert first == profile
+    assert second == {'name': 'Grace', 'skills_count': 3}
+
+
+@pytest.mark.parametrize('orjson_available', [True, False])
+def test_serializers_agree(monkeypatch, orjson_available):
+    if orjson_available and not writers.ORJSON_AVAILABLE:
+        pytest.skip('orjson not installed')
+    monkeypatch.setattr(writers, 'ORJSON_AVAILABLE', orjson_available)
+    line = dumps_line({'name': 'Zoë', 'skills': ['Go', 'Rust']})
+    assert line.endswith(b'\n')
+    assert json.loads(line) == {'name': 'Zoë', 'skills': ['Go', 'Rust']}
@@ -0,0 +1,85 @@
+import atexit
+import json
+import logging
+import logging.handlers
+
+import pytest
+
+from scrapers import utils
+from scrapers.utils import JsonFormatter, RunSummary, log_event, setup_logging
+
+
+@pytest.fixture
+def log_file(tmp_path, monkeypatch):
+    """Run setup_logging into tmp_path, then put the root logger back as it was."""
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    monkeypatch.setattr(utils, '_log_listener', None)
+    path = tmp_path / 'scraper.log'
+    setup_logging(log_file=str(path))
+    yield path
+    utils._log_listener.stop()
+    atexit.unregister(utils._log_listener.stop)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+
+
+def read_events(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_callers_only_enqueue(log_file):
+    # pytest's own capture handlers sit next to it during the test
+    queued = [h for h in logging.getLogger().handlers if isinstance(h, logging.handlers.QueueHandler)]
+    assert len(queued) == 1
+    assert not any(isinstance(h, logging.FileHandler) for h in logging.getLogger().handlers)
+    # A second call keeps the running listener
+    listener = utils._log_listener
+    setup_logging(log_file=str(log_file))
+    assert utils._log_listener is listener
+
+
+def test_events_land_as_json_lines(log_file):
+    log_event(logging.getLogger('scrapers.test'), 'profile_done', url='https://x/in/a/', duration=1.5,
+              thread='main')
+    utils._log_listener.stop()
+    [event] = read_events(log_file)
+    assert event['event'] == 'profile_done'
+    assert event['logger'] == 'scrapers.test' and event['level'] == 'INFO'
+    assert event['url'] == 'https://x/in/a/' and event['duration'] == 1.5
+    assert event['field_thread'] == 'main'
+    assert event['message'].startswith('profile_done url=https://x/in/a/')
+    # Restart so the fixture's teardown has a listener to stop
+    utils._log_listener.start()
+
+
+def test_json_formatter_skips_standard_attributes():
+    record = logging.LogRecord('x', logging.WARNING, __file__, 1, 'hello %s', ('there',), None)
+    record.custom = {'a': 1}
+    event = json.loads(JsonFormatter().format(record))
+    assert event['message'] == 'hello there' and event['custom'] == {'a': 1}
+    assert 'lineno' not in event and 'args' not in event
+
+
+def test_run_summary_counts_outcomes_and_phases():
+    summary = RunSummary(run_id='run-1')
+    summary.record('a', 'success', 2.0, load=1.0, parse=0.5)
+    summary.record('b', 'timeout', 4.0, attempts=3, load=3.0)
+    data = summary.as_dict()
+    assert data['profiles'] == 2 and data['retries'] == 2
+    assert data['outcomes'] == {'success': 1, 'timeout': 1}
+    assert data['rates'] == {'success': 0.5, 'timeout': 0.5}
+    assert data['failed_urls'] == ['b']
+    assert data['mean_total_seconds'] == 3.0 and data['mean_load_seconds'] == 2.0
+    assert data['mean_parse_seconds'] == 0.5
+
+
+def test_scrape_run_emits_one_summary(scraper, profile_url, caplog):
+    with caplog.at_level(logging.INFO, logger='scrapers.linkedin_scraper'):
+        scraper.scrape_profiles([profile_url('ada-lovelace'), profile_url('unavailable-bob')])
+    [summary] = [record for record in caplog.records if getattr(record, 'event', '') == 'run_summary']
+    assert summary.outcomes == {'success': 1, 'unavailable': 1}
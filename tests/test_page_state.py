@@ -0,0 +1,69 @@
+import logging
+
+import pytest
+
+from scrapers.page_state import ROUTE_FULL, ROUTE_LIMITED, ROUTE_SKIP, classify_page
+
+# Served in place of a profile, with the same top card layout the profile markers look for
+INTERSTITIAL = """<!DOCTYPE html>
+<html><head><title>{title}</title></head><body><main>
+<section class="artdeco-card pv-top-card"><div class="ph5"><h1>{heading}</h1></div></section>
+<section><p>Sign in to see the full profile.</p>{form}</section>
+</main></body></html>"""
+JOIN_FORM = '<form class="authwall-join-form"><input name="email"><button>Join now</button></form>'
+
+
+@pytest.mark.parametrize('url, title, heading, markers, sign_in, expected', [
+    ('https://x/in/ada/', 'Ada Lovelace | Analyst | LinkedIn', 'Ada Lovelace', {'profile': True}, False,
+     ('profile', ROUTE_FULL)),
+    ('https://x/in/ada/', 'Ada Lovelace | LinkedIn', '', {}, False, ('unknown', ROUTE_FULL)),
+    ('https://x/authwall?sessionRedirect=/in/ada/', 'Sign Up | LinkedIn', 'Join LinkedIn', {}, True,
+     ('authwall', ROUTE_SKIP)),
+    ('https://x/authwall', 'Ada Lovelace | LinkedIn', '', {}, False, ('authwall', ROUTE_LIMITED)),
+    ('https://x/in/gone/', 'Profile Unavailable | LinkedIn', '', {'profile': True}, False,
+     ('unavailable', ROUTE_SKIP)),
+    # A sign-in form or prompt wins over the top card markers
+    ('https://x/in/ada/', 'Ada Lovelace | LinkedIn', 'Ada', {'profile': True, 'auth': True}, False,
+     ('authwall', ROUTE_LIMITED)),
+    ('https://x/in/ada/', 'LinkedIn', '', {'profile': True}, True, ('authwall', ROUTE_SKIP)),
+])
+def test_classify_page(url, title, heading, markers, sign_in, expected):
+    verdict = classify_page(url, title, heading, markers, sign_in)
+    assert (verdict.state, verdict.route) == expected
+
+
+def states(caplog):
+    return [record.state for record in caplog.records if getattr(record, 'event', '') == 'page_state']
+
+
+def record_page(fixture_server, username, **fields):
+    page = INTERSTITIAL.format(**{'title': 'LinkedIn', 'heading': '', 'form': '', **fields})
+    (fixture_server.fixtures_dir / f"{username}.html").write_text(page, encoding='utf-8')
+
+
+def test_real_profile_is_routed_to_the_full_extraction(scraper, profile_url, caplog):
+    with caplog.at_level(logging.INFO, logger='scrapers.linkedin_scraper'):
+        profile = scraper.scrape_profile(profile_url('ada-lovelace'))
+    assert states(caplog) == ['profile']
+    assert profile['skills_list'] and 'extraction_method' not in profile
+
+
+def test_in_place_authwall_naming_someone_gets_the_limited_extraction(scraper, profile_url, fixture_server,
+                                                                        caplog):
+    record_page(fixture_server, 'gated-ada', title='Ada Lovelace | Analyst | LinkedIn', heading='Ada Lovelace',
+                form=JOIN_FORM)
+    url = profile_url('gated-ada')
+    with caplog.at_level(logging.INFO, logger='scrapers.linkedin_scraper'):
+        profile = scraper.scrape_profile(url)
+    assert states(caplog) == ['authwall']
+    assert profile['extraction_method'] == 'limited'
+    assert (profile['name'], profile['headline']) == ('Ada Lovelace', 'Analyst')
+    assert [attempt.outcome for attempt in scraper.attempt_log.attempts(url)] == ['limited']
+
+
+def test_bare_sign_in_prompt_is_skipped(scraper, profile_url, fixture_server):
+    # No form, only the prompt text, and a title that names nobody
+    record_page(fixture_server, 'gated-anon')
+    url = profile_url('gated-anon')
+    assert scraper.scrape_profile(url) is None
+    assert [attempt.outcome for attempt in scraper.attempt_log.attempts(url)] == ['authwall']
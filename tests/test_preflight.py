@@ -0,0 +1,73 @@
+import pytest
+
+from scrapers.fixture_server import FixtureServer
+from scrapers.preflight import canaries_from_config, run_preflight
+
+
+@pytest.fixture
+def preflight_scraper(config, make_scraper, fixture_server):
+    config['linkedin']['base_url'] = fixture_server.base_url
+    return make_scraper()
+
+
+def stages(report):
+    return [(stage.stage, stage.ok) for stage in report.stages]
+
+
+def test_canaries_from_config():
+    config = {'preflight': {'expected_fields': ['name'],
+                            'canaries': ['https://x/in/ada/', {'url': 'https://x/in/grace/', 'expect': ['about']}]}}
+    assert canaries_from_config(config) == [{'url': 'https://x/in/ada/', 'expect': ['name']},
+                                            {'url': 'https://x/in/grace/', 'expect': ['about']}]
+    assert canaries_from_config({}) == []
+
+
+def test_healthy_setup_passes_every_stage(config, preflight_scraper, profile_url):
+    config['preflight']['canaries'] = [profile_url('ada-lovelace'), profile_url('grace-hopper')]
+    report = run_preflight(preflight_scraper, config)
+    assert stages(report) == [('driver', True), ('session', True), ('canary ada-lovelace', True),
+                              ('canary grace-hopper', True)]
+    assert report.ok and report.as_dict()['ok']
+    assert 'expected fields filled' in report.lines()[-1]
+    # Canaries are checks, not part of the run
+    assert preflight_scraper.run_summary.profiles == 0
+
+
+def test_without_canaries_the_stage_is_reported_as_skipped(config, preflight_scraper):
+    report = run_preflight(preflight_scraper, config)
+    assert stages(report)[-1] == ('canaries', True)
+    assert report.stages[-1].detail == 'no canaries configured'
+
+
+def test_broken_canaries_fail_with_the_reason(config, preflight_scraper, profile_url):
+    canaries = [{'url': profile_url('unavailable-ada'), 'expect': ['name']},
+                {'url': profile_url('grace-hopper'), 'expect': ['name', 'no_such_field']}]
+    report = run_preflight(preflight_scraper, config, canaries)
+    assert not report.ok
+    assert [stage.detail for stage in report.stages[2:]] == ['outcome unavailable',
+                                                             'outcome success, empty: no_such_field']
+
+
+def test_driver_failure_skips_the_later_stages(config, preflight_scraper, monkeypatch):
+    preflight_scraper.driver = None
+
+    def fail():
+        raise RuntimeError('chrome not found')
+    monkeypatch.setattr(preflight_scraper, 'setup_driver', fail)
+    report = run_preflight(preflight_scraper, config)
+    assert stages(report) == [('driver', False)]
+    assert report.stages[0].detail == 'RuntimeError: chrome not found'
+
+
+@pytest.mark.parametrize('require_login, ok', [(True, False), (False, True)])
+def test_logged_out_session(config, make_scraper, tmp_path, require_login, ok):
+    # This server sends the logged-out feed to the sign-in page
+    server = FixtureServer(port=0, require_login=True, fixtures_dir=str(tmp_path)).start()
+    try:
+        config['linkedin']['base_url'] = server.base_url
+        config['preflight']['require_login'] = require_login
+        report = run_preflight(make_scraper(), config)
+    finally:
+        server.stop()
+    assert report.stages[1].ok is ok
+    assert report.stages[1].detail.startswith('not authenticated')
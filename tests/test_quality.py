@@ -0,0 +1,103 @@
+import logging
+
+import pytest
+
+from scrapers.history import RunHistory
+from scrapers.quality import FillRateMonitor, QualityAbort, is_filled
+
+FIELDS = ('name', 'headline', 'about')
+
+
+@pytest.mark.parametrize('value, filled', [
+    ('Ada', True), ('  ', False), (None, False), ([], False), (['Go'], True), ({}, False), (0, False), (3, True),
+])
+def test_is_filled(value, filled):
+    assert is_filled(value) is filled
+
+
+def test_thresholds_come_from_the_baseline():
+    monitor = FillRateMonitor(FIELDS, key_fields=['name'], max_drop=0.3, min_fill_rate=0.2,
+                              baseline={'headline': 0.9, 'about': 0.4})
+    assert monitor.threshold('name') == 0.2
+    assert monitor.threshold('headline') == pytest.approx(0.6)
+    # Rarely filled non-key fields are not watched
+    assert monitor.threshold('about') is None
+
+
+def test_breach_alerts_once_until_the_field_recovers():
+    monitor = FillRateMonitor(FIELDS, key_fields=['name'], window=4, min_samples=4, max_drop=0.3,
+                              baseline={'headline': 1.0})
+    full, headless = {'name': 'Ada', 'headline': 'Engineer'}, {'name': 'Ada'}
+
+    def feed(*profiles):
+        return [drop for profile in profiles for drop in monitor.observe(profile)]
+
+    assert feed(headless, full, full) == []  # not judged before min_samples
+    assert feed(full, full) == []
+    assert feed(headless) == []  # 3/4 is still above the threshold
+    [drop] = feed(headless)
+    assert (drop.field, drop.fill_rate, drop.baseline, drop.threshold, drop.key) == ('headline', 0.5, 1.0, 0.7, False)
+    assert feed(headless) == []  # still broken, already reported
+    assert monitor.fill_rates() == {'name': 1.0, 'headline': 0.25, 'about': 0.0}
+    assert feed(full, full, full, full) == []
+    assert [drop.field for drop in feed(headless, headless)] == ['headline']
+    assert monitor.run_fill_rates()['headline'] == round(8 / 14, 4)
+
+
+def test_unknown_action_is_rejected():
+    with pytest.raises(ValueError, match='Unknown quality action'):
+        FillRateMonitor(FIELDS, action='panic')
+
+
+def test_baseline_is_read_from_the_history(config, tmp_path):
+    history = RunHistory(str(tmp_path / 'history.db'))
+    for i, rate in enumerate([0.9, 0.8, 0.1]):
+        history.record_run({'run_id': f"r{i}", 'profiles': 50, 'outcomes': {'success': 50},
+                            'fill_rates': {'headline': rate}})
+    history.close()
+    config['history'] = {'enabled': True, 'path': str(tmp_path / 'history.db')}
+    config['quality'].update(enabled=True, window=50)
+    assert FillRateMonitor.from_config(config).baseline == {'headline': 0.8}
+
+
+@pytest.fixture
+def broken_headline(config, make_scraper, monkeypatch):
+    """A scraper whose headline selectors stopped matching."""
+    config['quality'].update(enabled=True, window=2, min_samples=2, pause_seconds=1)
+
+    def make(action):
+        config['quality']['action'] = action
+        scraper = make_scraper()
+        chain = scraper.selectors.chain
+        monkeypatch.setattr(scraper.selectors, 'chain', lambda name: () if name == 'headline' else chain(name))
+        monkeypatch.setattr(scraper, '_extract_from_page_title_and_meta', lambda soup=None: {})
+        return scraper
+    return make
+
+
+USERS = ('ada-lovelace', 'grace-hopper', 'alan-turing', 'linus-torvalds')
+
+
+def test_abort_stops_the_run_on_a_broken_key_field(broken_headline, profile_url, caplog):
+    scraper = broken_headline('abort')
+    scraped = []
+    with pytest.raises(QualityAbort, match='headline'):
+        scraper.scrape_profiles([profile_url(user) for user in USERS], on_profile=scraped.append)
+    assert len(scraped) == 2
+    assert scraper.run_summary.fill_rates['headline'] == 0.0
+    assert scraper.run_summary.fill_rates['name'] == 1.0
+
+
+def test_pause_resumes_once_the_selectors_change(broken_headline, profile_url, monkeypatch, caplog):
+    scraper = broken_headline('pause')
+    monkeypatch.setattr(scraper.selectors, 'reload_if_changed', lambda: True)
+    with caplog.at_level(logging.INFO, logger='scrapers.linkedin_scraper'):
+        profiles = scraper.scrape_profiles([profile_url(user) for user in USERS])
+    assert len(profiles) == 4
+    events = [record.event for record in caplog.records if getattr(record, 'event', '').startswith('quality_')]
+    assert events == ['quality_alert', 'quality_pause', 'quality_resume'] * 2
+
+
+def test_alert_only_logs(broken_headline, profile_url):
+    scraper = broken_headline('alert')
+    assert len(scraper.scrape_profiles([profile_url(user) for user in USERS])) == 4
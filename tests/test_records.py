@@ -0,0 +1,57 @@
+import pytest
+
+from scrapers.records import INDICATORS_KEY, PROFILE_COLUMNS, ProfileRecord
+
+PROFILE = {
+    'name': 'Ada Lovelace',
+    'headline': 'Analyst',
+    'location': '',
+    'skills_count': '4',
+    INDICATORS_KEY: {'has_about': True, 'has_experience': False, 'has_skills': True},
+    'extraction_method': 'full',
+}
+
+
+def test_round_trip_keeps_fields_and_order():
+    record = ProfileRecord.from_dict(PROFILE)
+    expanded = record.to_dict()
+    assert expanded['name'] == 'Ada Lovelace'
+    assert expanded['location'] == ''
+    assert expanded['extraction_method'] == 'full'
+    assert list(record)[:3] == ['name', 'headline', 'location']
+    assert len(record) == len(PROFILE)
+
+
+def test_counts_become_ints_and_flags_bools():
+    record = ProfileRecord.from_dict(PROFILE)
+    assert record['skills_count'] == 4
+    assert record[INDICATORS_KEY] == {'has_about': True, 'has_experience': False, 'has_education': False,
+                                      'has_skills': True, 'has_profile_picture': False}
+
+
+def test_missing_fields_behave_like_a_dict():
+    record = ProfileRecord.from_dict(PROFILE)
+    assert 'email' not in record
+    assert record.get('email', 'none') == 'none'
+    with pytest.raises(KeyError):
+        record['email']
+
+
+def test_to_row_follows_the_schema_columns():
+    row = ProfileRecord.from_dict(PROFILE).to_row()
+    assert len(row) == len(PROFILE_COLUMNS)
+    assert row[PROFILE_COLUMNS.index('name')] == 'Ada Lovelace'
+    assert row[PROFILE_COLUMNS.index('email')] == ''
+
+
+def test_records_are_slotted():
+    record = ProfileRecord.from_dict(PROFILE)
+    assert not hasattr(record, '__dict__')
+    with pytest.raises(AttributeError):
+        record.anything = 1
+
+
+def test_scraped_profiles_come_back_as_records(scraper, profile_url):
+    [record] = scraper.scrape_profiles([profile_url('ada-lovelace')])
+    assert isinstance(record, ProfileRecord)
+    assert record['name'] and record['profile_url'] == profile_url('ada-lovelace')
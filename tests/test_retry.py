@@ -0,0 +1,76 @@
+import pytest
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from scrapers.retry import RetryPolicy, classify_exception
+
+
+@pytest.mark.parametrize('exc, outcome', [
+    (TimeoutException('page load'), 'timeout'),
+    (WebDriverException('invalid session id'), 'driver_crash'),
+    (WebDriverException('chrome not reachable'), 'driver_crash'),
+    (ConnectionError('refused'), 'driver_crash'),
+    (WebDriverException('element not interactable'), 'error'),
+    (ValueError('bad markup'), 'error'),
+])
+def test_classify_exception(exc, outcome):
+    assert classify_exception(exc) == outcome
+
+
+def test_default_policy_retries_only_browser_failures():
+    policy = RetryPolicy(max_retries=2)
+    assert policy.should_retry('timeout', 1)
+    assert policy.should_retry('driver_crash', 2)
+    assert not policy.should_retry('timeout', 3)
+    for outcome in ('partial', 'error', 'authwall', 'unavailable', 'no_data', 'success'):
+        assert not policy.should_retry(outcome, 1)
+
+
+def test_retry_on_opts_in_from_config():
+    policy = RetryPolicy.from_config({'scraping': {'retry_on': ['timeout', 'error']}})
+    assert policy.should_retry('error', 1)
+    assert not policy.should_retry('driver_crash', 1)
+
+
+@pytest.mark.parametrize('retry_on, message', [
+    (['timeout', 'timeouts'], 'Unknown retry_on outcomes timeouts'),
+    (['success'], 'Unknown retry_on outcomes success'),
+    (['authwall', 'unavailable'], 'authwall, unavailable are permanent'),
+])
+def test_retry_on_rejects_outcomes_it_cannot_retry(retry_on, message):
+    with pytest.raises(ValueError, match=message):
+        RetryPolicy.from_config({'scraping': {'retry_on': retry_on}})
+
+
+def test_misconfigured_retry_on_stops_the_scraper(config, make_scraper):
+    config['scraping']['retry_on'] = ['timeout', 'driver-crash']
+    with pytest.raises(ValueError, match='driver-crash'):
+        make_scraper()
+
+
+def outcomes(scraper, url):
+    return [attempt.outcome for attempt in scraper.attempt_log.attempts(url)]
+
+
+def test_profile_scrapes_in_one_attempt(scraper, profile_url):
+    url = profile_url('ada-lovelace')
+    profile = scraper.scrape_profile(url)
+    assert profile['name']
+    assert outcomes(scraper, url) == ['success']
+
+
+def test_unavailable_profile_is_not_retried(scraper, profile_url):
+    url = profile_url('unavailable-grace')
+    assert scraper.scrape_profile(url) is None
+    assert outcomes(scraper, url) == ['unavailable']
+
+
+def test_authwall_is_not_retried(scraper, profile_url):
+    url = profile_url('authwall-alan')
+    assert scraper.scrape_profile(url) is None
+    assert outcomes(scraper, url) == ['authwall']
+
+
+def test_timeout_is_retried_until_max_retries(scraper, profile_url):
+    url = profile_url('timeout-linus')
+    assert scraper.scrape_profile(url) is None
+    assert outcomes(scraper, url) == ['timeout'] * (scraper.retry_policy.max_retries + 1)
@@ -0,0 +1,72 @@
+import logging
+
+import pytest
+
+from scrapers.scheduler import Scheduler, ScrapeState, parse_duration, read_url_entries
+
+
+@pytest.fixture
+def scheduler(config, scraper):
+    return Scheduler.from_config(config, scraper.scrape_state)
+
+
+def test_only_good_scrapes_count_as_scraped(scraper, profile_url):
+    good, gone = profile_url('ada-lovelace'), profile_url('unavailable-grace')
+    scraper.scrape_profiles([good, gone])
+    states = scraper.scrape_state.get_many([good, gone])
+    assert states[good]['last_scraped_at'] and not states[good]['last_failed_at']
+    assert states[gone]['last_failed_at'] and not states[gone]['last_scraped_at']
+
+
+def test_without_budget_fresh_urls_go_last_but_are_kept(scheduler, scraper, profile_url):
+    fresh, new = profile_url('ada-lovelace'), profile_url('grace-hopper')
+    scraper.scrape_profiles([fresh])
+    schedule = scheduler.plan([(fresh, 5), (new, 1)])
+    assert schedule.urls == [new, fresh]
+    assert schedule.deferred == []
+
+
+def test_budget_defers_what_does_not_fit(scheduler, profile_url, caplog):
+    entries = [(profile_url('ada-lovelace'), 1), (profile_url('grace-hopper'), 3)]
+    one_profile = scheduler.plan(entries).selected[0].cost_seconds
+    with caplog.at_level(logging.WARNING, logger='scrapers.scheduler'):
+        schedule = scheduler.plan(entries, budget_seconds=one_profile * 1.5)
+    assert schedule.urls == [profile_url('grace-hopper')]
+    assert [item.url for item in schedule.deferred] == [profile_url('ada-lovelace')]
+    assert any(record.getMessage().startswith('schedule_deferred') for record in caplog.records)
+
+
+def test_costs_are_smoothed_and_value_decays_with_age(tmp_path):
+    state = ScrapeState(str(tmp_path / 'scrape_state.db'), alpha=0.5)
+    try:
+        state.record('https://x/in/a/', 'success', 10)
+        state.record('https://x/in/a/', 'timeout', 20)
+        row = state.get_many(['https://x/in/a/'])['https://x/in/a/']
+        assert (row['ewma_seconds'], row['scrapes'], row['last_outcome']) == (15, 2, 'timeout')
+
+        scheduler = Scheduler(state, half_life_hours=24, min_refresh_hours=1, delay_seconds=0,
+                              requests_per_minute=0)
+        assert scheduler.staleness(None) == 1.0 and scheduler.staleness(0.5) == 0.0
+        assert scheduler.staleness(24) == 0.5
+        # New URLs are costed at the mean of the known ones; duplicates keep their highest priority
+        [item] = scheduler.plan([('https://x/in/b/', 1), ('https://x/in/b/', 4)]).selected
+        assert (item.priority, item.cost_seconds, item.value) == (4, 15, 4)
+    finally:
+        state.close()
+
+
+@pytest.mark.parametrize('value, seconds', [('45s', 45), ('90m', 5400), ('2h', 7200), ('1d', 86400), ('30', 1800)])
+def test_parse_duration(value, seconds):
+    assert parse_duration(value) == seconds
+
+
+@pytest.mark.parametrize('value', ['soon', '2x', '-1h', '0'])
+def test_parse_duration_rejects_bad_values(value):
+    with pytest.raises(ValueError):
+        parse_duration(value)
+
+
+def test_read_url_entries_skips_bad_priorities(tmp_path):
+    urls_file = tmp_path / 'profile_urls.txt'
+    urls_file.write_text("# comment\nhttps://x/in/a/ 5\nhttps://x/in/b/ high\n\nhttps://x/in/c/\n")
+    assert read_url_entries(str(urls_file)) == [('https://x/in/a/', 5.0), ('https://x/in/c/', 1.0)]
@@ -0,0 +1,68 @@
+import csv
+import logging
+
+import pytest
+
+from scrapers.schema import PROFILE_SCHEMA, SchemaRegistry
+from scrapers.writers import CsvStreamWriter
+
+
+@pytest.fixture
+def schema():
+    registry = SchemaRegistry()
+    registry.register('basic', [('name', str), ('about', str, 10)])
+    registry.register('counts', [('skills_count', int)])
+    return registry
+
+
+def test_columns_follow_registration_order(schema):
+    assert schema.columns() == ('name', 'about', 'skills_count')
+    assert schema.group_fields('counts') == ('skills_count',)
+
+
+def test_duplicate_field_is_rejected(schema):
+    with pytest.raises(ValueError):
+        schema.register('other', [('name', str)])
+
+
+def test_validate_reports_undeclared_and_mistyped_fields(schema):
+    assert schema.validate('basic', {'name': 'Ada', 'about': ''}) == []
+    problems = schema.validate('counts', {'skills_count': '3', 'name': 'Ada'})
+    assert problems == ['skills_count is str, expected int', 'undeclared field name']
+
+
+def test_produces_logs_schema_mismatches(schema, caplog):
+    @schema.produces('basic')
+    def extract():
+        return {'name': 'Ada', 'phone': '555'}
+
+    with caplog.at_level(logging.WARNING):
+        assert extract() == {'name': 'Ada', 'phone': '555'}
+    assert 'undeclared field phone' in caplog.text
+    with pytest.raises(KeyError):
+        schema.produces('missing')
+
+
+def test_rows_are_cleaned_and_capped(schema):
+    row = schema.to_row({'name': '  Ada\n Lovelace ', 'about': 'x' * 20})
+    assert row == ['Ada Lovelace', 'x' * 10 + '...', '']
+
+
+def test_csv_writer_writes_the_schema_header_up_front(tmp_path):
+    path = tmp_path / 'out.csv'
+    with CsvStreamWriter(str(path)) as writer:
+        writer.write({'name': 'Ada', 'not_a_column': 'dropped'})
+    with open(path, newline='', encoding='utf-8') as f:
+        header, row = list(csv.reader(f))
+    assert tuple(header) == PROFILE_SCHEMA.columns()
+    assert row[header.index('name')] == 'Ada'
+    assert 'not_a_column' not in header
+
+
+@pytest.mark.parametrize('excel_copy', [False, True])
+def test_save_to_csv_writes_excel_only_when_asked(config, make_scraper, tmp_path, excel_copy):
+    config['output']['excel_copy'] = excel_copy
+    scraper = make_scraper()
+    scraper.save_to_csv([{'name': 'Ada'}, {'name': 'Grace'}], str(tmp_path / 'profiles.csv'))
+    assert (tmp_path / 'profiles.csv').exists()
+    assert (tmp_path / 'profiles.xlsx').exists() == excel_copy
@@ -0,0 +1,79 @@
+import pytest
+
+from main import update_search_index
+from scrapers.search_index import SearchIndex, parse_query, tokenize
+from scrapers.writers import CsvStreamWriter
+
+PROFILES = [
+    {'profile_url': 'https://x/in/ada/', 'name': 'Ada Lovelace', 'headline': 'Staff Software Engineer',
+     'skills_list': 'Python, Machine Learning, C++', 'current_company': 'Google',
+     'experience_1_title': 'Staff Software Engineer', 'experience_2_title': 'Intern'},
+    {'profile_url': 'https://x/in/grace/', 'name': 'Grace Hopper', 'headline': 'Software Engineer, Staff',
+     'skills_list': 'COBOL, Machine Learning', 'current_company': 'Navy',
+     'experience_1_title': 'Senior Engineer', 'experience_2_title': 'Manager'},
+    {'profile_url': 'https://x/in/linus/', 'name': 'Linus', 'headline': 'Kernel hacker',
+     'skills_list': 'C, Learning Machine', 'current_company': 'Google'},
+]
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = SearchIndex(str(tmp_path / 'search.db'))
+    with index.conn:
+        for profile in PROFILES:
+            index.add_profile(profile, source='test')
+    yield index
+    index.close()
+
+
+def urls(index, query):
+    return sorted(result['profile_url'].split('/')[-2] for result in index.search(query))
+
+
+def test_tokenize_and_parse_query():
+    assert tokenize('Café C++ & C# dev') == ['cafe', 'c++', 'c#', 'dev']
+    assert parse_query('python "machine learning" company:google -intern nope:x') == [
+        (None, ['python'], False), (None, ['machine', 'learning'], False),
+        ('company', ['google'], False), (None, ['intern'], True), (None, ['nope', 'x'], False),
+    ]
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('machine', ['ada', 'grace', 'linus']),
+    ('"machine learning"', ['ada', 'grace']),
+    ('"staff software engineer"', ['ada']),
+    ('company:google', ['ada', 'linus']),
+    ('company:google -intern', ['linus']),
+    ('skills:c++', ['ada']),
+    # Phrases never run from one column of a field into the next
+    ('title:"engineer manager"', []),
+    ('unknownword', []),
+    ('-intern', []),
+])
+def test_search(index, query, expected):
+    assert urls(index, query) == expected
+
+
+def test_rescraped_profile_replaces_the_old_version(index):
+    with index.conn:
+        index.add_profile({**PROFILES[0], 'current_company': 'Anthropic'})
+    assert urls(index, 'company:google') == ['linus']
+    assert index.stats()['profiles'] == 3
+
+
+def test_update_reads_only_new_output_files(config, scraper, profile_url, tmp_path):
+    output_dir = tmp_path / 'output'
+    config['search'].update(enabled=True, path=str(tmp_path / 'search.db'), output_dir=str(output_dir))
+    profile = scraper.scrape_profile(profile_url('ada-lovelace'))
+    with CsvStreamWriter(str(output_dir / 'run.csv'), compression='gzip') as writer:
+        writer.write(profile)
+    (output_dir / 'run.enriched.csv').write_text('name\nignored\n', encoding='utf-8')
+
+    update_search_index(config)
+    index = SearchIndex(str(tmp_path / 'search.db'))
+    try:
+        [result] = index.search(f'name:"{profile["name"]}"')
+        assert result['profile_url'] == profile['profile_url'] and result['source'] == 'run.csv.gz'
+        assert index.update(str(output_dir)) == (0, 0)
+    finally:
+        index.close()
@@ -0,0 +1,71 @@
+from bs4 import BeautifulSoup
+
+from scrapers.fixture_server import render_profile
+from scrapers.sections import SectionIndex, SectionMatcher
+
+PAGE = """<html><body><main>
+<section class="pv-top-card"><h1>Ada</h1></section>
+<section><div id="about"></div><p>About Ada</p></section>
+<section data-field="experience"><ul><li>Analyst</li></ul></section>
+<div class="skills-box wide"><span>Python</span></div>
+<article class="odd"><p>Odd</p></article>
+</main></body></html>"""
+
+SELECTORS = {
+    'top_card': ['.pv-top-card', 'main section:first-of-type'],
+    'about': ['#about'],
+    'experience': ['#experience', '[data-field="experience"]'],
+    'skills': ['.skills-box.wide'],
+    'odd': ['main > article.odd'],
+    'missing': ['#nowhere'],
+}
+
+
+def index(html=PAGE, selectors=None):
+    return SectionMatcher(selectors or SELECTORS).index(BeautifulSoup(html, 'html.parser'))
+
+
+def test_simple_selectors_are_table_lookups():
+    matcher = SectionMatcher(SELECTORS)
+    assert set(matcher.by_id) == {'about', 'experience', 'nowhere'}
+    assert set(matcher.by_field) == {'experience'}
+    assert set(matcher.by_class) == {'pv-top-card', 'skills-box'}
+    assert [name for name, _, _ in matcher.complex] == ['top_card', 'odd']
+
+
+def test_roots_widen_to_the_enclosing_section():
+    sections = index()
+    assert sections.root('about').name == 'section'
+    assert sections.root('about').p.get_text() == 'About Ada'
+    # No enclosing <section>: the matched element itself is the root
+    assert sections.root('skills').name == 'div'
+    assert sections.root('odd').name == 'article'
+    assert sections.present() == ['about', 'experience', 'odd', 'skills', 'top_card']
+
+
+def test_earlier_selector_wins():
+    sections = index('<main><section><h1>first</h1></section><section class="pv-top-card">'
+                     '<h1>card</h1></section></main>')
+    assert sections.root('top_card').h1.get_text() == 'card'
+
+
+def test_scope_falls_back_in_order():
+    sections = index()
+    default = object()
+    assert sections.scope('missing', 'about') is sections.root('about')
+    assert sections.scope('missing', default=default) is default
+    assert not sections.has('missing')
+
+
+def test_build_matches_a_reused_matcher():
+    soup = BeautifulSoup(render_profile('ada-lovelace', lazy_sections=False), 'html.parser')
+    one_off = SectionIndex.build(soup, SELECTORS)
+    assert one_off.present() == SectionMatcher(SELECTORS).index(soup).present()
+
+
+def test_extractors_stay_inside_their_section(scraper, profile_url):
+    profile = scraper.scrape_profile(profile_url('ada-lovelace'))
+    indicators = profile['profile_completeness_indicators']
+    assert indicators['has_about'] and indicators['has_experience'] and indicators['has_skills']
+    # Navigation text outside every section never leaks into a field
+    assert not any('My Network' in str(value) for value in profile.values())
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+from bs4 import BeautifulSoup
+from selenium.common.exceptions import WebDriverException
+
+from scrapers.sections import SectionIndex, assemble_sections_html, build_capture_script
+
+from conftest import capture_sections
+
+SELECTORS = {'top_card': ['.pv-top-card'], 'about': ['#about']}
+
+
+def test_capture_script_embeds_the_section_selectors():
+    script = build_capture_script(SELECTORS)
+    assert json.dumps(SELECTORS) in script
+    assert script.strip().startswith('var selectors =')
+    assert 'return {title: document.title, metas: metas, sections: sections};' in script
+
+
+def test_assembled_document_keeps_title_metas_and_fragment_order():
+    html = assemble_sections_html({
+        'title': 'Ada <Lovelace> | LinkedIn',
+        'metas': ['<meta property="og:title" content="Ada">'],
+        'sections': ['<section id="one">first</section>', '<section id="two">second</section>'],
+    })
+    soup = BeautifulSoup(html, 'html.parser')
+    assert soup.title.get_text() == 'Ada <Lovelace> | LinkedIn'
+    assert soup.find('meta', property='og:title')['content'] == 'Ada'
+    assert [section['id'] for section in soup.find_all('section')] == ['one', 'two']
+
+
+def test_assembled_document_tolerates_missing_keys():
+    soup = BeautifulSoup(assemble_sections_html({}), 'html.parser')
+    assert soup.title.get_text() == ''
+    assert soup.find('section') is None
+
+
+def test_capture_widens_matches_to_their_section(scraper, profile_url):
+    scraper.driver.get(profile_url('ada-lovelace'))
+    capture = capture_sections(scraper.driver.page_source, scraper.selectors.sections)
+    fragments = [BeautifulSoup(fragment, 'html.parser').find() for fragment in capture['sections']]
+    assert fragments and all(fragment.name == 'section' for fragment in fragments)
+    # Navigation chrome is left behind in the page
+    assert not any('global-nav' in fragment for fragment in capture['sections'])
+
+
+def test_captured_html_is_smaller_and_indexes_every_section(scraper, profile_url):
+    scraper.driver.get(profile_url('ada-lovelace'))
+    html = scraper._capture_page_html()
+    assert len(html) < len(scraper.driver.page_source)
+    sections = scraper.selectors.compiled.section_matcher.index(BeautifulSoup(html, 'html.parser'))
+    assert isinstance(sections, SectionIndex)
+    assert {'top_card', 'about', 'experience', 'education', 'skills'} <= set(sections.present())
+
+
+def test_section_capture_extracts_the_same_profile_as_full_page(config, make_scraper, profile_url):
+    url = profile_url('grace-hopper')
+    captured = make_scraper().scrape_profile(url)
+    config['scraping']['capture_mode'] = 'full'
+    full = make_scraper().scrape_profile(url)
+    for profile in (captured, full):
+        profile.pop('scraped_at', None)
+    assert captured['name'] and captured['skills_list']
+    assert captured == full
+
+
+@pytest.mark.parametrize('capture', [None, {'title': 'x', 'metas': [], 'sections': []},
+                                     WebDriverException('javascript error')])
+def test_capture_falls_back_to_page_source(scraper, profile_url, monkeypatch, capture):
+    scraper.driver.get(profile_url('ada-lovelace'))
+
+    def execute_script(script, *args):
+        if isinstance(capture, Exception):
+            raise capture
+        return capture
+
+    monkeypatch.setattr(scraper.driver, 'execute_script', execute_script)
+    assert scraper._capture_page_html() == scraper.driver.page_source
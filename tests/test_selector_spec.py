@@ -0,0 +1,81 @@
+import pickle
+
+from bs4 import BeautifulSoup
+
+from scrapers import selector_spec
+from scrapers.sections import assemble_sections_html
+from scrapers.selector_spec import SelectorSpec, cache_key
+
+from conftest import ROOT, capture_sections
+
+
+def cache_files(cache_dir):
+    return sorted(path.name for path in cache_dir.glob('selectors-*.pickle'))
+
+
+def refuse_to_compile(spec):
+    raise AssertionError('spec was recompiled instead of loaded from the pickle')
+
+
+def test_compiled_selectors_round_trip(config, make_scraper, profile_url, monkeypatch, tmp_path):
+    first = make_scraper()
+    assert len(cache_files(tmp_path / 'cache')) == 1
+
+    monkeypatch.setattr(selector_spec, 'validate_spec', refuse_to_compile)
+    second = make_scraper()
+    assert second.selectors.compiled is not first.selectors.compiled
+    assert second.selectors.compiled.spec_hash == first.selectors.compiled.spec_hash
+
+    # Both extract the same profile from the same page
+    url = profile_url('ada-lovelace')
+    first_profile, second_profile = first.scrape_profile(url), second.scrape_profile(url)
+    for profile in (first_profile, second_profile):
+        profile.pop('scraped_at', None)
+    assert first_profile['name']
+    assert first_profile == second_profile
+
+
+def test_pickle_from_another_cache_format_is_ignored(tmp_path, monkeypatch):
+    spec = SelectorSpec(str(ROOT / 'selectors.json'), str(tmp_path))
+    [name] = cache_files(tmp_path)
+    assert name == f"selectors-{cache_key(spec.compiled.spec_hash)}.pickle"
+
+    # An old-format object under the current key is recompiled, not trusted
+    stale = spec.compiled
+    stale.cache_format = selector_spec.CACHE_FORMAT - 1
+    with open(tmp_path / name, 'wb') as f:
+        pickle.dump(stale, f)
+    compiled = []
+    monkeypatch.setattr(selector_spec, 'validate_spec', compiled.append)
+    reloaded = SelectorSpec(str(ROOT / 'selectors.json'), str(tmp_path))
+    assert len(compiled) == 1
+    assert reloaded.compiled.cache_format == selector_spec.CACHE_FORMAT
+
+
+def test_cache_format_bump_changes_the_key(tmp_path, monkeypatch):
+    SelectorSpec(str(ROOT / 'selectors.json'), str(tmp_path))
+    monkeypatch.setattr(selector_spec, 'CACHE_FORMAT', selector_spec.CACHE_FORMAT + 1)
+    SelectorSpec(str(ROOT / 'selectors.json'), str(tmp_path))
+    assert len(cache_files(tmp_path)) == 2
+
+
+def test_unreadable_pickle_is_recompiled(tmp_path):
+    spec = SelectorSpec(str(ROOT / 'selectors.json'), str(tmp_path))
+    [name] = cache_files(tmp_path)
+    (tmp_path / name).write_bytes(b'not a pickle')
+    reloaded = SelectorSpec(str(ROOT / 'selectors.json'), str(tmp_path))
+    assert reloaded.compiled.spec_hash == spec.compiled.spec_hash
+    with open(tmp_path / name, 'rb') as f:
+        assert pickle.load(f).spec_hash == spec.compiled.spec_hash
+
+
+def test_positional_fallback_does_not_match_the_first_fragment(tmp_path):
+    spec = SelectorSpec(str(ROOT / 'selectors.json'), str(tmp_path))
+    # A page without a top card (and without <main>): nothing should be indexed as one
+    page = ('<html><body><div class="scaffold"><section><div id="about"></div><p>About</p></section>'
+            '<section id="experience"><ul><li>Analyst</li></ul></section></div></body></html>')
+    capture = capture_sections(page, spec.sections)
+    assert len(capture['sections']) == 2
+    soup = BeautifulSoup(assemble_sections_html(capture), 'html.parser')
+    sections = spec.compiled.section_matcher.index(soup)
+    assert sections.present() == ['about', 'experience']
@@ -0,0 +1,100 @@
+import logging
+import threading
+import time
+
+import pytest
+
+from scrapers.utils import TimeBudgetExceeded, budgets_interrupt, log_event, time_budget
+from scrapers.worker import ScrapeWorker
+
+
+class SlowPattern:
+    """A selector that takes a while and then fails, like a pathological page."""
+
+    def select_one(self, soup):
+        started = time.monotonic()
+        while time.monotonic() - started < 0.2:
+            pass
+        raise ValueError('no match')
+
+
+def test_budget_is_not_swallowed_by_broad_handlers():
+    started = time.monotonic()
+    with pytest.raises(TimeBudgetExceeded):
+        with time_budget(0.2):
+            for _ in range(50):
+                try:
+                    SlowPattern().select_one(None)
+                except Exception:
+                    continue
+    assert time.monotonic() - started < 1.0
+
+
+def test_budgets_only_interrupt_on_the_main_thread():
+    seen = {}
+    thread = threading.Thread(target=lambda: seen.update(interrupts=budgets_interrupt()))
+    thread.start()
+    thread.join()
+    assert budgets_interrupt() and not seen['interrupts']
+
+
+def run_slow_basic_info(scraper, profile_url, monkeypatch, in_thread=False, patterns=50):
+    chain = scraper.selectors.chain
+    monkeypatch.setattr(scraper.selectors, 'chain',
+                        lambda name: [SlowPattern()] * patterns if name == 'name' else chain(name))
+    scraper.extractor_budget = 0.3
+    started = time.monotonic()
+    if in_thread:
+        result = {}
+        thread = threading.Thread(target=lambda: result.update(profile=scraper.scrape_profile(profile_url)))
+        thread.start()
+        thread.join()
+        profile = result['profile']
+    else:
+        profile = scraper.scrape_profile(profile_url)
+    return profile, time.monotonic() - started
+
+
+def test_slow_extractor_is_interrupted_at_its_budget(scraper, profile_url, monkeypatch):
+    profile, elapsed = run_slow_basic_info(scraper, profile_url('ada-lovelace'), monkeypatch)
+    assert elapsed < 2.0
+    assert profile['extraction_status'] == 'partial'
+    assert profile['partial_extractors'] == 'basic_info'
+    # The other extractors still ran
+    assert profile['skills_list']
+
+
+def test_slow_extractor_result_is_dropped_off_the_main_thread(scraper, profile_url, monkeypatch):
+    # Nothing interrupts it here, so keep it to about a second
+    profile, _ = run_slow_basic_info(scraper, profile_url('ada-lovelace'), monkeypatch, in_thread=True, patterns=5)
+    assert profile['extraction_status'] == 'partial'
+    assert profile['partial_extractors'] == 'basic_info'
+    assert profile['skills_list']
+
+
+def test_log_event_accepts_log_record_attribute_names(caplog):
+    with caplog.at_level(logging.INFO):
+        log_event(logging.getLogger('test'), 'reserved_fields', thread='worker', name='n', msg='m')
+    [record] = caplog.records
+    assert record.field_thread == 'worker' and record.field_name == 'n' and record.field_msg == 'm'
+    assert record.getMessage() == 'reserved_fields thread=worker name=n msg=m'
+
+
+def test_worker_thread_completes_a_job(config, scraper, profile_url, tmp_path, caplog):
+    worker = ScrapeWorker(config, output_dir=str(tmp_path / 'jobs'))
+    worker.scraper = scraper
+    with caplog.at_level(logging.WARNING, logger='scrapers.worker'):
+        worker.start()
+        try:
+            job = worker.submit([profile_url('ada-lovelace'), profile_url('grace-hopper')])
+            deadline = time.monotonic() + 30
+            while not job.finished and time.monotonic() < deadline:
+                job.wait_for_results(len(job.results), timeout=0.5)
+            assert worker._thread.is_alive()
+        finally:
+            worker.stop(timeout=10)
+
+    assert job.status == 'done', job.error
+    assert [profile['profile_url'] for profile in job.results] == [profile_url('ada-lovelace'),
+                                                                  profile_url('grace-hopper')]
+    assert any(getattr(record, 'event', '') == 'time_budgets_not_interrupting' for record in caplog.records)
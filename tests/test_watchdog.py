@@ -0,0 +1,142 @@
+import subprocess
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from scrapers import watchdog as watchdog_module
+from scrapers.watchdog import DriverWatchdog, process_tree, release_driver, terminate
+
+from conftest import FixtureDriver
+
+
+@pytest.fixture
+def process_group():
+    """A shell with a sleeping child, like chromedriver with its browser."""
+    parent = subprocess.Popen(['sh', '-c', 'sleep 60 & wait'])
+    deadline = time.monotonic() + 5
+    while len(process_tree(parent.pid)) < 2 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    yield parent
+    parent.kill()
+    parent.wait()
+
+
+@pytest.fixture(params=[True, False], ids=['psutil', 'proc'])
+def process_backend(request, monkeypatch):
+    if request.param and not watchdog_module.PSUTIL_AVAILABLE:
+        pytest.skip('psutil not installed')
+    monkeypatch.setattr(watchdog_module, 'PSUTIL_AVAILABLE', request.param)
+
+
+def test_terminate_kills_the_whole_tree(process_backend, process_group):
+    pids = process_tree(process_group.pid)
+    assert len(pids) == 2 and pids[0] == process_group.pid
+    assert terminate(pids, timeout=5) == []
+    # Our own child lingers as a zombie until reaped, which counts as gone
+    assert not any(watchdog_module._alive(pid) for pid in pids)
+
+
+def test_release_driver_clears_the_profile_locks(process_group, tmp_path):
+    for name in watchdog_module.SINGLETON_FILES:
+        (tmp_path / name).write_text('')
+    pids = process_tree(process_group.pid)
+    driver = SimpleNamespace(service=SimpleNamespace(process=process_group), quit=lambda: None)
+    release_driver(driver, str(tmp_path), timeout=1)
+    assert not any(watchdog_module._alive(pid) for pid in pids)
+    assert not list(tmp_path.iterdir())
+
+
+class ProbeDriver:
+    def __init__(self, answer=lambda: 'complete'):
+        self.answer = answer
+
+    def execute_script(self, script):
+        return self.answer()
+
+
+def raise_(exc):
+    raise exc
+
+
+def test_check_reports_why_a_driver_is_unfit():
+    watchdog = DriverWatchdog(recycle_after=2, probe_timeout=0.2)
+    assert watchdog.check(ProbeDriver()).reason == 'ok'
+    assert watchdog.check(None).reason == 'no_driver'
+    assert watchdog.check(ProbeDriver(lambda: raise_(WebDriverException('invalid session id')))).reason == 'crashed'
+    hang = threading.Event()
+    try:
+        assert watchdog.check(ProbeDriver(lambda: hang.wait(5))).reason == 'hung'
+    finally:
+        hang.set()
+    watchdog.navigated()
+    watchdog.navigated()
+    assert watchdog.check(ProbeDriver()).reason == 'recycle'
+    watchdog.restarted('recycle')
+    assert watchdog.navigations == 0 and watchdog.as_dict()['restarts'] == {'recycle': 1}
+
+
+def test_check_recycles_a_bloated_browser(process_group):
+    driver = ProbeDriver()
+    driver.service = SimpleNamespace(process=process_group)
+    health = DriverWatchdog(max_rss_mb=0.001).check(driver)
+    assert (health.healthy, health.reason) == (False, 'memory') and health.rss_mb > 0
+
+
+class CrashingDriver(FixtureDriver):
+    """Loses its session on the first visit to `crash_url`; dead from then on."""
+
+    def __init__(self, crash_url):
+        super().__init__()
+        self.crash_url = crash_url
+        self.crashed = False
+
+    def get(self, url):
+        if self.crashed or url == self.crash_url:
+            self.crashed = True
+            raise WebDriverException('invalid session id')
+        super().get(url)
+
+    def execute_script(self, script, *args):
+        if self.crashed:
+            raise WebDriverException('invalid session id')
+        return super().execute_script(script, *args)
+
+
+@pytest.fixture
+def watched_scraper(config, make_scraper, profile_url, monkeypatch):
+    config['watchdog'].update(enabled=True, max_rss_mb=0)
+    config['scraping']['max_retries'] = 0
+    scraper = make_scraper()
+    scraper.driver = CrashingDriver(profile_url('ada-lovelace'))
+    return scraper
+
+
+def outcomes(scraper, url):
+    return [attempt.outcome for attempt in scraper.attempt_log.attempts(url)]
+
+
+def test_profile_lost_to_a_crash_is_requeued_after_the_restart(watched_scraper, profile_url, monkeypatch):
+    scraper = watched_scraper
+    monkeypatch.setattr(scraper, 'setup_driver', lambda: setattr(scraper, 'driver', FixtureDriver()))
+    urls = [profile_url('ada-lovelace'), profile_url('grace-hopper')]
+    profiles = scraper.scrape_profiles(urls)
+    assert [profile['profile_url'] for profile in profiles] == [urls[1], urls[0]]
+    assert outcomes(scraper, urls[0]) == ['driver_crash', 'success']
+    assert scraper.watchdog.restarts == {'crashed': 1}
+
+
+def test_failed_restart_marks_the_rest_of_the_batch(watched_scraper, profile_url, monkeypatch):
+    scraper = watched_scraper
+    monkeypatch.setattr(scraper, 'setup_driver', lambda: raise_(RuntimeError('chrome failed to start')))
+    urls = [profile_url(username) for username in ('ada-lovelace', 'grace-hopper', 'alan-turing')]
+    attempted = []
+    assert scraper.scrape_profiles(urls, on_attempt=attempted.append) == []
+    # Only the first URL was tried; the others were never loaded but are still accounted for
+    assert attempted == [urls[0]]
+    for url in urls:
+        assert outcomes(scraper, url)[-1] == 'driver_crash'
+    assert scraper.attempt_log.attempts(urls[2])[0].error == 'driver restart failed: chrome failed to start'
+    assert scraper.run_summary.outcomes == {'driver_crash': 4}
@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from scrapers.worker import ScrapeWorker
+from web_app import create_app
+
+
+def parse_events(body):
+    events = []
+    for block in body.strip().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.splitlines() if not line.startswith(':'))
+        if fields:
+            events.append((fields.get('event'), fields.get('id'), json.loads(fields['data'])))
+    return events
+
+
+@pytest.fixture
+def worker(config, scraper, tmp_path):
+    worker = ScrapeWorker(config, output_dir=str(tmp_path / 'jobs'))
+    worker.scraper = scraper
+    yield worker
+    worker.stop(timeout=10)
+
+
+@pytest.fixture
+def client(config, worker, fixture_server):
+    config['web'].update(max_urls_per_job=3, heartbeat_seconds=0.2, fixture_base_url=fixture_server.base_url)
+    return create_app(config, worker=worker.start()).test_client()
+
+
+@pytest.mark.parametrize('payload, status', [
+    (None, 400),
+    ({'urls': 'https://www.linkedin.com/in/ada/'}, 400),
+    ({'urls': ['', '  ', 7]}, 400),
+    ({'urls': [f"https://www.linkedin.com/in/user{i}/" for i in range(4)]}, 413),
+])
+def test_bad_submissions_are_rejected(client, payload, status):
+    response = client.post('/jobs', json=payload) if payload is not None else client.post('/jobs', data='x')
+    assert response.status_code == status
+    assert 'error' in response.get_json()
+
+
+def test_job_streams_profiles_then_done(client, fixture_server):
+    response = client.post('/jobs', json={'urls': ['https://www.linkedin.com/in/ada-lovelace/',
+                                                   'https://www.linkedin.com/in/grace-hopper/']})
+    assert response.status_code == 202
+    job_id = response.get_json()['id']
+    assert response.headers['Location'] == f"/jobs/{job_id}"
+
+    stream = client.get(f"/jobs/{job_id}/stream")
+    assert stream.mimetype == 'text/event-stream'
+    events = parse_events(stream.get_data(as_text=True))
+    assert [(event, event_id) for event, event_id, _ in events] == [('profile', '0'), ('profile', '1'), ('done', None)]
+    # URLs were pointed at the fixture server before scraping
+    assert events[0][2]['profile_url'] == f"{fixture_server.base_url}/in/ada-lovelace/"
+    assert events[-1][2]['status'] == 'done'
+
+    status = client.get(f"/jobs/{job_id}?results=1").get_json()
+    assert status['progress'] == {'total': 2, 'attempted': 2, 'completed': 2}
+    assert [profile['name'] for profile in status['results']] == [events[0][2]['name'], events[1][2]['name']]
+    assert '.jsonl' in status['output_path']
+
+    # A reconnecting client only gets what it missed
+    resumed = parse_events(client.get(f"/jobs/{job_id}/stream", headers={'Last-Event-ID': '0'}).get_data(as_text=True))
+    assert [(event, event_id) for event, event_id, _ in resumed] == [('profile', '1'), ('done', None)]
+    assert [job['id'] for job in client.get('/jobs').get_json()['jobs']] == [job_id]
+
+
+def test_queued_jobs_can_be_cancelled_once(config, worker, profile_url):
+    # The worker is never started, so the job stays queued
+    client = create_app(config, worker=worker).test_client()
+    job_id = client.post('/jobs', json={'urls': [profile_url('ada-lovelace')]}).get_json()['id']
+    assert client.get('/health').get_json() == {'status': 'ok', 'queued_jobs': 1}
+    assert client.post(f"/jobs/{job_id}/cancel").get_json()['status'] == 'cancelled'
+    assert client.post(f"/jobs/{job_id}/cancel").status_code == 409
+    assert client.get('/health').get_json()['queued_jobs'] == 0
+
+
+def test_unknown_jobs_are_404(client):
+    for response in (client.get('/jobs/nope'), client.get('/jobs/nope/stream'), client.post('/jobs/nope/cancel')):
+        assert response.status_code == 404
@@ -0,0 +1,71 @@
+import csv
+import gzip
+import io
+import json
+
+import pytest
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from scrapers import writers
+from scrapers.writers import CsvStreamWriter, RunManifest, file_digest, resolve_compression
+
+
+def read_csv_rows(path, compression):
+    raw = path.read_bytes()
+    if compression == 'gzip':
+        raw = gzip.decompress(raw)
+    elif compression == 'zstd':
+        raw = zstandard.ZstdDecompressor().stream_reader(io.BytesIO(raw)).read()
+    return list(csv.reader(io.StringIO(raw.decode('utf-8'))))
+
+
+@pytest.mark.parametrize('compression, suffix', [
+    ('none', '.csv'),
+    ('gzip', '.csv.gz'),
+    pytest.param('zstd', '.csv.zst', marks=pytest.mark.skipif(zstandard is None, reason='zstandard not installed')),
+])
+def test_compressed_csv_round_trip(tmp_path, compression, suffix):
+    writer = CsvStreamWriter(str(tmp_path / 'out.csv'), compression=compression)
+    for name in ('Ada', 'Grace', 'Linus'):
+        writer.write({'name': name})
+    writer.close()
+
+    assert writer.path.name == 'out' + suffix
+    header, *rows = read_csv_rows(writer.path, compression)
+    assert [row[header.index('name')] for row in rows] == ['Ada', 'Grace', 'Linus']
+    [summary] = writer.summaries()
+    assert summary['rows'] == 3 and summary['compression'] == compression
+    assert {'bytes': summary['bytes'], 'sha256': summary['sha256']} == file_digest(writer.path)
+
+
+def test_zstd_falls_back_to_gzip_without_zstandard(monkeypatch):
+    monkeypatch.setattr(writers, 'ZSTD_AVAILABLE', False)
+    assert resolve_compression('zstd') == 'gzip'
+
+
+def test_unknown_compression_is_rejected():
+    with pytest.raises(ValueError):
+        resolve_compression('brotli')
+
+
+def test_manifest_lists_every_file_with_checksums(tmp_path):
+    writer = CsvStreamWriter(str(tmp_path / 'run.csv'), compression='gzip')
+    writer.write({'name': 'Ada'})
+    writer.close()
+    extra = tmp_path / 'run.attempts.json'
+    extra.write_text('{}', encoding='utf-8')
+
+    manifest = RunManifest(str(tmp_path / 'run.manifest.json'), run_id='20260101_000000')
+    manifest.add(writer)
+    manifest.add_file(extra, 'attempts', 0)
+    with open(manifest.write(), encoding='utf-8') as f:
+        written = json.load(f)
+
+    assert written['run_id'] == '20260101_000000'
+    assert [entry['path'] for entry in written['files']] == ['run.csv.gz', 'run.attempts.json']
+    assert written['files'][1]['sha256'] == file_digest(extra)['sha256']
+    assert manifest.total_bytes() == sum(entry['bytes'] for entry in written['files'])
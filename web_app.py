@@ -0,0 +1,141 @@
+"""
+Web interface for the LinkedIn Profile Scraper.
+
+Accepts batches of profile URLs as jobs, runs them on one background worker
+that owns the browser, and exposes job status, progress and a server-sent
+event stream of profiles as they finish.
+
+    POST /jobs                 {"urls": [...]}  -> 202 {"id": ..., "status": "queued", ...}
+    GET  /jobs                 recent jobs
+    GET  /jobs/<id>            status and progress (?results=1 includes results)
+    GET  /jobs/<id>/stream     text/event-stream of 'profile' events, then 'done'
+    POST /jobs/<id>/cancel     cancel a job that has not started
+    GET  /health
+"""
+
+import os
+import sys
+from pathlib import Path
+
+from flask import Flask, Response, jsonify, request, stream_with_context
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from scrapers.utils import load_config, setup_logging, load_environment, rewrite_profile_url
+from scrapers.fixture_server import FixtureServer
+from scrapers.worker import ScrapeWorker, stream_job_events
+
+
+def create_app(config=None, worker=None):
+    """Build the Flask app around a started ScrapeWorker."""
+    config = config if config is not None else load_config()
+    web_config = config.get('web', {})
+    max_urls = web_config.get('max_urls_per_job', 500)
+    heartbeat = web_config.get('heartbeat_seconds', 15)
+    fixture_base_url = web_config.get('fixture_base_url')
+    worker = worker or ScrapeWorker.from_config(config).start()
+
+    app = Flask(__name__)
+    app.config['SCRAPE_WORKER'] = worker
+
+    def job_or_404(job_id):
+        job = worker.get(job_id)
+        if job is None:
+            return None, (jsonify({'error': f"Unknown job {job_id}"}), 404)
+        return job, None
+
+    @app.post('/jobs')
+    def submit_job():
+        payload = request.get_json(silent=True) or {}
+        urls = payload.get('urls')
+        if not isinstance(urls, list):
+            return jsonify({'error': "Expected a JSON body with a 'urls' list"}), 400
+        urls = [url.strip() for url in urls if isinstance(url, str) and url.strip()]
+        if not urls:
+            return jsonify({'error': 'No valid URLs in request'}), 400
+        if len(urls) > max_urls:
+            return jsonify({'error': f"At most {max_urls} URLs per job"}), 413
+        if fixture_base_url:
+            urls = [rewrite_profile_url(url, fixture_base_url) for url in urls]
+        job = worker.submit(urls)
+        response = jsonify(job.as_dict())
+        response.headers['Location'] = f"/jobs/{job.id}"
+        return response, 202
+
+    @app.get('/jobs')
+    def list_jobs():
+        return jsonify({'jobs': [job.as_dict() for job in worker.jobs()]})
+
+    @app.get('/jobs/<job_id>')
+    def job_status(job_id):
+        job, error = job_or_404(job_id)
+        if error:
+            return error
+        return jsonify(job.as_dict(include_results=request.args.get('results') in ('1', 'true')))
+
+    @app.post('/jobs/<job_id>/cancel')
+    def cancel_job(job_id):
+        job, error = job_or_404(job_id)
+        if error:
+            return error
+        if not worker.cancel(job_id):
+            return jsonify({'error': f"Job {job_id} is {job.status} and can no longer be cancelled"}), 409
+        return jsonify(job.as_dict())
+
+    @app.get('/jobs/<job_id>/stream')
+    def stream_job(job_id):
+        job, error = job_or_404(job_id)
+        if error:
+            return error
+        # Reconnecting EventSource clients send the id of the last profile they received
+        last_event_id = request.headers.get('Last-Event-ID', request.args.get('from', ''))
+        start = int(last_event_id) + 1 if last_event_id.isdigit() else 0
+        return Response(
+            stream_with_context(stream_job_events(job, start=start, heartbeat=heartbeat)),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+
+    @app.get('/health')
+    def health():
+        return jsonify({'status': 'ok', 'queued_jobs': worker.queue_depth()})
+
+    return app
+
+
+def main():
+    """Run the web service."""
+    load_environment()
+    config = load_config()
+
+    fixture_server = None
+    if config.get('fixture_server', {}).get('enabled', False):
+        fixture_server = FixtureServer.from_config(config).start()
+        config.setdefault('linkedin', {})['base_url'] = fixture_server.base_url
+        config.setdefault('web', {})['fixture_base_url'] = fixture_server.base_url
+        os.environ.setdefault('LINKEDIN_EMAIL', 'fixture@example.com')
+        os.environ.setdefault('LINKEDIN_PASSWORD', 'fixture')
+        print(f"🧪 Using fixture server at {fixture_server.base_url}")
+
+    logging_config = config.get('logging', {})
+    setup_logging(
+        log_file=logging_config.get('file', 'scraper.log'),
+        max_bytes=logging_config.get('max_bytes', 10 * 1024 * 1024),
+        backup_count=logging_config.get('backup_count', 5)
+    )
+
+    web_config = config.get('web', {})
+    app = create_app(config)
+    try:
+        # threaded so open event streams don't block status requests
+        app.run(host=web_config.get('host', '127.0.0.1'), port=web_config.get('port', 5000),
+                threaded=True, use_reloader=False)
+    finally:
+        app.config['SCRAPE_WORKER'].stop(timeout=30)
+        if fixture_server:
+            fixture_server.stop()
+
+
+if __name__ == "__main__":
+    main()